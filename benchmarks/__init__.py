@@ -0,0 +1,9 @@
+"""
+Benchmarks for ``dep_checker``.
+
+These aren't part of the distributed package. Run them from the root of the repository, e.g.::
+
+	python -m benchmarks.micro --output before.json
+
+See ``CONTRIBUTING.rst`` for details.
+"""
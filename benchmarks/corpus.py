@@ -0,0 +1,296 @@
+"""
+Deterministic synthetic source code for the benchmarks.
+
+Every function is seeded, so the same arguments always produce the same source,
+and results from different commits (or machines) measure the same work.
+"""
+
+# stdlib
+import hashlib
+import os
+import random
+from typing import Dict, List
+
+__all__ = [
+		"DEFAULT_SEED",
+		"NAMESPACES",
+		"corpus_digest",
+		"deep_nesting",
+		"literal_table",
+		"namespace_heavy",
+		"namespace_packages",
+		"nodep_heavy",
+		"requirement_names",
+		"wide_imports",
+		"write_package_tree",
+		]
+
+DEFAULT_SEED = 1234
+
+#: Namespaces which packages are generated within, e.g. ``acme.cloud.storage0``.
+NAMESPACES = ("acme", "acme.cloud", "jaraco", "ruamel")
+
+_STDLIB_MODULES = ("os", "sys", "re", "json", "typing", "collections", "functools", "itertools", "pathlib")
+
+
+def requirement_names(count: int) -> List[str]:
+	"""
+	Returns the names of ``count`` third-party packages.
+
+	:param count:
+	"""
+
+	return [f"package{idx}" for idx in range(count)]
+
+
+def wide_imports(count: int, seed: int = DEFAULT_SEED) -> str:
+	"""
+	Returns a module whose header is ``count`` imports, in every syntactic form, and nothing else.
+
+	:param count:
+	:param seed:
+	"""
+
+	rng = random.Random(seed)
+	packages = requirement_names(max(count // 4, 1))
+	lines = ['"""', "A module with a long import header.", '"""', '']
+
+	for idx in range(count):
+		name = rng.choice(packages)
+		form = idx % 6
+
+		if form == 0:
+			lines.append(f"import {name}")
+		elif form == 1:
+			lines.append(f"import {name}.sub{idx} as alias{idx}")
+		elif form == 2:
+			lines.append(f"from {name} import thing{idx}")
+		elif form == 3:
+			lines.append(f"from {name}.sub import (\n\t\tfirst{idx},\n\t\tsecond{idx},\n\t\t)")
+		elif form == 4:
+			lines.append(f"import {rng.choice(_STDLIB_MODULES)}, {name}")
+		else:
+			lines.append(f"from . import relative{idx}")
+
+	lines.append('')
+	return '\n'.join(lines) + '\n'
+
+
+def deep_nesting(depth: int, breadth: int = 4, seed: int = DEFAULT_SEED) -> str:
+	"""
+	Returns a module with imports inside ``depth`` levels of nested compound statements.
+
+	Each level also has a guarded block (``if TYPE_CHECKING:``, ``try: ... except ImportError:``
+	or ``with suppress(ImportError):``), whose imports are excluded.
+
+	:param depth:
+	:param breadth: The number of times the nested structure is repeated.
+	:param seed:
+	"""
+
+	rng = random.Random(seed)
+	packages = requirement_names(16)
+	lines = ["from contextlib import suppress", "from typing import TYPE_CHECKING", '']
+
+	headers = [
+			"def function{n}():",
+			"class Class{n}:",
+			"if value{n}:",
+			"for item{n} in items:",
+			"while condition{n}:",
+			"with open(filename{n}) as fp{n}:",
+			"try:",
+			]
+
+	for repeat in range(breadth):
+		for level in range(depth):
+			indent = '\t' * level
+			guard = (level + repeat) % 3
+
+			if guard == 0:
+				lines.extend([f"{indent}if TYPE_CHECKING:", f"{indent}\timport {rng.choice(packages)}"])
+			elif guard == 1:
+				lines.extend([f"{indent}with suppress(ImportError):", f"{indent}\timport {rng.choice(packages)}"])
+			else:
+				lines.extend([
+						f"{indent}try:",
+						f"{indent}\timport {rng.choice(packages)}",
+						f"{indent}except ImportError:",
+						f"{indent}\tpass",
+						])
+
+			header = headers[(level + repeat) % len(headers)]
+			lines.append(indent + header.format(n=f"{repeat}_{level}"))
+			lines.append(f"{indent}\timport {rng.choice(packages)}")
+			lines.append(f"{indent}\tresult = compute({level}, {repeat})")
+
+		for level in reversed(range(depth)):
+			if headers[(level + repeat) % len(headers)] == "try:":
+				indent = '\t' * level
+				lines.append(f"{indent}except ValueError:")
+				lines.append(f"{indent}\timport {rng.choice(packages)}")
+
+	lines.append('')
+	return '\n'.join(lines) + '\n'
+
+
+def literal_table(rows: int, columns: int = 8, seed: int = DEFAULT_SEED) -> str:
+	"""
+	Returns a module which is mostly a huge literal table, with a few imports before and after it.
+
+	Imports can't occur in expressions, so this measures how cheaply they are skipped.
+
+	:param rows:
+	:param columns:
+	:param seed:
+	"""
+
+	rng = random.Random(seed)
+	lines = ["import package0", "from package1 import thing", '', "TABLE = ["]
+
+	for _ in range(rows):
+		cells = ", ".join(
+				repr(rng.choice((rng.random(), rng.randint(-10**6, 10**6), f"s{rng.randint(0, 999)}", None)))
+				for _ in range(columns)
+				)
+		lines.append(f"\t\t({cells}),")
+
+	lines.extend(["\t\t]", '', "MAPPING = {"])
+
+	for row in range(rows // 4):
+		lines.append(f"\t\t\"key{row}\": {{\"nested\": [{row}, {row * 2}, \"import notanimport\"]}},")
+
+	lines.extend(["\t\t}", '', "import package2", ''])
+	return '\n'.join(lines) + '\n'
+
+
+def nodep_heavy(count: int, seed: int = DEFAULT_SEED) -> str:
+	"""
+	Returns a module where most of the ``count`` imports are marked with ``# nodep``.
+
+	:param count:
+	:param seed:
+	"""
+
+	rng = random.Random(seed)
+	packages = requirement_names(32)
+	lines = []
+
+	for idx in range(count):
+		name = rng.choice(packages)
+
+		if idx % 5 == 0:
+			lines.append(f"import {name}")
+		elif idx % 5 == 1:
+			lines.append(f"from {name} import (  # nodep\n\t\tthing{idx},\n\t\t)")
+		else:
+			lines.append(f"import {name}  # nodep")
+
+		lines.append(f"value{idx} = {name}.function({idx})  # not a marker: nodep")
+
+	lines.append('')
+	return '\n'.join(lines) + '\n'
+
+
+def namespace_packages(count: int) -> Dict[str, List[str]]:
+	"""
+	Returns the mapping of namespaces to the packages within them used by :func:`~.namespace_heavy`.
+
+	:param count: The number of packages in each namespace.
+	"""
+
+	return {namespace: [f"pkg{idx}" for idx in range(count)] for namespace in NAMESPACES}
+
+
+def namespace_heavy(count: int, packages_per_namespace: int = 16, seed: int = DEFAULT_SEED) -> str:
+	"""
+	Returns a module with ``count`` imports, most of them from within nested namespace packages.
+
+	:param count:
+	:param packages_per_namespace:
+	:param seed:
+	"""
+
+	rng = random.Random(seed)
+	lines = []
+
+	for idx in range(count):
+		namespace = rng.choice(NAMESPACES)
+		package = f"{namespace}.pkg{rng.randrange(packages_per_namespace)}"
+
+		if idx % 4 == 0:
+			lines.append(f"import {package}")
+		elif idx % 4 == 1:
+			lines.append(f"import {package}.submodule.deeper")
+		elif idx % 4 == 2:
+			lines.append(f"from {package}.submodule import thing{idx}")
+		else:
+			# Not within a namespace package, so resolves to the namespace itself.
+			lines.append(f"import {namespace}.other{idx}")
+
+	lines.append('')
+	return '\n'.join(lines) + '\n'
+
+
+def corpus_digest(*sources: str) -> str:
+	"""
+	Returns a short hash of the given sources, to check results were measured on the same corpus.
+
+	:param sources:
+	"""
+
+	digest = hashlib.sha256()
+
+	for source in sources:
+		digest.update(source.encode("UTF-8"))
+
+	return digest.hexdigest()[:16]
+
+
+def write_package_tree(
+		basepath: str,
+		pkg_name: str,
+		packages: int,
+		modules: int,
+		depth: int = 1,
+		seed: int = DEFAULT_SEED,
+		) -> str:
+	"""
+	Write a package with ``packages`` subpackages, each nested ``depth`` deep and containing ``modules`` modules.
+
+	Directories which are always excluded (``__pycache__``) and files which aren't Python source are included too,
+	as they are skipped during discovery.
+
+	:param basepath: The directory to write the package in.
+	:param pkg_name:
+	:param packages:
+	:param modules:
+	:param depth:
+	:param seed:
+
+	:returns: ``basepath``.
+	"""
+
+	rng = random.Random(seed)
+	root = os.path.join(basepath, pkg_name)
+	os.makedirs(root, exist_ok=True)
+	_write(os.path.join(root, "__init__.py"), "import package0\n")
+
+	for package in range(packages):
+		directory = root
+		for level in range(depth):
+			directory = os.path.join(directory, f"sub{package}_{level}")
+			os.makedirs(os.path.join(directory, "__pycache__"), exist_ok=True)
+			_write(os.path.join(directory, "__init__.py"), '')
+			_write(os.path.join(directory, "README.txt"), "Not Python.\n")
+
+		for module in range(modules):
+			_write(os.path.join(directory, f"module{module}.py"), wide_imports(rng.randint(5, 30), seed=module))
+			_write(os.path.join(directory, "__pycache__", f"module{module}.cpython-38.pyc"), '')
+
+	return basepath
+
+
+def _write(filename: str, content: str) -> None:
+	with open(filename, 'w', encoding="UTF-8") as fp:
+		fp.write(content)
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the hot paths of ``dep_checker``, each measured in isolation.
+
+Usage::
+
+	python -m benchmarks.micro [--output FILENAME] [--filter REGEX] [--quick]
+	python -m benchmarks.micro --compare BEFORE.json AFTER.json
+
+Results are written as JSON, so the results for two commits can be compared::
+
+	git checkout main && python -m benchmarks.micro --output before.json
+	git checkout my-branch && python -m benchmarks.micro --output after.json
+	python -m benchmarks.micro --compare before.json after.json
+
+Each benchmark is run enough times per repeat to take at least ``--min-time`` seconds,
+and the minimum and median time per call over the repeats are recorded.
+The minimum is the least noisy, so it is the one compared.
+"""
+
+# stdlib
+import argparse
+import ast
+import json
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# this package
+from benchmarks import corpus
+from dep_checker import DepChecker, PassingRequirement, UnlistedRequirement, UnusedRequirement, iter_files_to_check
+from dep_checker import nodep_lines as find_nodep_lines
+from dep_checker.utils import Visitor, is_suppress_importerror
+
+__all__ = ["BENCHMARKS", "Benchmark", "compare", "main", "run"]
+
+
+class Benchmark(NamedTuple):
+	name: str
+	#: Called once to prepare the benchmark, returning the function to time.
+	setup: Callable[[], Callable[[], object]]
+
+
+#: The registered benchmarks, in the order they are run.
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str) -> Callable[[Callable[[], Callable[[], object]]], Callable[[], Callable[[], object]]]:
+	"""
+	Register a benchmark. The decorated function is the benchmark's setup.
+
+	:param name:
+	"""
+
+	def deco(setup: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+		BENCHMARKS.append(Benchmark(name, setup))
+		return setup
+
+	return deco
+
+
+# The corpus, generated once. Changing these changes the digest recorded in the results.
+SOURCES: Dict[str, str] = {
+		"wide_imports": corpus.wide_imports(2_000),
+		"deep_nesting": corpus.deep_nesting(60, breadth=8),
+		"literal_table": corpus.literal_table(20_000),
+		"nodep_heavy": corpus.nodep_heavy(2_000),
+		"namespace_heavy": corpus.namespace_heavy(2_000),
+		}
+
+NAMESPACE_PACKAGES = corpus.namespace_packages(16)
+
+# Visitor, on an already-parsed AST, so the time spent in ast.parse isn't included.
+
+for _corpus_name in SOURCES:
+
+	def _visitor_setup(corpus_name: str = _corpus_name) -> Callable[[], object]:
+		tree = ast.parse(SOURCES[corpus_name])
+
+		def run_visitor() -> object:
+			# A new visitor each time, so the memoized names aren't reused between calls.
+			return list(Visitor("my_project", NAMESPACE_PACKAGES).iter_import_spans(tree))
+
+		return run_visitor
+
+	benchmark(f"visitor.{_corpus_name}")(_visitor_setup)
+
+
+@benchmark("ast.parse.wide_imports")
+def _parse_setup() -> Callable[[], object]:
+	# The baseline for the visitor benchmarks, as the source is always parsed first.
+	source = SOURCES["wide_imports"]
+	return lambda: ast.parse(source)
+
+
+@benchmark("record_import")
+def _record_import_setup() -> Callable[[], object]:
+	names = []
+
+	for node in ast.parse(SOURCES["namespace_heavy"]).body:
+		name = node.names[0].name if isinstance(node, ast.Import) else node.module  # type: ignore[attr-defined]
+		names.append((name, node.lineno))
+
+	def run_record_import() -> object:
+		visitor = Visitor("my_project", NAMESPACE_PACKAGES)
+		for name, lineno in names:
+			visitor.record_import(name, lineno)
+		return visitor.import_sources
+
+	return run_record_import
+
+
+@benchmark("is_suppress_importerror")
+def _suppress_setup() -> Callable[[], object]:
+	source = '\n'.join([
+			"with suppress(ImportError):\n\tpass",
+			"with contextlib.suppress(ModuleNotFoundError, ValueError):\n\tpass",
+			"with open(filename) as fp, lock:\n\tpass",
+			"with suppress(KeyError):\n\tpass",
+			"with a.b.c(d):\n\tpass",
+			] * 200)
+	nodes = [node for node in ast.parse(source).body if isinstance(node, ast.With)]
+
+	def run_is_suppress_importerror() -> object:
+		return [is_suppress_importerror(node) for node in nodes]
+
+	return run_is_suppress_importerror
+
+
+@benchmark("nodep_lines")
+def _nodep_setup() -> Callable[[], object]:
+	source = SOURCES["nodep_heavy"].encode("UTF-8")
+	return lambda: find_nodep_lines(source)
+
+
+@benchmark("iter_files_to_check")
+def _iter_files_setup() -> Callable[[], object]:
+	# Written once, and removed when the process exits.
+	tmpdir = tempfile.mkdtemp(prefix="dep_checker_bench_")
+	_cleanup.append(tmpdir)
+
+	basepath = corpus.write_package_tree(tmpdir, "my_project", packages=20, modules=25, depth=3)
+	return lambda: sum(1 for _ in iter_files_to_check(basepath, "my_project"))
+
+
+@benchmark("check_scanned_files")
+def _classify_setup() -> Callable[[], object]:
+	# Classification of the imports found in a package, against its requirements, without any parsing.
+	visitor = Visitor("my_project", NAMESPACE_PACKAGES, stdlib=frozenset())
+	scanned = []
+
+	for idx, source in enumerate(SOURCES.values()):
+		file_imports = [(name, lineno) for name, lineno, _ in visitor.iter_source_import_spans(source)]
+		scanned.append((_PathLike(f"module{idx}.py"), (file_imports, find_nodep_lines(source))))
+
+	requirements = corpus.requirement_names(400)[::2]
+	requirements.extend(f"{namespace}.pkg{idx}" for namespace in corpus.NAMESPACES for idx in range(8))
+	checker = DepChecker("my_project", requirements, namespace_packages=[], allowed_unused=["package2"])
+
+	return lambda: list(checker._check_scanned_files(scanned))
+
+
+@benchmark("format_error")
+def _format_error_setup() -> Callable[[], object]:
+	results = []
+
+	for idx in range(3_000):
+		results.append(PassingRequirement(name=f"package{idx}", lineno=idx, filename=f"my_project/module{idx}.py"))
+		results.append(UnlistedRequirement(name=f"other{idx}", lineno=idx, filename=f"my_project/module{idx}.py"))
+		results.append(UnusedRequirement(name=f"unused{idx}"))
+
+	return lambda: [result.format_error() for result in results]
+
+
+class _PathLike(str):
+	# The scanned filenames only need an as_posix() method.
+
+	def as_posix(self) -> str:
+		return str(self)
+
+
+_cleanup: List[str] = []
+
+
+def _time(function: Callable[[], object], min_time: float, repeat: int) -> Tuple[int, List[float]]:
+	# Returns the number of calls per repeat, and the time per call for each repeat.
+	number = 1
+
+	while True:
+		start = time.perf_counter()
+		for _ in range(number):
+			function()
+		elapsed = time.perf_counter() - start
+
+		if elapsed >= min_time:
+			break
+
+		number *= 2
+
+	timings = [elapsed / number]
+
+	for _ in range(repeat - 1):
+		start = time.perf_counter()
+		for _ in range(number):
+			function()
+		timings.append((time.perf_counter() - start) / number)
+
+	return number, timings
+
+
+def _git_revision() -> Optional[str]:
+	try:
+		process = subprocess.run(
+				["git", "describe", "--always", "--dirty"],
+				stdout=subprocess.PIPE,
+				stderr=subprocess.DEVNULL,
+				check=True,
+				)
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+	return process.stdout.decode("UTF-8").strip()
+
+
+def run(name_filter: str = '', min_time: float = 0.2, repeat: int = 7) -> Dict[str, object]:
+	"""
+	Run the benchmarks whose names match ``name_filter``, and return the results.
+
+	:param name_filter: A regular expression to search for in each benchmark's name.
+	:param min_time: The minimum time, in seconds, for each repeat.
+	:param repeat: The number of times to time each benchmark.
+	"""
+
+	pattern = re.compile(name_filter)
+	results: Dict[str, Dict[str, float]] = {}
+
+	try:
+		for bench in BENCHMARKS:
+			if not pattern.search(bench.name):
+				continue
+
+			function = bench.setup()
+			function()  # warm up
+
+			number, timings = _time(function, min_time, repeat)
+			results[bench.name] = {
+					"min": min(timings),
+					"median": statistics.median(timings),
+					"number": number,
+					"repeat": repeat,
+					}
+
+			print(f"{bench.name:<32} {_format_time(min(timings)):>10}  (median {_format_time(statistics.median(timings))})")
+	finally:
+		for tmpdir in _cleanup:
+			shutil.rmtree(tmpdir, ignore_errors=True)
+
+	return {
+			"revision": _git_revision(),
+			"python": platform.python_version(),
+			"implementation": platform.python_implementation(),
+			"machine": platform.machine(),
+			"corpus": corpus.corpus_digest(*SOURCES.values()),
+			"benchmarks": results,
+			}
+
+
+def _format_time(seconds: float) -> str:
+	for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+		if seconds >= scale:
+			return f"{seconds / scale:.3f} {unit}"
+
+	return f"{seconds / 1e-9:.1f} ns"
+
+
+def compare(before: Dict, after: Dict, threshold: float = 0.1) -> Iterator[str]:
+	"""
+	Compare two sets of results, yielding a line for each benchmark in both.
+
+	:param before:
+	:param after:
+	:param threshold: The relative change above which a benchmark is marked as slower or faster.
+	"""
+
+	if before.get("corpus") != after.get("corpus"):
+		yield "Warning: the results were measured on different corpora."
+
+	for key in ("python", "implementation", "machine"):
+		if before.get(key) != after.get(key):
+			yield f"Warning: the results were measured with different {key}s ({before.get(key)} and {after.get(key)})."
+
+	yield f"{'benchmark':<32} {'before':>10} {'after':>10}  ratio"
+
+	for name, result in after["benchmarks"].items():
+		if name not in before["benchmarks"]:
+			continue
+
+		old, new = before["benchmarks"][name]["min"], result["min"]
+		ratio = new / old
+
+		if ratio > 1 + threshold:
+			verdict = "  slower"
+		elif ratio < 1 - threshold:
+			verdict = "  faster"
+		else:
+			verdict = ''
+
+		yield f"{name:<32} {_format_time(old):>10} {_format_time(new):>10}  {ratio:.2f}x{verdict}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m benchmarks.micro", description=__doc__.splitlines()[1])
+	parser.add_argument("-o", "--output", metavar="FILENAME", help="Write the results to this file, as JSON.")
+	parser.add_argument("-k", "--filter", default='', metavar="REGEX", help="Only run matching benchmarks.")
+	parser.add_argument("--min-time", type=float, default=0.2, help="The minimum time for each repeat, in seconds.")
+	parser.add_argument("--repeat", type=int, default=7, help="The number of times to time each benchmark.")
+	parser.add_argument("--quick", action="store_true", help="Time each benchmark briefly, e.g. to check they run.")
+	parser.add_argument("--list", action="store_true", help="List the benchmarks, and exit.")
+	parser.add_argument(
+			"--compare",
+			nargs=2,
+			metavar=("BEFORE", "AFTER"),
+			help="Compare two results files, rather than running the benchmarks.",
+			)
+	args = parser.parse_args(argv)
+
+	if args.list:
+		for bench in BENCHMARKS:
+			print(bench.name)
+		return 0
+
+	if args.compare:
+		with open(args.compare[0], encoding="UTF-8") as fp:
+			before = json.load(fp)
+		with open(args.compare[1], encoding="UTF-8") as fp:
+			after = json.load(fp)
+
+		for line in compare(before, after):
+			print(line)
+		return 0
+
+	if args.quick:
+		args.min_time, args.repeat = 0.01, 1
+
+	results = run(args.filter, min_time=args.min_time, repeat=args.repeat)
+
+	if args.output:
+		with open(args.output, 'w', encoding="UTF-8") as fp:
+			json.dump(results, fp, indent=2)
+			fp.write('\n')
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic monorepo-sized package, for measuring how ``dep_checker`` scales.
+
+Usage::
+
+	python -m benchmarks.monorepo OUTPUT_DIR [--packages N] [--modules M] [--imports K]
+		[--requirements R] [--vendored V] [--seed SEED]
+
+This writes ``OUTPUT_DIR/monorepo/``, containing N subpackages of M modules each,
+a ``requirements.txt`` file listing R requirements, and a ``pyproject.toml`` file which excludes
+the V vendored directories in ``monorepo/_vendor``. The output for the same arguments is always the same.
+"""
+
+# stdlib
+import argparse
+import os
+import random
+import sys
+from typing import List, NamedTuple, Optional
+
+# this package
+from benchmarks.corpus import DEFAULT_SEED, requirement_names
+
+__all__ = ["PKG_NAME", "Monorepo", "generate", "main"]
+
+#: The name of the generated package.
+PKG_NAME = "monorepo"
+
+_STDLIB_MODULES = ("os", "sys", "re", "json", "typing", "collections", "functools", "itertools", "pathlib", "logging")
+
+
+class Monorepo(NamedTuple):
+	"""
+	Summary of a generated monorepo.
+	"""
+
+	#: The directory containing the package, requirements file and configuration.
+	directory: str
+	#: The number of Python files which are checked, excluding vendored ones.
+	files: int
+	#: The number of import statements in the checked files.
+	imports: int
+	#: The total size of the checked files, in bytes.
+	size: int
+	#: The number of Python files in vendored directories, which are excluded.
+	vendored_files: int
+
+
+def _module_source(rng: random.Random, requirements: List[str], imports: int, package: int, module: int) -> str:
+	lines = ['"""', f"Module {module} of subpackage {package}.", '"""', '']
+
+	for idx in range(imports):
+		roll = rng.random()
+
+		if roll < 0.6 and requirements:
+			name = rng.choice(requirements)
+			if idx % 3 == 0:
+				lines.append(f"from {name}.api import thing{idx}")
+			else:
+				lines.append(f"import {name}")
+		elif roll < 0.8:
+			lines.append(f"import {rng.choice(_STDLIB_MODULES)}")
+		elif roll < 0.95:
+			lines.append(f"from . import module{rng.randrange(max(module, 1))}")
+		else:
+			# Not listed as a requirement, so reported. Marked with nodep half the time.
+			marker = "  # nodep" if idx % 2 else ''
+			lines.append(f"import unlisted{rng.randrange(20)}{marker}")
+
+	lines.append('')
+
+	for function in range(max(imports // 2, 1)):
+		lines.extend([
+				'',
+				f"def function{function}(value):",
+				f'\t"""Function {function}."""',
+				"\tif value:",
+				f"\t\treturn [value * {function}, {{'key': value}}]",
+				"\treturn None",
+				])
+
+	lines.append('')
+	return '\n'.join(lines)
+
+
+def generate(
+		output_dir: str,
+		packages: int = 10,
+		modules: int = 10,
+		imports: int = 10,
+		requirements: int = 50,
+		vendored: int = 0,
+		seed: int = DEFAULT_SEED,
+		) -> Monorepo:
+	"""
+	Generate a monorepo in ``output_dir``.
+
+	:param output_dir:
+	:param packages: The number of subpackages.
+	:param modules: The number of modules in each subpackage.
+	:param imports: The number of import statements in each module.
+	:param requirements: The number of requirements.
+		Most imports are of requirements, so some requirements may be reported as unused if there are few modules.
+	:param vendored: The number of vendored libraries, each with ``modules`` modules, which are excluded.
+	:param seed:
+	"""
+
+	rng = random.Random(seed)
+	req_names = requirement_names(requirements)
+	root = os.path.join(output_dir, PKG_NAME)
+	os.makedirs(root, exist_ok=True)
+
+	files = statements = size = 0
+
+	def write(filename: str, content: str) -> None:
+		with open(filename, 'w', encoding="UTF-8") as fp:
+			fp.write(content)
+
+	write(os.path.join(root, "__init__.py"), '"""\nA synthetic monorepo.\n"""\n')
+	files += 1
+
+	for package in range(packages):
+		directory = os.path.join(root, f"subpackage{package}")
+		os.makedirs(directory, exist_ok=True)
+		write(os.path.join(directory, "__init__.py"), '')
+		files += 1
+
+		for module in range(modules):
+			source = _module_source(rng, req_names, imports, package, module)
+			write(os.path.join(directory, f"module{module}.py"), source)
+			files += 1
+			statements += imports
+			size += len(source.encode("UTF-8"))
+
+	for library in range(vendored):
+		directory = os.path.join(root, "_vendor", f"library{library}")
+		os.makedirs(directory, exist_ok=True)
+		write(os.path.join(directory, "__init__.py"), '')
+
+		for module in range(modules):
+			# Vendored code imports its own dependencies, which would be reported if it weren't excluded.
+			source = _module_source(rng, [f"vendored_dependency{library}"], imports, library, module)
+			write(os.path.join(directory, f"module{module}.py"), source)
+
+	write(os.path.join(output_dir, "requirements.txt"), ''.join(f"{name}>=1.0\n" for name in req_names))
+
+	write(os.path.join(output_dir, "pyproject.toml"), f'[tool.dep_checker]\nexclude = ["{PKG_NAME}/_vendor"]\n')
+
+	return Monorepo(
+			directory=output_dir,
+			files=files,
+			imports=statements,
+			size=size,
+			vendored_files=vendored * (modules + 1),
+			)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m benchmarks.monorepo", description=__doc__.splitlines()[1])
+	parser.add_argument("output_dir", metavar="OUTPUT_DIR")
+	parser.add_argument("--packages", type=int, default=10, help="The number of subpackages.")
+	parser.add_argument("--modules", type=int, default=10, help="The number of modules in each subpackage.")
+	parser.add_argument("--imports", type=int, default=10, help="The number of imports in each module.")
+	parser.add_argument("--requirements", type=int, default=50, help="The number of requirements.")
+	parser.add_argument("--vendored", type=int, default=0, help="The number of vendored libraries.")
+	parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+	args = parser.parse_args(argv)
+
+	monorepo = generate(
+			args.output_dir,
+			packages=args.packages,
+			modules=args.modules,
+			imports=args.imports,
+			requirements=args.requirements,
+			vendored=args.vendored,
+			seed=args.seed,
+			)
+
+	print(f"Wrote {monorepo.files} files ({monorepo.size / 1024:.0f} KiB) to {monorepo.directory}")
+	print(f"Check it with: dep-checker {PKG_NAME} --work-dir {monorepo.directory}")
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Measure how the ``dep-checker`` command line interface scales with the size of the repository.
+
+Usage::
+
+	python -m benchmarks.scaling [--packages 5,10,20,40,80] [--modules 20] [--imports 10]
+		[--requirements 100] [--vendored 2] [--repeat 3] [--tracemalloc] [--output FILENAME]
+		[-- CLI_OPTION ...]
+
+A monorepo (see ``benchmarks/monorepo.py``) is generated for each number of packages,
+and ``dep-checker`` is run on it in a fresh interpreter, ``--repeat`` times.
+Options after ``--`` are passed to ``dep-checker``; by default ``--no-cache`` is passed,
+so every file is parsed on each run.
+
+For each size the fastest run's wall time (excluding the time taken to import ``dep_checker``, which is recorded
+separately), CPU time (including worker processes) and files per second are recorded,
+along with the peak resident set size and, with ``--tracemalloc``, the peak memory
+allocated by Python. Measuring with :mod:`tracemalloc` slows the run down, so it is done in a separate run.
+
+The scaling exponent between consecutive sizes is ``log(time ratio) / log(size ratio)``:
+``1.0`` is linear, and anything much above that is super-linear.
+"""
+
+# stdlib
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+# this package
+from benchmarks.monorepo import PKG_NAME, generate
+
+__all__ = ["main", "measure", "run_once", "scaling_exponents"]
+
+# The exponent above which a step is marked as super-linear.
+SUPERLINEAR_THRESHOLD = 1.2
+
+
+def _rusage() -> Dict[str, float]:
+	try:
+		# stdlib
+		import resource
+	except ImportError:  # pragma: no cover (!Windows)
+		return {}
+
+	own = resource.getrusage(resource.RUSAGE_SELF)
+	children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+	# ru_maxrss is in bytes on macOS, and KiB elsewhere.
+	scale = 1 if sys.platform == "darwin" else 1024
+
+	return {
+			# Including starting the interpreter, and any worker processes.
+			"cpu_time": own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime,
+			"peak_rss": max(own.ru_maxrss, children.ru_maxrss) * scale,
+			}
+
+
+def run_once(work_dir: str, cli_args: List[str], trace: bool = False) -> Dict[str, Any]:
+	"""
+	Run ``dep-checker`` on the monorepo in ``work_dir``, in this process, and return the measurements.
+
+	This should be called in a fresh interpreter, so that the import time is included and the
+	peak memory usage isn't affected by previous runs.
+
+	:param work_dir:
+	:param cli_args: Additional options for ``dep-checker``.
+	:param trace: Whether to measure the peak memory allocated by Python with :mod:`tracemalloc`.
+	"""
+
+	if trace:
+		# stdlib
+		import tracemalloc
+		tracemalloc.start()
+
+	start_import = time.perf_counter()
+
+	# this package
+	from dep_checker.__main__ import main
+
+	import_time = time.perf_counter() - start_import
+	start_wall = time.perf_counter()
+
+	try:
+		main.main([PKG_NAME, "--work-dir", work_dir, "--no-colour", *cli_args], standalone_mode=False)
+		exit_code = 0
+	except SystemExit as e:
+		exit_code = e.code or 0
+
+	result: Dict[str, Any] = {
+			"wall_time": time.perf_counter() - start_wall,
+			"import_time": import_time,
+			"exit_code": exit_code,
+			}
+	result.update(_rusage())
+
+	if trace:
+		result["tracemalloc_peak"] = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+
+	return result
+
+
+def _run_child(work_dir: str, cli_args: List[str], trace: bool = False) -> Dict[str, Any]:
+	command = [sys.executable, "-m", "benchmarks.scaling", "--run-once", work_dir]
+	if trace:
+		command.append("--tracemalloc")
+
+	process = subprocess.run(
+			[*command, "--", *cli_args],
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE,
+			check=True,
+			)
+
+	# The output of dep-checker comes first; the measurements are on the last line.
+	return json.loads(process.stdout.decode("UTF-8").splitlines()[-1])
+
+
+def measure(
+		packages: int,
+		modules: int,
+		imports: int,
+		requirements: int,
+		vendored: int,
+		cli_args: List[str],
+		repeat: int = 3,
+		trace: bool = False,
+		) -> Dict[str, Any]:
+	"""
+	Generate a monorepo of the given size and measure ``dep-checker`` running on it.
+
+	:param packages:
+	:param modules:
+	:param imports:
+	:param requirements:
+	:param vendored:
+	:param cli_args: Additional options for ``dep-checker``.
+	:param repeat: The number of times to run ``dep-checker``. The fastest run is recorded.
+	:param trace: Whether to also measure the peak memory allocated by Python, in a separate run.
+	"""
+
+	with tempfile.TemporaryDirectory(prefix="dep_checker_scaling_") as tmpdir:
+		monorepo = generate(
+				tmpdir,
+				packages=packages,
+				modules=modules,
+				imports=imports,
+				requirements=requirements,
+				vendored=vendored,
+				)
+
+		runs = [_run_child(tmpdir, cli_args) for _ in range(repeat)]
+		best = min(runs, key=lambda run: run["wall_time"])
+
+		result: Dict[str, Any] = {
+				"packages": packages,
+				"files": monorepo.files,
+				"imports": monorepo.imports,
+				"size": monorepo.size,
+				"vendored_files": monorepo.vendored_files,
+				**best,
+				"files_per_second": monorepo.files / best["wall_time"],
+				"peak_rss": max(run.get("peak_rss", 0) for run in runs) or None,
+				}
+
+		if trace:
+			result["tracemalloc_peak"] = _run_child(tmpdir, cli_args, trace=True)["tracemalloc_peak"]
+
+	return result
+
+
+def scaling_exponents(points: List[Dict[str, Any]], key: str = "wall_time") -> List[Optional[float]]:
+	"""
+	Returns the scaling exponent of ``key`` with respect to the number of files, between each point and the previous.
+
+	The first element is always :py:obj:`None`.
+
+	:param points:
+	:param key:
+	"""
+
+	exponents: List[Optional[float]] = [None]
+
+	for previous, point in zip(points, points[1:]):
+		if point["files"] == previous["files"] or not previous[key]:
+			exponents.append(None)
+		else:
+			exponents.append(math.log(point[key] / previous[key]) / math.log(point["files"] / previous["files"]))
+
+	return exponents
+
+
+def _format_size(size: Optional[float]) -> str:
+	if size is None:
+		return "n/a"
+
+	return f"{size / 1024 / 1024:.1f} MiB"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	if argv is None:
+		argv = sys.argv[1:]
+
+	cli_args: List[str] = []
+	if "--" in argv:
+		argv, cli_args = argv[:argv.index("--")], argv[argv.index("--") + 1:]
+
+	parser = argparse.ArgumentParser(prog="python -m benchmarks.scaling", description=__doc__.splitlines()[1])
+	parser.add_argument("--packages", default="5,10,20,40,80", help="The numbers of subpackages to measure.")
+	parser.add_argument("--modules", type=int, default=20, help="The number of modules in each subpackage.")
+	parser.add_argument("--imports", type=int, default=10, help="The number of imports in each module.")
+	parser.add_argument("--requirements", type=int, default=100, help="The number of requirements.")
+	parser.add_argument("--vendored", type=int, default=2, help="The number of vendored libraries.")
+	parser.add_argument("--repeat", type=int, default=3, help="The number of runs at each size.")
+	parser.add_argument("--tracemalloc", action="store_true", help="Also measure the peak memory allocated by Python.")
+	parser.add_argument("-o", "--output", metavar="FILENAME", help="Write the results to this file, as JSON.")
+	parser.add_argument("--run-once", metavar="WORK_DIR", help=argparse.SUPPRESS)
+	args = parser.parse_args(argv)
+
+	if args.run_once:
+		print(json.dumps(run_once(args.run_once, cli_args, trace=args.tracemalloc)))
+		return 0
+
+	if not cli_args:
+		cli_args = ["--no-cache"]
+
+	points = []
+
+	for packages in map(int, args.packages.split(',')):
+		point = measure(
+				packages,
+				modules=args.modules,
+				imports=args.imports,
+				requirements=args.requirements,
+				vendored=args.vendored,
+				cli_args=cli_args,
+				repeat=args.repeat,
+				trace=args.tracemalloc,
+				)
+		points.append(point)
+
+	exponents = scaling_exponents(points)
+
+	print(
+			f"{'files':>7} {'wall':>9} {'cpu':>9} {'import':>9} {'files/s':>9} "
+			f"{'peak RSS':>11} {'tracemalloc':>12}  exponent"
+			)
+	for point, exponent in zip(points, exponents):
+		if exponent is None:
+			exponent_text = ''
+		else:
+			exponent_text = f"{exponent:.2f}" + ("  super-linear" if exponent > SUPERLINEAR_THRESHOLD else '')
+
+		print(
+				f"{point['files']:>7} {point['wall_time']:>8.3f}s {point.get('cpu_time', math.nan):>8.3f}s "
+				f"{point['import_time']:>8.3f}s "
+				f"{point['files_per_second']:>9.0f} {_format_size(point['peak_rss']):>11} "
+				f"{_format_size(point.get('tracemalloc_peak')):>12}  {exponent_text}"
+				)
+
+	if args.output:
+		results = {
+				"python": platform.python_version(),
+				"implementation": platform.python_implementation(),
+				"machine": platform.machine(),
+				"cpu_count": os.cpu_count(),
+				"cli_args": cli_args,
+				"points": points,
+				"exponents": exponents,
+				}
+
+		with open(args.output, 'w', encoding="UTF-8") as fp:
+			json.dump(results, fp, indent=2)
+			fp.write('\n')
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -28,22 +28,59 @@ Tool to check all requirements are actually required.
 
 # stdlib
 import ast
+import contextlib
+import functools
+import importlib
+import mmap
+import os
 import re
 import sys
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import Future
 from operator import attrgetter
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Type, Union
+from typing import (
+		TYPE_CHECKING,
+		Any,
+		Callable,
+		Collection,
+		ContextManager,
+		Dict,
+		Generator,
+		Iterable,
+		Iterator,
+		List,
+		Mapping,
+		NamedTuple,
+		Optional,
+		Set,
+		Tuple,
+		Type,
+		Union
+		)
 
 # 3rd party
-import click
-from consolekit.terminal_colours import Fore, resolve_color_default
-from domdf_python_tools.paths import PathPlus, in_directory
 from domdf_python_tools.typing import PathLike
-from shippinglabel.requirements import read_requirements
 
 # this package
-from dep_checker.config import AllowedUnused, ConfigReader, NameMapping, NamespacePackages
-from dep_checker.utils import Visitor
+from dep_checker.cache import ImportCache, ScanResult, hash_content, make_cache_key
+from dep_checker.pipeline import iter_pipelined
+from dep_checker.stdlib import get_stdlib, parse_python_version
+from dep_checker.utils import Visitor, iter_python_files
+
+if TYPE_CHECKING:
+	# stdlib
+	from concurrent.futures import ProcessPoolExecutor
+
+	# 3rd party
+	from domdf_python_tools.paths import PathPlus
+
+	# this package
+	from dep_checker.config import ConfigReader
+	from dep_checker.distributions import DistributionIndex
+	from dep_checker.git import GitObjectStore
+	from dep_checker.profiling import Profiler
 
 __author__: str = "Dominic Davis-Foster"
 __copyright__: str = "2020-2021 Dominic Davis-Foster"
@@ -64,9 +101,65 @@ __all__ = (
 #: The template to use when printing output.
 template = "{name} imported at {filename}:{lineno}"
 
-reader = ConfigReader("dep_checker", default_factory=dict)
+# Names which are imported on first use, as the modules (and their dependencies) are slow to import.
+# This keeps the command line interface and embedding applications fast to start.
+_LAZY_ATTRIBUTES = {
+		"AllowedUnused": "dep_checker.config",
+		"ConfigReader": "dep_checker.config",
+		"Exclude": "dep_checker.config",
+		"NameMapping": "dep_checker.config",
+		"NamespacePackages": "dep_checker.config",
+		}
+
+
+def __getattr__(name: str) -> Any:
+	if name == "reader":
+		return _get_reader()
+
+	if name in _LAZY_ATTRIBUTES:
+		module = importlib.import_module(_LAZY_ATTRIBUTES[name])
+		return getattr(module, name)
+
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_reader() -> "ConfigReader":
+	# this package
+	from dep_checker.config import ConfigReader
+
+	return ConfigReader("dep_checker", default_factory=dict)
+
+
+def _phase(profiler: Optional["Profiler"], name: str, filename: Optional[PathLike] = None) -> ContextManager[None]:
+	# Times the code within it as the given phase, if profiling.
+	return _NO_PHASE if profiler is None else profiler.phase(name, filename)
+
+
+def _process_pool(max_workers: int) -> "ProcessPoolExecutor":
+	# Workers are started on demand, from the pipeline's reader threads, and forking a process
+	# while other threads are running can deadlock the child. They are instead started from a
+	# single-threaded server process where the platform supports it, or spawned otherwise.
+
+	# stdlib
+	import multiprocessing
+	from concurrent.futures import ProcessPoolExecutor
+
+	method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+	return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
+
+
+_NODEP_MARKER = re.compile(r"#\s*nodep")
+_NODEP_MARKER_BYTES = re.compile(rb"#\s*nodep")
 
-NODEP = re.compile(r".*#\s*nodep.*")
+#: Files at least this many bytes in size are memory-mapped rather than read into memory.
+MMAP_THRESHOLD = 1024 * 1024
+
+# Reused for every phase when profiling is disabled, so timing is close to free.
+_NO_PHASE: ContextManager[None] = contextlib.nullcontext()
+
+# The hash of a scanned file and the imports found in it, and when profiling the time spent in each part of the scan.
+_Scanned = Union[Tuple[str, ScanResult], Tuple[str, ScanResult, Dict[str, float]]]
 
 _nt_types = Union[Type["PassingRequirement"], Type["UnlistedRequirement"], Type["UnusedRequirement"]]
 
@@ -203,6 +296,29 @@ class DepChecker:
 	:no-default name_mapping:
 	:param namespace_packages: List of namespace packages, e.g. ``ruamel.yaml``.
 	:no-default namespace_packages:
+	:param cache_dir: Directory to cache the imports found in each file in between runs.
+		If :py:obj:`None` every file is parsed on each run.
+	:param jobs: The number of processes to parse files in.
+		If :py:obj:`None` the number of CPUs is used.
+	:param exclude: Glob patterns for files and directories which shouldn't be checked.
+	:param respect_gitignore: Whether to skip files and directories ignored by git.
+	:param python_version: The version of Python the package targets, such as ``'3.8'``,
+		which determines which modules are part of the standard library.
+		If :py:obj:`None` modules from any version of Python are treated as part of the standard library.
+	:param infer_mappings: Whether to infer the names each requirement can be imported as,
+		and which are namespace packages, from the distributions installed in the current environment.
+		Names given in ``name_mapping`` take precedence.
+		The index of installed distributions is stored in ``cache_dir``, if given.
+	:param distribution_index: The index of installed distributions to use if ``infer_mappings`` is :py:obj:`True`,
+		rather than loading it. This lets checkers for several packages share one index.
+	:param profiler: If given, the time spent in each phase of the check
+		(and on each file, if the profiler is recording them) is recorded with it.
+		The results are then only yielded once all files have been checked, so they don't affect the timings.
+
+	.. versionchanged:: 0.10.0
+
+		Added the ``cache_dir``, ``jobs``, ``exclude``, ``respect_gitignore``,
+		``python_version``, ``infer_mappings``, ``distribution_index`` and ``profiler`` options.
 	"""
 
 	def __init__(
@@ -213,67 +329,652 @@ class DepChecker:
 			allowed_unused: Optional[Iterable[str]] = None,
 			name_mapping: Optional[Mapping[str, str]] = None,
 			namespace_packages: Optional[Iterable[str]] = None,
+			cache_dir: Optional[PathLike] = None,
+			jobs: Optional[int] = 1,
+			exclude: Optional[Iterable[str]] = None,
+			respect_gitignore: bool = False,
+			python_version: Optional[str] = None,
+			infer_mappings: bool = False,
+			distribution_index: Optional["DistributionIndex"] = None,
+			profiler: Optional["Profiler"] = None,
 			):
 
+		# 3rd party
+		from domdf_python_tools.paths import PathPlus
+
 		self.pkg_name: str = str(pkg_name).rstrip(r"\/")
 		self.requirements: Set[str] = set()
 		self.allowed_unused: List[str] = list(allowed_unused or ())
+		self.cache_dir: Optional[PathPlus] = None if cache_dir is None else PathPlus(cache_dir).abspath()
 
 		name_mapping = dict(name_mapping or {})
+		namespace_packages = list(namespace_packages or ())
+
+		# Other names requirements can be imported as, mapped to the requirement's name in self.requirements.
+		self._aliases: Dict[str, str] = {}
+
+		index: Optional["DistributionIndex"] = None
+		if infer_mappings and distribution_index is not None:
+			index = distribution_index
+		elif infer_mappings:
+			# this package
+			from dep_checker.distributions import DistributionIndex
+
+			index = DistributionIndex.load(self.cache_dir)
 
 		for req in requirements:
+			import_names = [] if index is None else index.import_names(req)
 			req = req.replace('-', '_')
 
 			if req in name_mapping:
 				# replace names in req_names with the name of the package the requirement provides
 				req = name_mapping[req]
+			elif import_names:
+				req, *aliases = import_names
+				self._aliases.update(dict.fromkeys(aliases, req))
+				namespace_packages.extend(name for name in import_names if '.' in name)
 
 			self.requirements.add(req)
 
 		self.namespace_packages: Dict[str, List[str]] = defaultdict(list)
 
-		for name in namespace_packages or ():
-			namespace, pkg = name.rsplit('.')
-			self.namespace_packages[namespace].append(pkg)  # pylint: disable=loop-invariant-statement
+		for name in dict.fromkeys(namespace_packages):
+			# The namespace may itself be nested, e.g. ``google.cloud.storage``
+			namespace, _, pkg = name.rpartition('.')
+			if namespace:
+				self.namespace_packages[namespace].append(pkg)  # pylint: disable=loop-invariant-statement
+
+		#: The version of Python the package targets, or :py:obj:`None` for any version.
+		self.python_version: Optional[str] = None
+
+		if python_version is not None:
+			self.python_version = parse_python_version(python_version)
+
+		#: The names of standard library modules, which are never reported.
+		self.stdlib: Collection[str] = get_stdlib(self.python_version)
+
+		# The name imports of the package itself resolve to, which are ignored.
+		self._own_name = re.sub(r"[-/\\]", '_', self.pkg_name.replace('/', '.'))
+
+		self.jobs: Optional[int] = jobs
+
+		self.exclude: List[str] = list(exclude or ())
+		self.respect_gitignore: bool = respect_gitignore
+
+		#: Records the time spent in each phase of the check, if not :py:obj:`None`.
+		self.profiler: Optional["Profiler"] = profiler
+
+	def _iter_files_to_check(self, work_dir: PathLike) -> Iterator["PathPlus"]:
+		return iter_files_to_check(work_dir, self.pkg_name, self.exclude, self.respect_gitignore)
+
+	def _scan_key(self) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+		"""
+		Returns the options which affect the imports found in each file.
+
+		Files are scanned independently of the package being checked,
+		so checkers with the same key can share the results.
+		"""
+
+		return tuple(
+				sorted((namespace, tuple(sorted(children))) for namespace, children in self.namespace_packages.items())
+				)
+
+	def _cache_key(self) -> str:
+		return make_cache_key(
+				__version__,
+				','.join(f"{namespace}.{pkg}" for namespace, children in self._scan_key() for pkg in children),
+				)
+
+	def _iter_scanned_files(
+			self,
+			work_dir: PathLike,
+			cache: Optional[ImportCache] = None,
+			) -> Generator[Tuple["PathPlus", ScanResult], None, None]:
+		"""
+		Returns an iterator over the files in the package and the imports found in each.
+
+		Discovery, reading and parsing are pipelined: files are discovered in one thread and read in a pool of threads,
+		and with multiple jobs each file is sent to a worker process as soon as it has been read.
+		The files are yielded in the order given by :func:`~.iter_files_to_check`, regardless of the number of jobs.
+
+		:param work_dir:
+		:param cache:
+		"""
+
+		profiler = self.profiler
+		namespace_packages = dict(self.namespace_packages)
+		with_hash = cache is not None
+
+		scan: Callable[[Union[bytes, mmap.mmap]], _Scanned]
+		scan_file: Callable[[str], _Scanned]
+
+		if profiler is None:
+			scan = functools.partial(
+					_scan_bytes,
+					namespace_packages=namespace_packages,
+					with_hash=with_hash,
+					)
+			scan_file = functools.partial(
+					_scan_file,
+					namespace_packages=namespace_packages,
+					with_hash=with_hash,
+					)
+		else:
+			# These also return the time spent in each part of the scan, including in worker processes.
+			scan = functools.partial(
+					_scan_bytes_timed,
+					namespace_packages=namespace_packages,
+					with_hash=with_hash,
+					)
+			scan_file = functools.partial(
+					_scan_file_timed,
+					namespace_packages=namespace_packages,
+					with_hash=with_hash,
+					)
+
+		cache_lock = threading.Lock()
+
+		# The futures which haven't been consumed yet; the number is bounded by the pipeline.
+		futures: Set["Future[_Scanned]"] = set()
+
+		with contextlib.ExitStack() as stack:
+			executor: Optional["ProcessPoolExecutor"] = None
+			if self.jobs != 1:
+				# Worker processes are only started once there are files which need parsing.
+				executor = stack.enter_context(_process_pool(self.jobs or os.cpu_count() or 1))
+
+			def read(filename: "PathPlus") -> Union[ScanResult, bytes, mmap.mmap, "Future[_Scanned]"]:
+				if cache is not None:
+					with cache_lock, _phase(profiler, "cache", filename):
+						result = cache.get(filename)
+
+					if result is not None:
+						return result
+
+				if executor is None:
+					# Parsing is CPU bound, so is done by the consumer rather than competing for the GIL.
+					with _phase(profiler, "read", filename):
+						content = _read_source(filename)
+
+					if profiler is not None:
+						profiler.count("bytes_read", len(content), filename)
+
+					return content
+
+				size = filename.stat().st_size
+				future: "Future[_Scanned]"
+
+				if size >= max(MMAP_THRESHOLD, 1):
+					# Large files are memory-mapped by the worker rather than being copied to it.
+					future = executor.submit(scan_file, os.path.abspath(filename))
+				else:
+					with _phase(profiler, "read", filename):
+						content = filename.read_bytes()
+
+					future = executor.submit(scan, content)
+
+				if profiler is not None:
+					profiler.count("bytes_read", size, filename)
+
+				futures.add(future)
+				return future
+
+			@stack.callback
+			def cancel_futures() -> None:
+				# If the caller stopped early, don't wait for files which haven't started being parsed.
+				# Copied, as the reader threads may still be adding to it.
+				for future in list(futures):
+					future.cancel()
+
+			files = self._iter_files_to_check(work_dir)
+			if profiler is not None:
+				files = profiler.iter_timed("discovery", files)
+
+			pipeline = iter_pipelined(files, read)
+			stack.enter_context(contextlib.closing(pipeline))
+
+			for filename, value in pipeline:
+				if isinstance(value, bytes):
+					scanned = scan(value)
+				elif isinstance(value, mmap.mmap):
+					try:
+						scanned = scan(value)
+					finally:
+						value.close()
+				elif isinstance(value, Future):
+					scanned = value.result()
+					futures.discard(value)
+				else:
+					if profiler is not None:
+						profiler.count("files")
+						profiler.count("cached_files", 1, filename)
+						profiler.count("imports", len(value[0]), filename)
+
+					yield filename, value
+					continue
+
+				content_hash, result = scanned[0], scanned[1]
+
+				if profiler is not None:
+					if len(scanned) == 3:
+						for phase, seconds in scanned[2].items():
+							profiler.add(phase, seconds, filename)
+
+					profiler.count("files")
+					profiler.count("imports", len(result[0]), filename)
+
+				if cache is not None:
+					with cache_lock, _phase(profiler, "cache", filename):
+						cache.put(filename, content_hash, result)
+
+				yield filename, result
+
+	def _classify(self, import_name: str, stdlib: Optional[Collection[str]] = None) -> Optional[bool]:
+		"""
+		Returns :py:obj:`None` if ``import_name`` is part of the standard library or the package itself,
+		otherwise whether it is a listed requirement.
+
+		:param import_name:
+		:param stdlib: The names of standard library modules, if not :attr:`self.stdlib <.DepChecker.stdlib>`.
+		"""  # noqa: D400
+
+		if stdlib is None:
+			stdlib = self.stdlib
+
+		if import_name in stdlib or import_name == self._own_name:
+			return None
+
+		return import_name in self.requirements or import_name in self._aliases
 
 	def check(
 			self,
 			work_dir: PathLike,
-			) -> Iterable[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]]:
+			*,
+			errors_only: bool = False,
+			) -> Generator[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement], None, None]:
 		"""
 		Perform the check itself.
 
+		The results are yielded as soon as they are found.
+		If the caller stops iterating early any outstanding parallel work is cancelled.
+
 		:param work_dir: The directory to find the source of the package in.
 			Useful with the ``src/`` layout.
+		:param errors_only: If :py:obj:`True`, :class:`~.PassingRequirement` results are not produced.
+
+		.. versionchanged:: 0.10.0  Added the ``errors_only`` option.
+		"""
+
+		if self.profiler is not None:
+			# Each phase is completed before the next starts, so they can be timed separately.
+			with self.profiler.phase("scan"):
+				scanned_files = self._scan_all(work_dir)
+
+			with self.profiler.phase("matching"):
+				results = list(self._check_scanned_files(scanned_files, errors_only=errors_only))
+
+			yield from results
+			return
+
+		# 3rd party
+		from domdf_python_tools.paths import in_directory
+
+		with contextlib.ExitStack() as stack:
+			cache = self._enter_cache(stack)
+			stack.enter_context(in_directory(work_dir))
+			scanned = stack.enter_context(contextlib.closing(self._iter_scanned_files(work_dir, cache)))
+
+			yield from self._check_scanned_files(scanned, errors_only=errors_only)
+
+	def _enter_cache(self, stack: contextlib.ExitStack) -> Optional[ImportCache]:
+		# Loads the cache, if enabled, and saves it when the stack is closed.
+		if self.cache_dir is None:
+			return None
+
+		cache = ImportCache(self.cache_dir, self._cache_key())
+
+		with _phase(self.profiler, "cache"):
+			cache.load()
+
+		@stack.callback
+		def save_cache() -> None:
+			with _phase(self.profiler, "cache"):
+				cache.save()
+
+		return cache
+
+	def _scan_all(self, work_dir: PathLike) -> List[Tuple["PathPlus", ScanResult]]:
+		# Returns the imports in every file in the package, using (and updating) the cache if enabled.
+
+		# 3rd party
+		from domdf_python_tools.paths import in_directory
+
+		with contextlib.ExitStack() as stack:
+			cache = self._enter_cache(stack)
+			stack.enter_context(in_directory(work_dir))
+			return list(self._iter_scanned_files(work_dir, cache))
+
+	def check_python_versions(
+			self,
+			work_dir: PathLike,
+			python_versions: Iterable[str],
+			*,
+			errors_only: bool = False,
+			) -> Dict[str, List[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]]]:
+		"""
+		Perform the check once for each of the given target versions of Python.
+
+		The files are only read and parsed once;
+		just the classification of the imports is repeated for each version.
+
+		.. versionadded:: 0.10.0
+
+		:param work_dir: The directory to find the source of the package in.
+			Useful with the ``src/`` layout.
+		:param python_versions: The versions of Python, such as ``'3.8'``.
+		:param errors_only: If :py:obj:`True`, :class:`~.PassingRequirement` results are not produced.
+
+		:returns: A mapping of the normalised Python versions to the results of the check for that version.
+
+		:raises ValueError: If there isn't a list of standard library modules for one of the versions.
+		"""
+
+		# Validated before doing any work
+		stdlibs = {version: get_stdlib(version) for version in map(parse_python_version, python_versions)}
+
+		with _phase(self.profiler, "scan"):
+			scanned_files = self._scan_all(work_dir)
+
+		with _phase(self.profiler, "matching"):
+			return {
+					version: list(self._check_scanned_files(scanned_files, errors_only=errors_only, stdlib=stdlib))
+					for version, stdlib in stdlibs.items()
+					}
+
+	def check_rev(
+			self,
+			rev: str,
+			work_dir: PathLike = '.',
+			*,
+			errors_only: bool = False,
+			) -> Generator[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement], None, None]:
+		"""
+		Perform the check on the package as it was at the given git revision.
+
+		The files are read directly from the repository's object store,
+		so the revision doesn't need to be checked out.
+
+		.. versionadded:: 0.10.0
+
+		:param rev: A commit-ish, such as a branch name, tag or commit hash.
+		:param work_dir: The directory to find the source of the package in, which must be within a git repository.
+			Useful with the ``src/`` layout.
+		:param errors_only: If :py:obj:`True`, :class:`~.PassingRequirement` results are not produced.
+
+		:raises ValueError: If ``rev`` isn't a valid revision.
+		"""
+
+		# this package
+		from dep_checker.git import GitObjectStore
+
+		with GitObjectStore(work_dir) as store:
+			commit = store.resolve(rev)
+
+			if self.profiler is None:
+				with contextlib.closing(self._iter_revision_files(store, commit)) as scanned:
+					yield from self._check_scanned_files(scanned, errors_only=errors_only)
+
+				return
+
+			with self.profiler.phase("scan"):
+				scanned_files = list(self._iter_revision_files(store, commit))
+
+		with self.profiler.phase("matching"):
+			results = list(self._check_scanned_files(scanned_files, errors_only=errors_only))
+
+		yield from results
+
+	def _iter_revision_files(
+			self,
+			store: "GitObjectStore",
+			commit: str,
+			) -> Generator[Tuple["PathPlus", ScanResult], None, None]:
+		namespace_packages = dict(self.namespace_packages)
+		profiler = self.profiler
+		files = store.iter_files_to_check(commit, self.pkg_name, self.exclude)
+
+		if self.jobs != 1:
+			yield from self._iter_revision_files_parallel(store, files)
+			return
+
+		if profiler is None:
+			for filename, object_hash in files:
+				yield filename, _scan_source(store.read(object_hash), namespace_packages)
+
+			return
+
+		for filename, object_hash in profiler.iter_timed("discovery", files):
+			with profiler.phase("read", filename):
+				content = store.read(object_hash)
+
+			timings: Dict[str, float] = {}
+			result = _scan_source(content, namespace_packages, timings)
+
+			for phase, seconds in timings.items():
+				profiler.add(phase, seconds, filename)
+
+			profiler.count("files")
+			profiler.count("bytes_read", len(content), filename)
+			profiler.count("imports", len(result[0]), filename)
+
+			yield filename, result
+
+	def _iter_revision_files_parallel(
+			self,
+			store: "GitObjectStore",
+			files: Iterable[Tuple["PathPlus", str]],
+			) -> Generator[Tuple["PathPlus", ScanResult], None, None]:
+		# As _iter_revision_files, but parsing the blobs in worker processes.
+
+		profiler = self.profiler
+		namespace_packages = dict(self.namespace_packages)
+
+		scan: Callable[[bytes], _Scanned]
+		if profiler is None:
+			scan = functools.partial(_scan_bytes, namespace_packages=namespace_packages)
+		else:
+			files = profiler.iter_timed("discovery", files)
+			scan = functools.partial(_scan_bytes_timed, namespace_packages=namespace_packages)
+
+		# The futures which haven't been consumed yet; the number is bounded by the pipeline.
+		futures: Set["Future[_Scanned]"] = set()
+
+		with contextlib.ExitStack() as stack:
+			executor = stack.enter_context(_process_pool(self.jobs or os.cpu_count() or 1))
+
+			def read(item: Tuple["PathPlus", str]) -> "Future[_Scanned]":
+				filename, object_hash = item
+
+				with _phase(profiler, "read", filename):
+					content = store.read(object_hash)
+
+				if profiler is not None:
+					profiler.count("bytes_read", len(content), filename)
+
+				future: "Future[_Scanned]" = executor.submit(scan, content)
+				futures.add(future)
+				return future
+
+			@stack.callback
+			def cancel_futures() -> None:
+				# If the caller stopped early, don't wait for blobs which haven't started being parsed.
+				for future in list(futures):
+					future.cancel()
+
+			# There is a single ``git cat-file`` process, so the blobs are read one at a time.
+			pipeline = iter_pipelined(files, read, workers=1)
+			stack.enter_context(contextlib.closing(pipeline))
+
+			for (filename, _), future in pipeline:
+				scanned = future.result()
+				futures.discard(future)
+				result = scanned[1]
+
+				if profiler is not None:
+					if len(scanned) == 3:
+						for phase, seconds in scanned[2].items():
+							profiler.add(phase, seconds, filename)
+
+					profiler.count("files")
+					profiler.count("imports", len(result[0]), filename)
+
+				yield filename, result
+
+	@staticmethod
+	def check_many(
+			packages: Iterable[Tuple["DepChecker", PathLike]],
+			*,
+			jobs: Optional[int] = 1,
+			cache_dir: Optional[PathLike] = None,
+			errors_only: bool = False,
+			) -> List[List[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]]]:
+		"""
+		Check several packages at once, such as those in a monorepo.
+
+		The files of every package are parsed in one pool of worker processes,
+		and each file is only parsed once even if it belongs to several packages.
+		The results are the same as calling :meth:`~.DepChecker.check` for each package.
+
+		.. versionadded:: 0.10.0
+
+		:param packages: An iterable of ``(checker, work_dir)`` tuples.
+		:param jobs: The number of processes to parse files in.
+			If :py:obj:`None` the number of CPUs is used.
+		:param cache_dir: Directory to cache the imports found in each file in between runs.
+			If :py:obj:`None` every file is parsed on each run.
+		:param errors_only: If :py:obj:`True`, :class:`~.PassingRequirement` results are not produced.
+
+		:returns: A list of the results for each package, in the same order as ``packages``.
+
+		:raises FileNotFoundError: If one of the packages can't be found.
+		"""
+
+		# 3rd party
+		from domdf_python_tools.paths import PathPlus
+
+		packages = [(checker, PathPlus(work_dir).abspath()) for checker, work_dir in packages]
+
+		package_files: List[List[PathPlus]] = []
+		to_scan: Dict[Tuple[Any, str], None] = {}  # Used as an ordered set
+
+		for checker, work_dir in packages:
+			filenames = list(checker._iter_files_to_check(work_dir))
+			package_files.append(filenames)
+
+			scan_key = checker._scan_key()
+			for filename in filenames:
+				to_scan[(scan_key, os.path.join(work_dir, filename))] = None
+
+		scanned: Dict[Tuple[Any, str], ScanResult] = {}
+
+		with contextlib.ExitStack() as stack:
+			caches: Dict[Any, ImportCache] = {}
+
+			if cache_dir is not None:
+				for checker, _ in packages:
+					scan_key = checker._scan_key()
+					if scan_key not in caches:
+						cache = ImportCache(PathPlus(cache_dir).abspath(), checker._cache_key())
+						caches[scan_key] = stack.enter_context(cache)
+
+				for item in to_scan:
+					result = caches[item[0]].get(item[1])
+					if result is not None:
+						scanned[item] = result
+
+			pending = [item for item in to_scan if item not in scanned]
+
+			scan_args = [
+					(filename, dict(namespace_packages), cache_dir is not None)
+					for namespace_packages, filename in pending
+					]
+
+			scan_results: Iterator[Tuple[str, ScanResult]]
+			if jobs == 1 or len(pending) <= 1:
+				scan_results = map(_scan_file_args, scan_args)
+			else:
+				n_workers = min(jobs or os.cpu_count() or 1, len(pending))
+				executor = stack.enter_context(_process_pool(n_workers))
+				chunksize = max(1, len(pending) // (n_workers * 4))
+				scan_results = executor.map(_scan_file_args, scan_args, chunksize=chunksize)
+
+			for item, (content_hash, result) in zip(pending, scan_results):
+				scanned[item] = result
+				if item[0] in caches:
+					caches[item[0]].put(item[1], content_hash, result)
+
+		results = []
+
+		for (checker, work_dir), filenames in zip(packages, package_files):
+			scan_key = checker._scan_key()
+			scanned_files = (
+					(filename, scanned[(scan_key, os.path.join(work_dir, filename))]) for filename in filenames
+					)
+			results.append(list(checker._check_scanned_files(scanned_files, errors_only=errors_only)))
+
+		return results
+
+	def _check_scanned_files(
+			self,
+			scanned_files: Iterable[Tuple["PathPlus", ScanResult]],
+			errors_only: bool = False,
+			stdlib: Optional[Collection[str]] = None,
+			) -> Iterator[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]]:
+		"""
+		Check the imports found in each file against the requirements.
+
+		:param scanned_files: An iterable of filenames and the imports found in them.
+		:param errors_only: If :py:obj:`True`, :class:`~.PassingRequirement` results are not produced.
+		:param stdlib: The names of standard library modules, if not :attr:`self.stdlib <.DepChecker.stdlib>`.
 		"""
 
 		imports: Dict[str, Dict[PathPlus, int]] = defaultdict(dict)
 
-		with in_directory(work_dir):
-			for filename in iter_files_to_check(work_dir, self.pkg_name):
+		# Each distinct name is only classified once, however many times it is imported.
+		classified: Dict[str, Optional[bool]] = {}
 
-				visitor = Visitor(self.pkg_name.replace('/', '.'), self.namespace_packages)
-				file_content = filename.read_text()
+		for filename, (file_imports, nodep) in scanned_files:
 
-				for import_name, lineno in visitor.visit(ast.parse(file_content)):
+			for import_name, lineno in file_imports:
 
-					if import_name in self.requirements:
-						min_lineno = min((imports[import_name].get(filename, lineno), lineno))
-						imports[import_name][filename] = min_lineno
-						continue
+				try:
+					is_requirement = classified[import_name]
+				except KeyError:
+					is_requirement = classified[import_name] = self._classify(import_name, stdlib)
 
-					# Not listed as requirement
+				if is_requirement is None:
+					# Part of the standard library
+					continue
 
-					if NODEP.match(file_content.splitlines()[lineno - 1]):
-						# Marked with "# nodep", so the user wants to ignore this
-						continue
+				if is_requirement:
+					req_name = import_name if import_name in self.requirements else self._aliases[import_name]
+					min_lineno = min((imports[req_name].get(filename, lineno), lineno))
+					imports[req_name][filename] = min_lineno
+					continue
 
-					yield UnlistedRequirement(name=import_name, lineno=lineno, filename=filename.as_posix())
+				# Not listed as requirement
+
+				if lineno in nodep:
+					# Marked with "# nodep", so the user wants to ignore this
+					continue
+
+				yield UnlistedRequirement(name=import_name, lineno=lineno, filename=filename.as_posix())
 
 		for req_name in sorted(self.requirements):
 			for filename, lineno in imports[req_name].items():
 				# Imported and listed as requirement
-				yield PassingRequirement(name=req_name, lineno=lineno, filename=filename.as_posix())
+				if not errors_only:
+					yield PassingRequirement(name=req_name, lineno=lineno, filename=filename.as_posix())
 				break
 			else:
 				if req_name not in self.allowed_unused:
@@ -281,7 +982,185 @@ class DepChecker:
 					yield UnusedRequirement(name=req_name)
 
 
-def iter_files_to_check(basepath: PathLike, pkg_name: str) -> Iterator[PathPlus]:
+@functools.lru_cache()
+def _get_visitor(namespace_packages: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Visitor:
+	# A single visitor is reused for every file (in each process).
+	# Standard library and first-party modules are filtered out by DepChecker,
+	# so the scan doesn't depend on the package being checked.
+	return Visitor('', {k: list(v) for k, v in namespace_packages}, stdlib=frozenset())
+
+
+def _scan_source(
+		source: Union[str, bytes, mmap.mmap],
+		namespace_packages: Dict[str, List[str]],
+		timings: Optional[Dict[str, float]] = None,
+		) -> ScanResult:
+	# If timings is given the time spent parsing, and in everything else, is stored in it.
+	namespace_key = tuple((namespace, tuple(children)) for namespace, children in namespace_packages.items())
+	visitor = _get_visitor(namespace_key)
+
+	spans: Iterable[Tuple[str, int, int]]
+	if timings is None:
+		spans = visitor.iter_source_import_spans(source)
+	else:
+		start = time.perf_counter()
+		spans = _timed_import_spans(visitor, source, timings)
+
+	markers = nodep_lines(source)
+
+	file_imports: List[Tuple[str, int]] = []
+	nodep: Set[int] = set()
+
+	for name, lineno, end_lineno in spans:
+		file_imports.append((name, lineno))
+
+		# The marker may be on any line of a multi-line import.
+		if markers and not markers.isdisjoint(range(lineno, end_lineno + 1)):
+			nodep.add(lineno)
+
+	if timings is not None:
+		timings["visit"] = time.perf_counter() - start - timings["parse"]
+
+	return file_imports, nodep
+
+
+def _timed_import_spans(
+		visitor: Visitor,
+		source: Union[str, bytes, mmap.mmap],
+		timings: Dict[str, float],
+		) -> List[Tuple[str, int, int]]:
+	start = time.perf_counter()
+	tree = ast.parse(source)
+	timings["parse"] = time.perf_counter() - start
+	return list(visitor.iter_import_spans(tree))
+
+
+def nodep_lines(source: Union[str, bytes, mmap.mmap]) -> Set[int]:
+	"""
+	Returns the numbers of the lines in ``source`` which are marked with ``# nodep``.
+
+	The source is scanned once, regardless of the number of imports in it.
+
+	.. versionadded:: 0.10.0
+
+	:param source: The source code, either decoded or as bytes.
+	"""
+
+	lines: Set[int] = set()
+	lineno = 1
+	position = 0
+
+	if isinstance(source, str):
+		for str_match in _NODEP_MARKER.finditer(source):
+			lineno += source.count('\n', position, str_match.start())
+			position = str_match.start()
+			lines.add(lineno)
+
+		return lines
+
+	for match in _NODEP_MARKER_BYTES.finditer(source):
+		if isinstance(source, mmap.mmap):
+			# mmap.count doesn't take start and end positions.
+			lineno += source[position:match.start()].count(b'\n')
+		else:
+			lineno += source.count(b'\n', position, match.start())
+
+		position = match.start()
+		lines.add(lineno)
+
+	return lines
+
+
+def _read_source(filename: PathLike) -> Union[bytes, mmap.mmap]:
+	"""
+	Read the given file as bytes, memory-mapping it if it is at least :data:`~.MMAP_THRESHOLD` bytes in size.
+
+	Memory-mapped files should be closed by the caller once they are no longer needed.
+
+	:param filename:
+	"""
+
+	with open(filename, "rb") as fp:
+		size = os.fstat(fp.fileno()).st_size
+
+		# Empty files can't be memory-mapped.
+		if not size or size < MMAP_THRESHOLD:
+			return fp.read()
+
+		return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _scan_bytes(
+		content: Union[bytes, mmap.mmap],
+		namespace_packages: Dict[str, List[str]],
+		with_hash: bool = False,
+		) -> Tuple[str, ScanResult]:
+	# Module-level so it can be sent to worker processes.
+	# The source isn't decoded here; the parser detects the encoding per PEP 263.
+	content_hash = hash_content(content) if with_hash else ''
+	return content_hash, _scan_source(content, namespace_packages)
+
+
+def _scan_file(
+		filename: PathLike,
+		namespace_packages: Dict[str, List[str]],
+		with_hash: bool = False,
+		) -> Tuple[str, ScanResult]:
+	content = _read_source(filename)
+
+	try:
+		return _scan_bytes(content, namespace_packages, with_hash)
+	finally:
+		if isinstance(content, mmap.mmap):
+			content.close()
+
+
+def _scan_bytes_timed(
+		content: Union[bytes, mmap.mmap],
+		namespace_packages: Dict[str, List[str]],
+		with_hash: bool = False,
+		) -> Tuple[str, ScanResult, Dict[str, float]]:
+	# As _scan_bytes, but also returns the time spent in each part of the scan, for profiling.
+	timings: Dict[str, float] = {}
+	content_hash = ''
+
+	if with_hash:
+		start = time.perf_counter()
+		content_hash = hash_content(content)
+		timings["cache"] = time.perf_counter() - start
+
+	return content_hash, _scan_source(content, namespace_packages, timings), timings
+
+
+def _scan_file_timed(
+		filename: PathLike,
+		namespace_packages: Dict[str, List[str]],
+		with_hash: bool = False,
+		) -> Tuple[str, ScanResult, Dict[str, float]]:
+	start = time.perf_counter()
+	content = _read_source(filename)
+	read_time = time.perf_counter() - start
+
+	try:
+		content_hash, result, timings = _scan_bytes_timed(content, namespace_packages, with_hash)
+	finally:
+		if isinstance(content, mmap.mmap):
+			content.close()
+
+	timings["read"] = read_time
+	return content_hash, result, timings
+
+
+def _scan_file_args(args: Tuple[str, Dict[str, List[str]], bool]) -> Tuple[str, ScanResult]:
+	return _scan_file(*args)
+
+
+def iter_files_to_check(
+		basepath: PathLike,
+		pkg_name: str,
+		exclude: Iterable[str] = (),
+		respect_gitignore: bool = False,
+		) -> Iterator["PathPlus"]:
 	"""
 	Returns an iterator over all files in ``pkg_name``.
 
@@ -291,10 +1170,22 @@ def iter_files_to_check(basepath: PathLike, pkg_name: str) -> Iterator[PathPlus]
 
 	:param basepath:
 	:param pkg_name:
+	:param exclude: Glob patterns for files and directories to skip,
+		in addition to :data:`dep_checker.utils.DEFAULT_EXCLUDE`.
+		See :func:`dep_checker.utils.iter_python_files` for details.
+	:param respect_gitignore: Whether to skip files and directories ignored by git.
 
 	:raises FileNotFoundError: If neither :file:`{<pkg_name>}.py` or the directory ``pkg_name`` is found.
+
+	.. versionchanged:: 0.10.0
+
+		* Excluded directories are no longer descended into, at any depth.
+		* Added the ``exclude`` and ``respect_gitignore`` arguments.
 	"""
 
+	# 3rd party
+	from domdf_python_tools.paths import PathPlus
+
 	basepath = PathPlus(basepath)
 
 	if (basepath / f"{pkg_name}.py").is_file():
@@ -304,13 +1195,8 @@ def iter_files_to_check(basepath: PathLike, pkg_name: str) -> Iterator[PathPlus]
 	if not (basepath / pkg_name).exists():
 		raise FileNotFoundError(f"Can't find a package called {pkg_name!r} in {basepath.as_posix()!r}")
 
-	for filename in (basepath / pkg_name.replace('.', '/')).rglob("*.py"):
-		filename = filename.relative_to(basepath)
-
-		if filename.parts[0] in {".tox", "venv", ".venv"}:  # pragma: no cover
-			continue
-
-		yield filename
+	for filename in iter_python_files(basepath, pkg_name.replace('.', '/'), exclude, respect_gitignore):
+		yield PathPlus(filename)
 
 
 def check_imports(
@@ -321,6 +1207,20 @@ def check_imports(
 		name_mapping: Optional[Dict[str, str]] = None,
 		namespace_packages: Optional[List[str]] = None,
 		work_dir: PathLike = '.',
+		cache_dir: Optional[PathLike] = None,
+		jobs: Optional[int] = 1,
+		watch: bool = False,
+		rev: Optional[str] = None,
+		fail_fast: bool = False,
+		errors_only: bool = False,
+		exclude: Optional[List[str]] = None,
+		respect_gitignore: bool = False,
+		python_version: Union[str, Iterable[str], None] = None,
+		full_requirements_parse: bool = False,
+		req_source: Optional[str] = None,
+		infer_mappings: bool = False,
+		profiler: Optional["Profiler"] = None,
+		output_format: str = "text",
 		) -> int:
 	"""
 	Check imports for the given package, against the given requirements file.
@@ -336,6 +1236,40 @@ def check_imports(
 	:param namespace_packages: List of namespace packages, e.g. ``ruamel.yaml``.
 	:no-default namespace_packages:
 	:param work_dir: The directory to find the source of the package in. Useful with the src/ layout.
+	:param cache_dir: Directory to cache the imports found in each file in between runs.
+		If :py:obj:`None` every file is parsed on each run.
+	:param jobs: The number of processes to parse files in.
+		If :py:obj:`None` the number of CPUs is used.
+	:param watch: If :py:obj:`True`, recheck the package whenever a file changes, until interrupted.
+		The return value reflects the last check.
+	:param rev: If given, check the package (and requirements file) as they were at this git revision,
+		without checking it out.
+	:param fail_fast: Stop at the first unlisted or unused requirement.
+	:param errors_only: Only show unlisted and unused requirements.
+	:param exclude: Glob patterns for files and directories which shouldn't be checked.
+	:no-default exclude:
+	:param respect_gitignore: Whether to skip files and directories ignored by git.
+		Files at a git revision (see ``rev``) are always limited to those tracked by git.
+	:param python_version: The version of Python the package targets, such as ``'3.8'``,
+		which determines which modules are part of the standard library.
+		If several versions are given the package is checked against each in turn, reusing the parsed files.
+		If :py:obj:`None` modules from any version of Python are treated as part of the standard library.
+	:param full_requirements_parse: Parse each requirement in full with :mod:`shippinglabel.requirements`,
+		rather than only reading the names. This is slower, and rejects some lines which pip accepts.
+	:param req_source: If given, read the requirements from this source instead of ``req_file``.
+		``'pyproject'`` reads the dependencies from the ``[project]`` table of ``pyproject.toml``,
+		and ``'pyproject:extra1,extra2'`` also reads the dependencies of those extras.
+		``pyproject.toml`` is looked for in ``work_dir``, and then in the current directory,
+		and is only parsed once for both the requirements and the configuration.
+	:param infer_mappings: Whether to infer the names each requirement can be imported as,
+		and which are namespace packages, from the distributions installed in the current environment.
+	:param profiler: If given, the time spent in each phase of the check is recorded with it.
+		This can't be used with ``watch``.
+	:param output_format: The format to write the results to stdout in.
+		``'text'`` prints each result in colour.
+		``'jsonl'`` writes each result as a line of JSON as soon as it is found,
+		and ``'sarif'`` writes a single :class:`SARIF log <dep_checker.output.SarifLog>` once the check has finished.
+		Formats other than ``'text'`` can't be used with ``watch``.
 
 	:rtype:
 
@@ -346,11 +1280,62 @@ def check_imports(
 
 		* Added the ``name_mapping`` option.
 		* Added the ``work_dir`` option.
+
+	.. versionchanged:: 0.10.0
+
+		* Added the ``cache_dir``, ``jobs``, ``watch``, ``rev``, ``fail_fast``,
+		  ``errors_only``, ``exclude``, ``respect_gitignore``, ``python_version``, ``full_requirements_parse``,
+		  ``req_source``, ``infer_mappings``, ``profiler`` and ``output_format`` options.
+		* Files included from the requirements file with ``-r`` are also read.
+		* Configuration files in ``work_dir`` take precedence over those in the current directory.
 	"""
 
-	ret = 0
-	config = reader.visit()
-	colour = resolve_color_default(colour)
+	if watch and rev is not None:
+		raise ValueError("'watch' and 'rev' cannot be used together.")
+
+	if watch and profiler is not None:
+		raise ValueError("'watch' and 'profiler' cannot be used together.")
+
+	if output_format != "text":
+		# this package
+		from dep_checker.output import FORMATS
+
+		if output_format not in FORMATS:
+			raise ValueError(f"Unknown output format {output_format!r}")
+
+		if watch:
+			raise ValueError("'watch' can only be used with the 'text' output format.")
+
+		# Passing requirements aren't findings, so aren't included.
+		errors_only = errors_only or output_format == "sarif"
+
+	if isinstance(python_version, str):
+		python_versions = [python_version]
+	else:
+		python_versions = list(python_version or ())
+
+	if len(python_versions) > 1 and (watch or rev is not None):
+		raise ValueError("Several Python versions cannot be checked with 'watch' or 'rev'.")
+
+	# 3rd party
+	from domdf_python_tools.paths import PathPlus
+
+	# this package
+	from dep_checker.config import AllowedUnused, Exclude, NameMapping, NamespacePackages
+	from dep_checker.requirements import (
+			parse_req_source,
+			parse_requirement_names,
+			pyproject_requirement_names,
+			read_full_requirements,
+			read_requirement_names
+			)
+
+	extras = None if req_source is None else parse_req_source(req_source)
+
+	with _phase(profiler, "config"):
+		config = _read_config(work_dir)
+
+	use_colour = _resolve_colour(colour)
 
 	if allowed_unused is None:
 		allowed_unused = AllowedUnused.get(config)
@@ -361,6 +1346,9 @@ def check_imports(
 	if namespace_packages is None:
 		namespace_packages = NamespacePackages.get(config)
 
+	if exclude is None:
+		exclude = Exclude.get(config)
+
 	work_dir = PathPlus(work_dir)
 	req_file = PathPlus(req_file)
 
@@ -370,26 +1358,267 @@ def check_imports(
 	req_file = req_file.abspath()
 	work_dir = work_dir.abspath()
 
+	if rev is not None:
+		# this package
+		from dep_checker.git import GitObjectStore
+
+		# Checked first, so an invalid revision isn't reported as the requirements file being missing from it.
+		with GitObjectStore(work_dir) as store:
+			store.resolve(rev)
+
+	requirements: Iterable[str]
+
+	with _phase(profiler, "requirements"):
+		if extras is not None:
+			requirements = pyproject_requirement_names(_read_pyproject(work_dir, rev), extras)
+		elif rev is None:
+			if full_requirements_parse:
+				requirements = map(attrgetter("name"), read_full_requirements(req_file))
+			else:
+				requirements = read_requirement_names(req_file)
+		else:
+			with GitObjectStore(work_dir) as store:
+				req_file_lines = store.read_file(rev, os.path.relpath(req_file, work_dir)).decode("UTF-8").splitlines()
+
+			if full_requirements_parse:
+				# 3rd party
+				from shippinglabel.requirements import parse_requirements
+
+				requirements = map(attrgetter("name"), parse_requirements(req_file_lines)[0])
+			else:
+				requirements = parse_requirement_names(req_file_lines)
+
+		# Read in full now, so the time isn't attributed to a later phase.
+		requirements = list(requirements)
+
 	checker = DepChecker(
 			pkg_name,
-			requirements=map(attrgetter("name"), read_requirements(req_file)[0]),
+			requirements=requirements,
 			allowed_unused=allowed_unused,
 			name_mapping=name_mapping,
 			namespace_packages=namespace_packages,
+			cache_dir=cache_dir,
+			jobs=jobs,
+			exclude=exclude,
+			respect_gitignore=respect_gitignore,
+			python_version=python_versions[0] if len(python_versions) == 1 else None,
+			infer_mappings=infer_mappings,
+			profiler=profiler,
 			)
 
-	def echo(text: str) -> None:
-		text = text.encode(sys.stdout.encoding, errors="ignore").decode(sys.stdout.encoding)
-		click.echo(text, color=colour)
+	if output_format != "text":
+		if extras is None:
+			source_file = req_file
+		else:
+			source_file = work_dir / "pyproject.toml"
+			if not source_file.is_file():
+				source_file = PathPlus("pyproject.toml").abspath()
+
+		runs: List[Tuple[Dict[str, str], Iterable[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]]]]
+		if len(python_versions) > 1:
+			all_results = checker.check_python_versions(work_dir, python_versions, errors_only=errors_only)
+			runs = [({"python_version": version}, results) for version, results in all_results.items()]
+		elif rev is not None:
+			runs = [({}, checker.check_rev(rev, work_dir, errors_only=errors_only))]
+		else:
+			runs = [({}, checker.check(work_dir, errors_only=errors_only))]
+
+		return _write_results(
+				[(properties, results, work_dir, source_file) for properties, results in runs],
+				output_format,
+				fail_fast,
+				profiler,
+				)
+
+	if len(python_versions) > 1:
+		# 3rd party
+		from consolekit.terminal_colours import Style
+
+		ret = 0
+		all_results = checker.check_python_versions(work_dir, python_versions, errors_only=errors_only)
+
+		for idx, (version, version_results) in enumerate(all_results.items()):
+			if idx:
+				_echo('', use_colour)
+
+			_echo(Style.BRIGHT(f"Python {version}"), use_colour)
+			ret |= _echo_results(version_results, use_colour, fail_fast, profiler)
+
+			if ret and fail_fast:
+				break
+
+		return ret
+
+	if rev is not None:
+		with contextlib.closing(checker.check_rev(rev, work_dir, errors_only=errors_only)) as results:
+			return _echo_results(results, use_colour, fail_fast, profiler)
+
+	if not watch:
+		with contextlib.closing(checker.check(work_dir, errors_only=errors_only)) as results:
+			return _echo_results(results, use_colour, fail_fast, profiler)
+
+	# this package
+	from dep_checker.watch import Watcher
+
+	ret = 0
+	watcher = Watcher(checker, work_dir)
+
+	try:
+		for idx, watch_results in enumerate(watcher.watch()):
+			if idx:
+				changed = ", ".join(filename.as_posix() for filename in watcher.last_scanned) or "files removed"
+				_echo(f"\nRechecking ({changed})", use_colour)
+
+			if errors_only:
+				watch_results = [item for item in watch_results if not isinstance(item, PassingRequirement)]
+
+			ret = _echo_results(watch_results, use_colour)
+	except KeyboardInterrupt:
+		pass
+
+	return ret
+
+
+def _read_config(work_dir: PathLike) -> Any:
+	# Configuration alongside the source takes precedence,
+	# but with the src/ layout it is usually in the current directory.
+	reader = _get_reader()
+	config = reader.find(work_dir)
+
+	if config is None:
+		config = reader.visit()
+
+	return config
+
+
+def _read_pyproject(work_dir: "PathPlus", rev: Optional[str] = None) -> Dict[str, Any]:
+	# Returns the parsed pyproject.toml file from work_dir, or the current directory.
+
+	if rev is not None:
+		# 3rd party
+		import dom_toml
 
-	for item in checker.check(work_dir):
+		# this package
+		from dep_checker.git import GitObjectStore
+
+		with GitObjectStore(work_dir) as store:
+			return dom_toml.loads(store.read_file(rev, "pyproject.toml").decode("UTF-8"))
+
+	# Shares the reader's cache, so the file isn't parsed again to read the configuration.
+	reader = _get_reader()
+	document = reader.load_pyproject_toml(work_dir)
+
+	if document is None:
+		document = reader.load_pyproject_toml()
+
+	if document is None:
+		raise FileNotFoundError(f"No pyproject.toml file found in {work_dir.as_posix()!r} or the current directory.")
+
+	return document
+
+
+def _resolve_colour(colour: Optional[bool]) -> bool:
+	# Falls back to the click context and the environment, and otherwise colours the output if it's a terminal.
+
+	# 3rd party
+	from consolekit.terminal_colours import resolve_color_default
+
+	resolved = resolve_color_default(colour)
+
+	if resolved is None:
+		return sys.stdout is not None and sys.stdout.isatty()
+
+	return resolved
+
+
+def _echo(text: str, colour: bool) -> None:
+	# 3rd party
+	import click
+
+	text = text.encode(sys.stdout.encoding, errors="ignore").decode(sys.stdout.encoding)
+	click.echo(text, color=colour)
+
+
+def _write_results(
+		runs: Iterable[Tuple[
+				Mapping[str, str],
+				Iterable[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]],
+				"PathPlus",
+				"PathPlus",
+				]],
+		output_format: str,
+		fail_fast: bool = False,
+		profiler: Optional["Profiler"] = None,
+		base_dir: PathLike = '.',
+		) -> int:
+	# Writes the results of each (properties, results, work_dir, requirements file) run in a machine-readable format.
+	# The output is written as bytes, bypassing the colour and encoding handling of the text output.
+
+	# this package
+	from dep_checker.output import SarifLog, write_jsonl
+
+	if profiler is not None:
+		# The checks are completed first, so only the time spent writing is measured.
+		runs = [(properties, list(results), work_dir, req_file) for properties, results, work_dir, req_file in runs]
+
+	sys.stdout.flush()
+	fp = sys.stdout.buffer
+	sarif = SarifLog(base_dir) if output_format == "sarif" else None
+	ret = 0
+
+	with _phase(profiler, "output"):
+		for properties, results, work_dir, req_file in runs:
+			try:
+				if sarif is None:
+					ret |= write_jsonl(results, fp, fail_fast, properties)
+				else:
+					ret |= sarif.add_results(results, work_dir, req_file, fail_fast, properties)
+			finally:
+				# If stopping early, don't wait for any outstanding parallel work.
+				close = getattr(results, "close", None)
+				if close is not None:
+					close()
+
+			if ret and fail_fast:
+				break
+
+		if sarif is not None:
+			sarif.write(fp)
+
+		fp.flush()
+
+	return ret
+
+
+def _echo_results(
+		results: Iterable[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]],
+		colour: bool,
+		fail_fast: bool = False,
+		profiler: Optional["Profiler"] = None,
+		) -> int:
+	# 3rd party
+	from consolekit.terminal_colours import Fore
+
+	if profiler is not None:
+		# The check is completed first, so only the time spent printing is measured.
+		results = list(results)
+
+		with profiler.phase("output"):
+			return _echo_results(results, colour, fail_fast)
+
+	ret = 0
+
+	for item in results:
 		if isinstance(item, PassingRequirement):
-			echo(Fore.GREEN(item.format_error()))
+			_echo(Fore.GREEN(item.format_error()), colour)
 		elif isinstance(item, UnusedRequirement):
-			echo(Fore.YELLOW(item.format_error()))
+			_echo(Fore.YELLOW(item.format_error()), colour)
 			ret |= 1
 		elif isinstance(item, UnlistedRequirement):
-			echo(Fore.RED(item.format_error()))
+			_echo(Fore.RED(item.format_error()), colour)
 			ret |= 1
 
+		if ret and fail_fast:
+			break
+
 	return ret
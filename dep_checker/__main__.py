@@ -27,8 +27,9 @@ Tool to check all requirements are actually required.
 #
 
 # stdlib
+import json
 import sys
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
 # 3rd party
 import click
@@ -38,11 +39,126 @@ from consolekit.utils import abort
 
 # this package
 from dep_checker import check_imports
+from dep_checker.cache import DEFAULT_CACHE_DIR
+from dep_checker.output import FORMATS
+
+if TYPE_CHECKING:
+	# this package
+	from dep_checker.profiling import Profiler
 
 __all__ = ("main", )
 
 
+def _parse_jobs(ctx: click.Context, param: click.Parameter, value: str) -> Optional[int]:
+	if value == "auto":
+		return None
+
+	try:
+		jobs = int(value)
+	except ValueError:
+		raise click.BadParameter(f"{value!r} is not a positive integer or 'auto'.", ctx=ctx, param=param)
+
+	if jobs < 1:
+		raise click.BadParameter(f"{value!r} is not a positive integer or 'auto'.", ctx=ctx, param=param)
+
+	return jobs
+
+
 @colour_option()
+@click.option(
+		"--format",
+		"output_format",
+		type=click.Choice(FORMATS),
+		default="text",
+		help="The format to write the results in. jsonl streams one JSON object per result, "
+		"and sarif writes a SARIF log of the unlisted and unused requirements.",
+		show_default=True,
+		)
+@click.option(
+		"--file-metrics",
+		type=click.STRING,
+		metavar="FILENAME",
+		default=None,
+		help="Write the time spent on each file, its size and its number of imports to this file, "
+		"as CSV if it ends in .csv and as JSON otherwise.",
+		)
+@click.option(
+		"--slowest",
+		type=click.IntRange(min=1),
+		metavar="N",
+		default=None,
+		help="Show the N files which took the longest to check.",
+		)
+@click.option(
+		"--profile-output",
+		type=click.STRING,
+		metavar="FILENAME",
+		default=None,
+		help="Write the time spent in each phase of the check to this file, as JSON. "
+		"Use with --profile to also show the table.",
+		)
+@click.option(
+		"--profile",
+		is_flag=True,
+		default=False,
+		help="Show the time spent in each phase of the check.",
+		)
+@click.option(
+		"--errors-only",
+		is_flag=True,
+		default=False,
+		help="Only show unlisted and unused requirements.",
+		)
+@click.option(
+		"--fail-fast",
+		is_flag=True,
+		default=False,
+		help="Stop at the first unlisted or unused requirement.",
+		)
+@click.option(
+		"--manifest",
+		type=click.STRING,
+		metavar="FILENAME",
+		default=None,
+		help="Check each package listed in this file, instead of PKG_NAME.",
+		)
+@click.option(
+		"--rev",
+		type=click.STRING,
+		metavar="COMMIT-ISH",
+		default=None,
+		help="Check the package as it was at this git revision, without checking it out.",
+		)
+@click.option(
+		"--watch",
+		is_flag=True,
+		default=False,
+		help="Recheck the package whenever a file changes, until interrupted.",
+		)
+@click.option(
+		"-j",
+		"--jobs",
+		type=click.STRING,
+		metavar="N",
+		default='1',
+		callback=_parse_jobs,
+		help="The number of processes to parse files in, or 'auto' to use one per CPU.",
+		show_default=True,
+		)
+@click.option(
+		"--no-cache",
+		is_flag=True,
+		default=False,
+		help="Parse every file, rather than reusing the imports found in unchanged files on a previous run.",
+		)
+@click.option(
+		"--cache-dir",
+		type=click.STRING,
+		metavar="DIRECTORY",
+		default=DEFAULT_CACHE_DIR,
+		help="The directory to store the cache in.",
+		show_default=True,
+		)
 @click.option(
 		"-d",
 		"--work-dir",
@@ -50,6 +166,39 @@ __all__ = ("main", )
 		default='.',
 		help="The directory to find the source of the package in. Useful with the src/ layout.",
 		)
+@click.option(
+		"--full-requirements-parse",
+		is_flag=True,
+		default=False,
+		help="Parse each requirement in full, rather than only reading the names.",
+		)
+@click.option(
+		"--infer-mappings",
+		is_flag=True,
+		default=False,
+		help="Infer the import names of requirements, and namespace packages, from the installed distributions.",
+		)
+@click.option(
+		"--python-version",
+		type=click.STRING,
+		multiple=True,
+		metavar="VERSION",
+		help="The version of Python the package targets, e.g. 3.8. May be given several times to check each version.",
+		)
+@click.option(
+		"--respect-gitignore",
+		is_flag=True,
+		default=False,
+		help="Skip files and directories which are ignored by git.",
+		)
+@click.option(
+		"-e",
+		"--exclude",
+		type=click.STRING,
+		multiple=True,
+		metavar="GLOB",
+		help="Files and directories which shouldn't be checked.",
+		)
 @click.option(
 		"-a",
 		"--allowed-unused",
@@ -57,6 +206,13 @@ __all__ = ("main", )
 		multiple=True,
 		help="Requirements which are allowed to be unused in the source code.",
 		)
+@click.option(
+		"--req-source",
+		type=click.STRING,
+		metavar="SOURCE",
+		default=None,
+		help="Read the requirements from 'pyproject[:extra,...]' (the [project] table of pyproject.toml) instead of --req-file.",
+		)
 @click.option(
 		"--req-file",
 		type=click.STRING,
@@ -67,14 +223,34 @@ __all__ = ("main", )
 @click.argument(
 		"pkg-name",
 		type=click.STRING,
+		required=False,
 		)
 @click_command()
 def main(
-		pkg_name: str,
+		pkg_name: Optional[str],
 		req_file: str,
 		allowed_unused: Optional[List[str]],
 		colour: Optional[bool],
 		work_dir: str = '.',
+		cache_dir: str = DEFAULT_CACHE_DIR,
+		no_cache: bool = False,
+		jobs: Optional[int] = 1,
+		watch: bool = False,
+		rev: Optional[str] = None,
+		manifest: Optional[str] = None,
+		fail_fast: bool = False,
+		errors_only: bool = False,
+		exclude: Optional[List[str]] = None,
+		respect_gitignore: bool = False,
+		python_version: Sequence[str] = (),
+		full_requirements_parse: bool = False,
+		req_source: Optional[str] = None,
+		infer_mappings: bool = False,
+		profile: bool = False,
+		profile_output: Optional[str] = None,
+		slowest: Optional[int] = None,
+		file_metrics: Optional[str] = None,
+		output_format: str = "text",
 		) -> None:
 	"""
 	Tool to check all requirements are actually required.
@@ -83,6 +259,55 @@ def main(
 	if allowed_unused == ():
 		allowed_unused = None
 
+	if exclude == ():
+		exclude = None
+
+	profiler: Optional["Profiler"] = None
+
+	record_files = slowest is not None or file_metrics is not None
+
+	if profile or profile_output is not None or record_files:
+		if watch or manifest is not None:
+			raise abort("--profile, --slowest and --file-metrics cannot be used with --watch or --manifest.")
+
+		# this package
+		from dep_checker.profiling import Profiler
+
+		profiler = Profiler(record_files=record_files)
+
+	if manifest is not None:
+		if pkg_name is not None or rev is not None or watch or req_source is not None:
+			raise abort("--manifest cannot be used with PKG_NAME, --rev, --watch or --req-source.")
+
+		if len(python_version) > 1:
+			raise abort("--python-version can only be given once with --manifest.")
+
+		# this package
+		from dep_checker.manifest import check_manifest
+
+		try:
+			ret = check_manifest(
+					manifest,
+					allowed_unused=allowed_unused,
+					colour=colour,
+					cache_dir=None if no_cache else cache_dir,
+					jobs=jobs,
+					fail_fast=fail_fast,
+					errors_only=errors_only,
+					exclude=exclude,
+					respect_gitignore=respect_gitignore,
+					python_version=python_version[0] if python_version else None,
+					full_requirements_parse=full_requirements_parse,
+					infer_mappings=infer_mappings,
+					output_format=output_format,
+					)
+			sys.exit(ret)
+		except (FileNotFoundError, ValueError) as e:
+			raise abort(str(e))
+
+	if pkg_name is None:
+		raise abort("Either PKG_NAME or --manifest is required.")
+
 	try:
 		ret = check_imports(
 				pkg_name,
@@ -90,11 +315,41 @@ def main(
 				allowed_unused=allowed_unused,
 				colour=colour,
 				work_dir=work_dir,
+				cache_dir=None if no_cache else cache_dir,
+				jobs=jobs,
+				watch=watch,
+				rev=rev,
+				fail_fast=fail_fast,
+				errors_only=errors_only,
+				exclude=exclude,
+				respect_gitignore=respect_gitignore,
+				python_version=python_version,
+				full_requirements_parse=full_requirements_parse,
+				req_source=req_source,
+				infer_mappings=infer_mappings,
+				profiler=profiler,
+				output_format=output_format,
 				)
-		sys.exit(ret)
-	except FileNotFoundError as e:
+	except (FileNotFoundError, ValueError) as e:
 		raise abort(str(e))
 
+	if profiler is not None:
+		if profile:
+			click.echo(f"\n{profiler.format_table()}", err=True)
+
+		if slowest is not None:
+			click.echo(f"\n{profiler.format_slowest(slowest)}", err=True)
+
+		if profile_output is not None:
+			with open(profile_output, 'w', encoding="UTF-8") as fp:
+				json.dump(profiler.as_dict(), fp, indent=2)
+				fp.write('\n')
+
+		if file_metrics is not None:
+			profiler.write_file_metrics(file_metrics)
+
+	sys.exit(ret)
+
 
 if __name__ == "__main__":
 	sys.exit(main())
@@ -8,18 +8,25 @@ stdlib = {
 		"AL",
 		"BaseHTTPServer",
 		"Bastion",
+		"CDROM",
 		"CGIHTTPServer",
+		"Canvas",
 		"Carbon",
 		"ColorPicker",
 		"ConfigParser",
 		"Cookie",
 		"DEVICE",
+		"DLFCN",
+		"Dialog",
 		"DocXMLRPCServer",
 		"EasyDialogs",
 		"FL",
+		"FileDialog",
+		"FixTk",
 		"FrameWork",
 		"GL",
 		"HTMLParser",
+		"IN",
 		"MacOS",
 		"MimeWriter",
 		"MiniAEFrame",
@@ -28,23 +35,140 @@ stdlib = {
 		"Queue",
 		"SUNAUDIODEV",
 		"ScrolledText",
+		"SimpleDialog",
 		"SimpleHTTPServer",
 		"SimpleXMLRPCServer",
 		"SocketServer",
 		"StringIO",
+		"TYPES",
 		"Tix",
+		"Tkconstants",
+		"Tkdnd",
 		"Tkinter",
 		"UserDict",
 		"UserList",
 		"UserString",
 		'W',
+		"_LWPCookieJar",
+		"_MozillaCookieJar",
 		"__builtin__",
 		"__future__",
+		"__main__",
+		"_abc",
+		"_abcoll",
+		"_aix_support",
+		"_android_support",
 		"_ast",
+		"_ast_unparse",
+		"_asyncio",
+		"_bisect",
+		"_blake2",
+		"_bootlocale",
+		"_bootsubprocess",
+		"_bz2",
+		"_codecs",
+		"_codecs_cn",
+		"_codecs_hk",
+		"_codecs_iso2022",
+		"_codecs_jp",
+		"_codecs_kr",
+		"_codecs_tw",
+		"_collections",
+		"_collections_abc",
+		"_colorize",
+		"_compat_pickle",
+		"_compression",
+		"_contextvars",
+		"_crypt",
+		"_csv",
+		"_ctypes",
+		"_curses",
+		"_curses_panel",
+		"_datetime",
+		"_dbm",
+		"_decimal",
 		"_dummy_thread",
+		"_elementtree",
+		"_frozen_importlib",
+		"_frozen_importlib_external",
+		"_functools",
+		"_gdbm",
+		"_hashlib",
+		"_heapq",
+		"_hmac",
+		"_hotshot",
+		"_imp",
+		"_interpchannels",
+		"_interpqueues",
+		"_interpreters",
+		"_io",
+		"_ios_support",
+		"_json",
+		"_locale",
+		"_lsprof",
+		"_lzma",
+		"_markupbase",
+		"_md5",
+		"_msi",
+		"_multibytecodec",
+		"_multiprocessing",
+		"_opcode",
+		"_opcode_metadata",
+		"_operator",
+		"_osx_support",
+		"_overlapped",
+		"_peg_parser",
+		"_pickle",
+		"_posixshmem",
+		"_posixsubprocess",
+		"_py_abc",
+		"_py_warnings",
+		"_pydatetime",
+		"_pydecimal",
+		"_pyio",
+		"_pylong",
+		"_pyrepl",
+		"_queue",
+		"_random",
+		"_remote_debugging",
+		"_scproxy",
+		"_sha",
+		"_sha1",
+		"_sha2",
+		"_sha256",
+		"_sha3",
+		"_sha512",
+		"_signal",
+		"_sitebuiltins",
+		"_socket",
+		"_sqlite3",
+		"_sre",
+		"_ssl",
+		"_stat",
+		"_statistics",
+		"_string",
+		"_strptime",
+		"_struct",
+		"_suggestions",
+		"_symtable",
+		"_sysconfig",
+		"_sysconfigdata",
 		"_thread",
+		"_threading_local",
 		"_tkinter",
+		"_tokenize",
+		"_tracemalloc",
+		"_types",
+		"_typing",
+		"_uuid",
+		"_warnings",
+		"_weakref",
+		"_weakrefset",
+		"_winapi",
 		"_winreg",
+		"_wmi",
+		"_zoneinfo",
+		"_zstd",
 		"abc",
 		"aepack",
 		"aetools",
@@ -52,6 +176,7 @@ stdlib = {
 		"aifc",
 		"al",
 		"annotationlib",
+		"antigravity",
 		"anydbm",
 		"applesingle",
 		"argparse",
@@ -61,6 +186,7 @@ stdlib = {
 		"asyncio",
 		"asyncore",
 		"atexit",
+		"audiodev",
 		"audioop",
 		"autoGIL",
 		"base64",
@@ -142,6 +268,7 @@ stdlib = {
 		"future_builtins",
 		"gc",
 		"gdbm",
+		"genericpath",
 		"gensuitemodule",
 		"getopt",
 		"getpass",
@@ -163,6 +290,7 @@ stdlib = {
 		"ic",
 		"icopen",
 		"idlelib",
+		"ihooks",
 		"imageop",
 		"imaplib",
 		"imgfile",
@@ -179,6 +307,7 @@ stdlib = {
 		"keyword",
 		"lib2to3",
 		"linecache",
+		"linuxaudiodev",
 		"locale",
 		"logging",
 		"lzma",
@@ -186,8 +315,10 @@ stdlib = {
 		"macostools",
 		"macpath",
 		"macresource",
+		"macurl2path",
 		"mailbox",
 		"mailcap",
+		"markupbase",
 		"marshal",
 		"math",
 		"md5",
@@ -206,11 +337,15 @@ stdlib = {
 		"new",
 		"nis",
 		"nntplib",
+		"nt",
 		"ntpath",
+		"nturl2path",
 		"numbers",
+		"opcode",
 		"operator",
 		"optparse",
 		"os",
+		"os2emxpath",
 		"ossaudiodev",
 		"parser",
 		"pathlib",
@@ -234,11 +369,14 @@ stdlib = {
 		"py_compile",
 		"pyclbr",
 		"pydoc",
+		"pydoc_data",
+		"pyexpat",
 		"queue",
 		"quopri",
 		"random",
 		"re",
 		"readline",
+		"repr",
 		"reprlib",
 		"resource",
 		"rexec",
@@ -275,10 +413,13 @@ stdlib = {
 		"statistics",
 		"statvfs",
 		"string",
+		"stringold",
 		"stringprep",
+		"strop",
 		"struct",
 		"subprocess",
 		"sunau",
+		"sunaudio",
 		"sunaudiodev",
 		"symbol",
 		"symtable",
@@ -292,11 +433,19 @@ stdlib = {
 		"termios",
 		"test",
 		"textwrap",
+		"this",
 		"thread",
 		"threading",
 		"time",
 		"timeit",
+		"tkColorChooser",
+		"tkCommonDialog",
+		"tkFileDialog",
+		"tkFont",
+		"tkMessageBox",
+		"tkSimpleDialog",
 		"tkinter",
+		"toaiff",
 		"token",
 		"tokenize",
 		"tomllib",
@@ -330,6 +479,7 @@ stdlib = {
 		"wsgiref",
 		"xdrlib",
 		"xml",
+		"xmllib",
 		"xmlrpc",
 		"xmlrpclib",
 		"zipapp",
@@ -0,0 +1,96 @@
+"""
+The contents of this file are generated by `update_stdlib_list.py`.
+Do not edit by hand!
+Rerun that script if changes are required.
+"""
+
+# Mapping of Python versions to the standard library modules added and removed since the previous version,
+# as strings of space-separated names.
+changes = {
+		"2.7": (
+				"BaseHTTPServer Bastion CDROM CGIHTTPServer Canvas ConfigParser Cookie DLFCN Dialog DocXMLRPCServer "
+				"FileDialog FixTk HTMLParser IN MimeWriter Queue ScrolledText SimpleDialog SimpleHTTPServer "
+				"SimpleXMLRPCServer SocketServer StringIO TYPES Tix Tkconstants Tkdnd Tkinter UserDict UserList "
+				"UserString _LWPCookieJar _MozillaCookieJar __builtin__ __future__ __main__ _abcoll _ast _bisect "
+				"_codecs _codecs_cn _codecs_hk _codecs_iso2022 _codecs_jp _codecs_kr _codecs_tw _collections _csv "
+				"_ctypes _curses _curses_panel _elementtree _functools _heapq _hotshot _io _json _locale _lsprof _md5 "
+				"_msi _multibytecodec _multiprocessing _osx_support _pyio _random _scproxy _sha _sha256 _sha512 "
+				"_socket _sqlite3 _sre _ssl _strptime _struct _symtable _sysconfigdata _threading_local _tkinter "
+				"_warnings _weakref _weakrefset _winreg abc aifc antigravity anydbm argparse array ast asynchat "
+				"asyncore atexit audiodev audioop base64 bdb binascii binhex bisect bsddb bz2 cPickle cProfile "
+				"cStringIO calendar cgi cgitb chunk cmath cmd code codecs codeop collections colorsys commands "
+				"compileall compiler contextlib cookielib copy copy_reg crypt csv ctypes curses datetime dbhash dbm "
+				"decimal difflib dircache dis distutils doctest dumbdbm dummy_thread dummy_threading email encodings "
+				"ensurepip errno exceptions fcntl filecmp fileinput fnmatch formatter fpformat fractions ftplib "
+				"functools future_builtins gc gdbm genericpath getopt getpass gettext glob grp gzip hashlib heapq "
+				"hmac hotshot htmlentitydefs htmllib httplib idlelib ihooks imaplib imghdr imp importlib imputil "
+				"inspect io itertools json keyword lib2to3 linecache linuxaudiodev locale logging macpath macurl2path "
+				"mailbox mailcap markupbase marshal math md5 mhlib mimetools mimetypes mimify mmap modulefinder "
+				"msilib msvcrt multifile multiprocessing mutex netrc new nis nntplib nt ntpath nturl2path numbers "
+				"opcode operator optparse os os2emxpath ossaudiodev parser pdb pickle pickletools pipes pkgutil "
+				"platform plistlib popen2 poplib posix posixfile posixpath pprint profile pstats pty pwd py_compile "
+				"pyclbr pydoc pydoc_data pyexpat quopri random re readline repr resource rexec rfc822 rlcompleter "
+				"robotparser runpy sched select sets sgmllib sha shelve shlex shutil signal site smtpd smtplib sndhdr "
+				"socket spwd sqlite3 sre sre_compile sre_constants sre_parse ssl stat statvfs string stringold "
+				"stringprep strop struct subprocess sunau sunaudio symbol symtable sys sysconfig syslog tabnanny "
+				"tarfile telnetlib tempfile termios test textwrap this thread threading time timeit tkColorChooser "
+				"tkCommonDialog tkFileDialog tkFont tkMessageBox tkSimpleDialog toaiff token tokenize trace traceback "
+				"ttk tty turtle types unicodedata unittest urllib urllib2 urlparse user uu uuid warnings wave weakref "
+				"webbrowser whichdb winsound wsgiref xdrlib xml xmllib xmlrpclib zipfile zipimport zlib",
+				'',
+				),
+		"3.6": (
+				"_asyncio _blake2 _bootlocale _bz2 _collections_abc _compat_pickle _compression _crypt _datetime _dbm "
+				"_decimal _dummy_thread _frozen_importlib _frozen_importlib_external _gdbm _imp _lzma _markupbase "
+				"_opcode _operator _overlapped _pickle _posixsubprocess _pydecimal _sha1 _sha3 _signal _sitebuiltins "
+				"_stat _string _thread _tracemalloc _winapi asyncio builtins concurrent configparser copyreg enum "
+				"faulthandler html http ipaddress lzma pathlib queue reprlib secrets selectors socketserver "
+				"statistics tkinter tracemalloc turtledemo typing venv winreg xmlrpc zipapp",
+				"BaseHTTPServer Bastion CDROM CGIHTTPServer Canvas ConfigParser Cookie DLFCN Dialog DocXMLRPCServer "
+				"FileDialog FixTk HTMLParser IN MimeWriter Queue ScrolledText SimpleDialog SimpleHTTPServer "
+				"SimpleXMLRPCServer SocketServer StringIO TYPES Tix Tkconstants Tkdnd Tkinter UserDict UserList "
+				"UserString _LWPCookieJar _MozillaCookieJar __builtin__ __main__ _abcoll _hotshot _sha _sysconfigdata "
+				"_winreg anydbm audiodev bsddb cPickle cStringIO commands compiler cookielib copy_reg dbhash dircache "
+				"dumbdbm dummy_thread exceptions fpformat future_builtins gdbm hotshot htmlentitydefs htmllib httplib "
+				"ihooks imputil linuxaudiodev markupbase md5 mhlib mimetools mimify multifile mutex new os2emxpath "
+				"popen2 posixfile repr rexec rfc822 robotparser sets sgmllib sha sre statvfs stringold strop sunaudio "
+				"thread tkColorChooser tkCommonDialog tkFileDialog tkFont tkMessageBox tkSimpleDialog toaiff ttk "
+				"urllib2 urlparse user whichdb xmllib xmlrpclib",
+				),
+		"3.7": (
+				"_abc _contextvars _hashlib _py_abc _queue _uuid contextvars dataclasses",
+				"macurl2path",
+				),
+		"3.8": (
+				"_posixshmem _statistics",
+				"macpath",
+				),
+		"3.9": (
+				"_aix_support _bootsubprocess _peg_parser _zoneinfo graphlib zoneinfo",
+				"_dummy_thread dummy_threading",
+				),
+		"3.10": (
+				'',
+				"_bootlocale _peg_parser formatter parser symbol",
+				),
+		"3.11": (
+				"_tokenize _typing tomllib",
+				"binhex",
+				),
+		"3.12": (
+				"_pydatetime _pylong _sha2",
+				"_bootsubprocess _sha256 _sha512 asynchat asyncore distutils imp smtpd",
+				),
+		"3.13": (
+				"_android_support _colorize _interpchannels _interpqueues _interpreters _ios_support _opcode_metadata "
+				"_pyrepl _suggestions _sysconfig _wmi",
+				"_crypt _msi aifc audioop cgi cgitb chunk crypt imghdr lib2to3 mailcap msilib nis nntplib ossaudiodev "
+				"pipes sndhdr spwd sunau telnetlib uu xdrlib",
+				),
+		# Not generated from a Python 3.14 interpreter, as none was available. The changes come from the
+		# Python 3.14 changelog, checked against the 3.14 list from the stdlib-list package.
+		"3.14": (
+				"_ast_unparse _hmac _py_warnings _remote_debugging _types _zstd annotationlib compression",
+				"_compression",
+				),
+		}
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+#
+#  cache.py
+"""
+On-disk cache of the imports found in each file.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import json
+import mmap
+import os
+import time
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+if TYPE_CHECKING:
+	# 3rd party
+	from domdf_python_tools.paths import PathPlus
+
+__all__ = (
+		"ImportCache",
+		"ScanResult",
+		"make_cache_key",
+		"hash_content",
+		"DEFAULT_CACHE_DIR",
+		"DEFAULT_MAX_ENTRIES",
+		)
+
+#: The default directory for the cache, relative to the current working directory.
+DEFAULT_CACHE_DIR = ".dep_checker_cache"
+
+#: The default maximum number of files stored in a single cache.
+DEFAULT_MAX_ENTRIES = 50_000
+
+#: The maximum number of cache files (one per cache key) kept in the cache directory.
+_MAX_CACHE_FILES = 8
+
+#: The imports in a file (as ``(name, lineno)`` tuples) and the line numbers marked with ``# nodep``.
+ScanResult = Tuple[List[Tuple[str, int]], Set[int]]
+
+
+def make_cache_key(*parts: str) -> str:
+	"""
+	Construct a cache key from the given strings.
+
+	Anything which affects the result of scanning a file
+	(such as the version of ``dep_checker`` or the list of namespace packages)
+	should be included, so that the cache is invalidated when it changes.
+
+	:param parts:
+	"""
+
+	digest = hashlib.sha256()
+
+	for part in parts:
+		digest.update(part.encode("UTF-8"))
+		digest.update(b"\0")
+
+	return digest.hexdigest()[:32]
+
+
+def hash_content(content: Union[bytes, mmap.mmap]) -> str:
+	"""
+	Returns the hash of a file's content, as stored in the cache.
+
+	:param content:
+	"""
+
+	return hashlib.sha256(content).hexdigest()
+
+
+class ImportCache:
+	"""
+	Persistent cache of the imports found in each file.
+
+	Entries are keyed on the absolute path of the file, and are considered valid
+	if the file's size and modification time are unchanged. If either has changed the file is read,
+	and if its content hash still matches the entry it is not parsed again.
+
+	The cache is loaded when entering the ``with`` block and saved when leaving it.
+	The cache directory contains a ``.gitignore`` file which ignores everything in it, so it isn't committed.
+
+	:param cache_dir: The directory to store the cache in.
+	:param key: The cache key, from :func:`~.make_cache_key`.
+	:param max_entries: The maximum number of files to store.
+		The least recently used entries are evicted first.
+	"""
+
+	def __init__(self, cache_dir: PathLike, key: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+		# 3rd party
+		from domdf_python_tools.paths import PathPlus
+
+		self.cache_dir = PathPlus(cache_dir)
+		self.key = key
+		self.max_entries = max_entries
+
+		#: The number of files whose imports were obtained from the cache.
+		self.hits = 0
+
+		#: The number of files which had to be parsed.
+		self.misses = 0
+
+		self._entries: Dict[str, Dict[str, Any]] = {}
+
+		# The stat of each file which missed, taken before it was read, for when it is stored.
+		self._miss_stats: Dict[str, os.stat_result] = {}
+
+		self._now = time.time()
+		self._dirty = False
+
+	@property
+	def cache_file(self) -> "PathPlus":
+		"""
+		The file the cache is stored in.
+		"""
+
+		return self.cache_dir / f"imports-{self.key}.json"
+
+	def load(self) -> None:
+		"""
+		Load the cache from disk.
+
+		A missing or corrupt cache file is treated as an empty cache.
+		"""
+
+		try:
+			data = json.loads(self.cache_file.read_text())
+		except (OSError, ValueError):
+			data = {}
+
+		if isinstance(data, dict) and data.get("key") == self.key and isinstance(data.get("entries"), dict):
+			self._entries = data["entries"]
+		else:
+			self._entries = {}
+
+	def save(self) -> None:
+		"""
+		Write the cache to disk, evicting the least recently used entries if it has grown too large.
+		"""
+
+		if not self._dirty:
+			return
+
+		if len(self._entries) > self.max_entries:
+			by_age = sorted(self._entries, key=lambda path: self._entries[path]["used"], reverse=True)
+			self._entries = {path: self._entries[path] for path in by_age[:self.max_entries]}
+
+		try:
+			self.cache_dir.maybe_make(parents=True)
+
+			gitignore = self.cache_dir / ".gitignore"
+			if not gitignore.is_file():
+				gitignore.write_clean("# Created by dep_checker\n*")
+
+			tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+			tmp_file.write_text(json.dumps({"key": self.key, "entries": self._entries}, separators=(',', ':')))
+			os.replace(tmp_file, self.cache_file)
+
+			self._prune_cache_files()
+		except OSError:  # pragma: no cover
+			# The cache is only an optimisation; failing to write it shouldn't fail the check.
+			return
+
+		self._dirty = False
+
+	def _prune_cache_files(self) -> None:
+		cache_files = sorted(
+				self.cache_dir.glob("imports-*.json"),
+				key=lambda path: path.stat().st_mtime,
+				reverse=True,
+				)
+
+		for stale_file in cache_files[_MAX_CACHE_FILES:]:
+			stale_file.unlink()
+
+	def get(self, filename: PathLike) -> Optional[ScanResult]:
+		"""
+		Returns the cached imports for the given file, or :py:obj:`None` if the file isn't in the cache or has changed.
+
+		:param filename:
+		"""
+
+		path = os.path.abspath(filename)
+		entry = self._entries.get(path)
+		stat = os.stat(path)
+
+		if entry is None:
+			self._miss_stats[path] = stat
+			self.misses += 1
+			return None
+
+		if entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime_ns:
+			# The file may have been touched without being modified.
+			with open(path, "rb") as fp:
+				content_hash = hash_content(fp.read())
+
+			if content_hash != entry["hash"]:
+				self._miss_stats[path] = stat
+				self.misses += 1
+				return None
+
+			entry["size"] = stat.st_size
+			entry["mtime"] = stat.st_mtime_ns
+
+		entry["used"] = self._now
+		self._dirty = True
+		self.hits += 1
+
+		return _from_entry(entry)
+
+	def put(self, filename: PathLike, content_hash: str, result: ScanResult) -> None:
+		"""
+		Store the imports for the given file.
+
+		The file's size and modification time are recorded as they were when :meth:`~.get` was called for it,
+		before it was read, so that if it is modified while being read the entry is invalid on the next run.
+
+		:param filename:
+		:param content_hash: The hash of the file's content, from :func:`~.hash_content`.
+		:param result: The imports in the file.
+		"""
+
+		path = os.path.abspath(filename)
+		stat = self._miss_stats.pop(path, None) or os.stat(path)
+
+		self._entries[path] = {
+				"size": stat.st_size,
+				"mtime": stat.st_mtime_ns,
+				"hash": content_hash,
+				"used": self._now,
+				"imports": result[0],
+				"nodep": sorted(result[1]),
+				}
+		self._dirty = True
+
+	def fetch(self, filename: PathLike, scanner: Callable[[bytes], ScanResult]) -> ScanResult:
+		"""
+		Returns the imports in the given file, from the cache if possible.
+
+		:param filename:
+		:param scanner: Function to find the imports in the file's content (as bytes) if it isn't in the cache.
+		"""
+
+		result = self.get(filename)
+
+		if result is None:
+			with open(filename, "rb") as fp:
+				content = fp.read()
+			result = scanner(content)
+			self.put(filename, hash_content(content), result)
+
+		return result
+
+	def __enter__(self) -> "ImportCache":
+		self.load()
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.save()
+
+
+def _from_entry(entry: Dict[str, Any]) -> ScanResult:
+	return [(name, lineno) for name, lineno in entry["imports"]], set(entry["nodep"])
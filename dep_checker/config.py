@@ -27,17 +27,20 @@ Functions to read configuration.
 #
 
 # stdlib
+import copy
+import os
 import re
+import threading
 from configparser import ConfigParser
-from typing import Any, Callable, Dict, List, Optional
+from stat import S_ISREG
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # 3rd party
-import dom_toml
 from configconfig.configvar import ConfigVar
 from domdf_python_tools.paths import PathPlus
 from domdf_python_tools.typing import PathLike
 
-__all__ = ("AllowedUnused", "NameMapping", "ConfigReader", "NamespacePackages")
+__all__ = ("AllowedUnused", "NameMapping", "ConfigReader", "NamespacePackages", "Exclude")
 
 
 def list_from_string(string: str) -> List[str]:
@@ -127,6 +130,52 @@ class NamespacePackages(ConfigVar):
 		return cls.default.copy()
 
 
+class Exclude(ConfigVar):
+	"""
+	List of glob patterns for files and directories which shouldn't be checked.
+
+	Each pattern is matched against both the name of the file or directory,
+	and its path relative to the working directory. Excluded directories are not descended into.
+
+	.. versionadded:: 0.10.0
+
+	**Example:**
+
+	.. code-block:: ini
+
+		[dep_checker]
+		exclude =
+			build
+			my_project/_vendor
+	"""
+
+	dtype = List[str]
+	default: List[str] = []
+	__name__ = "exclude"
+
+	@classmethod
+	def validate(cls, raw_config_vars: Optional[Dict[str, Any]] = None) -> Any:  # noqa: D102
+		if raw_config_vars is None:
+			raw_config_vars = {}
+
+		if cls.rtype is None:  # pragma: no cover
+			cls.rtype = cls.dtype
+
+		if cls.__name__ in raw_config_vars:
+			value = raw_config_vars[cls.__name__]
+			if isinstance(value, str):
+				value = list_from_string(value)
+
+			if isinstance(value, list):
+				for element in value:
+					if not isinstance(element, str):
+						raise ValueError(f"'{cls.__name__}' must be a list of strings") from None
+
+			return value
+
+		return cls.default.copy()
+
+
 class NameMapping(ConfigVar):
 	"""
 	Mapping of requirement names (e.g. "biopython") to the names of packages they provide (e.g. "Bio").
@@ -178,9 +227,15 @@ class ConfigReader:
 	"""
 	Read and parse configuration files.
 
+	Parsed files are cached, keyed on their path, modification time and size,
+	so repeatedly reading unchanged configuration doesn't parse the files again.
+
 	:param section_name:
 	:param default_factory:
-	:param work_dir:
+	:param work_dir: The directory to find the configuration files in,
+		unless another is passed to :meth:`~.ConfigReader.visit`.
+
+	.. versionchanged:: 0.10.0  Parsed configuration files are cached.
 	"""
 
 	def __init__(self, section_name: str, default_factory: Callable = dict, work_dir: PathLike = '.'):
@@ -188,56 +243,165 @@ class ConfigReader:
 		self.work_dir = PathPlus(work_dir)
 		self.default_factory = default_factory
 
-	def visit_tox_ini(self) -> Optional[Dict]:
+		# Mapping of absolute filenames to the file's (mtime, size) and the document parsed from it.
+		# The document is None if the file wasn't parsed because it can't contain the section.
+		self._cache: Dict[str, Tuple[Tuple[int, int], Optional[Dict[str, Any]]]] = {}
+		self._lock = threading.Lock()
+
+	def reload(self) -> None:
 		"""
-		Visit ``tox.ini`` and parse the configuration from it.
+		Discard all cached configuration, so the files are parsed again when next visited.
 
-		Returns :py:obj:`None` if the file doesn't exist, or if it doesn't have a ``dep_checker`` section.
+		.. versionadded:: 0.10.0
 		"""
 
-		if (self.work_dir / "tox.ini").is_file():
-			tox_ini = ConfigParser()
-			tox_ini.read(self.work_dir / "tox.ini", encoding="UTF-8")
+		with self._lock:
+			self._cache.clear()
+
+	def _load(
+			self,
+			filename: PathPlus,
+			parser: Callable[[str], Dict[str, Any]],
+			marker: Optional[bytes] = None,
+			) -> Optional[Dict[str, Any]]:
+		# Returns the document parsed from the file, or None if the file doesn't exist.
+		# If ``marker`` is given and isn't in the file it isn't parsed, and an empty document is returned.
+
+		key = os.path.abspath(filename)
+
+		try:
+			stat = os.stat(key)
+		except OSError:
+			with self._lock:
+				self._cache.pop(key, None)
+			return None
+
+		if not S_ISREG(stat.st_mode):
+			return None
 
-			if self.section_name in tox_ini:
-				return dict(tox_ini[self.section_name])
+		stat_key = (stat.st_mtime_ns, stat.st_size)
+
+		with self._lock:
+			cached = self._cache.get(key)
+
+		if cached is not None and cached[0] == stat_key and (cached[1] is not None or marker is not None):
+			document = cached[1]
+		else:
+			content = PathPlus(key).read_bytes()
+
+			if marker is not None and marker not in content:
+				# Searching for the marker is much quicker than parsing the file.
+				document = None
+			else:
+				document = parser(content.decode("UTF-8"))
+
+			with self._lock:
+				self._cache[key] = (stat_key, document)
+
+		return {} if document is None else document
+
+	@staticmethod
+	def _parse_ini(content: str) -> Dict[str, Any]:
+		config = ConfigParser()
+		config.read_string(content)
+
+		# Values are interpolated when the section is read, so only the dep_checker section is interpolated.
+		# Other tools' sections may contain values which are invalid for interpolation, such as ``%Y-%m-%d``.
+		return {section: config[section] for section in config.sections()}
+
+	@staticmethod
+	def _parse_toml(content: str) -> Dict[str, Any]:
+		# 3rd party
+		import dom_toml  # Only imported when needed, as it is slow to import.
+
+		return dom_toml.loads(content)
+
+	def _get_work_dir(self, work_dir: Optional[PathLike]) -> PathPlus:
+		return self.work_dir if work_dir is None else PathPlus(work_dir)
+
+	def _visit_ini(self, filename: PathPlus) -> Optional[Dict]:
+		document = self._load(filename, self._parse_ini, self.section_name.encode("UTF-8"))
+
+		if document and self.section_name in document:
+			# Copied so callers can't modify the cached configuration.
+			return dict(document[self.section_name])
 
 		return None
 
-	def visit_setup_cfg(self) -> Optional[Dict]:
+	def visit_tox_ini(self, work_dir: Optional[PathLike] = None) -> Optional[Dict]:
 		"""
-		Visit ``setup.cfg`` and parse the configuration from it.
+		Visit ``tox.ini`` and parse the configuration from it.
 
 		Returns :py:obj:`None` if the file doesn't exist, or if it doesn't have a ``dep_checker`` section.
+
+		:param work_dir: The directory to find the file in, if not :attr:`self.work_dir <.ConfigReader.work_dir>`.
+
+		.. versionchanged:: 0.10.0  Added the ``work_dir`` argument.
 		"""
 
-		if (self.work_dir / "setup.cfg").is_file():
-			tox_ini = ConfigParser()
-			tox_ini.read(self.work_dir / "setup.cfg", encoding="UTF-8")
+		return self._visit_ini(self._get_work_dir(work_dir) / "tox.ini")
 
-			if self.section_name in tox_ini:
-				return dict(tox_ini[self.section_name])
+	def visit_setup_cfg(self, work_dir: Optional[PathLike] = None) -> Optional[Dict]:
+		"""
+		Visit ``setup.cfg`` and parse the configuration from it.
 
-		return None
+		Returns :py:obj:`None` if the file doesn't exist, or if it doesn't have a ``dep_checker`` section.
+
+		:param work_dir: The directory to find the file in, if not :attr:`self.work_dir <.ConfigReader.work_dir>`.
+
+		.. versionchanged:: 0.10.0  Added the ``work_dir`` argument.
+		"""
 
-	def visit_pyproject_toml(self) -> Optional[Dict]:
+		return self._visit_ini(self._get_work_dir(work_dir) / "setup.cfg")
+
+	def visit_pyproject_toml(self, work_dir: Optional[PathLike] = None) -> Optional[Dict]:
 		"""
 		Visit ``pyproject.toml`` and parse the configuration from it.
 
 		Returns :py:obj:`None` if the file doesn't exist, or if it doesn't have a ``dep_checker`` section.
+
+		:param work_dir: The directory to find the file in, if not :attr:`self.work_dir <.ConfigReader.work_dir>`.
+
+		.. versionchanged:: 0.10.0
+
+			* Added the ``work_dir`` argument.
+			* The file is no longer parsed if it doesn't contain the section name,
+			  unless it has already been parsed by :meth:`~.ConfigReader.load_pyproject_toml`.
 		"""
 
-		if (self.work_dir / "pyproject.toml").is_file():
-			config = dom_toml.load(self.work_dir / "pyproject.toml")
+		filename = self._get_work_dir(work_dir) / "pyproject.toml"
+		document = self._load(filename, self._parse_toml, self.section_name.encode("UTF-8"))
 
-			if "tool" in config and self.section_name in config["tool"]:
-				return config["tool"][self.section_name]
+		if document and self.section_name in document.get("tool", {}):
+			# Copied so callers can't modify the cached configuration.
+			return copy.deepcopy(document["tool"][self.section_name])
 
 		return None
 
-	def visit(self) -> Any:
+	def load_pyproject_toml(self, work_dir: Optional[PathLike] = None) -> Optional[Dict[str, Any]]:
+		"""
+		Returns the whole of the parsed ``pyproject.toml`` file, or :py:obj:`None` if it doesn't exist.
+
+		The document is cached along with the configuration,
+		so the file is parsed at most once whether this or :meth:`~.ConfigReader.visit_pyproject_toml` is called first.
+		The returned document is shared, and must not be modified.
+
+		.. versionadded:: 0.10.0
+
+		:param work_dir: The directory to find the file in, if not :attr:`self.work_dir <.ConfigReader.work_dir>`.
+		"""
+
+		return self._load(self._get_work_dir(work_dir) / "pyproject.toml", self._parse_toml)
+
+	def find(self, work_dir: Optional[PathLike] = None) -> Optional[Any]:
 		"""
 		Visit all config files and parse the configuration from the first one containing the ``dep_checker`` section.
+
+		Returns :py:obj:`None` if none of the files contain the section.
+
+		.. versionadded:: 0.10.0
+
+		:param work_dir: The directory to find the files in, if not :attr:`self.work_dir <.ConfigReader.work_dir>`.
 		"""
 
 		for file in [
@@ -245,8 +409,23 @@ class ConfigReader:
 				self.visit_tox_ini,
 				self.visit_setup_cfg,
 				]:
-			ret = file()
+			ret = file(work_dir)
 			if ret is not None:
 				return ret
 
+		return None
+
+	def visit(self, work_dir: Optional[PathLike] = None) -> Any:
+		"""
+		Visit all config files and parse the configuration from the first one containing the ``dep_checker`` section.
+
+		:param work_dir: The directory to find the files in, if not :attr:`self.work_dir <.ConfigReader.work_dir>`.
+
+		.. versionchanged:: 0.10.0  Added the ``work_dir`` argument.
+		"""
+
+		ret = self.find(work_dir)
+		if ret is not None:
+			return ret
+
 		return self.default_factory()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+#
+#  distributions.py
+"""
+Index of the import names provided by the distributions installed in the current environment.
+
+This is used to infer the :confval:`name_mapping` and :confval:`namespace_packages` options,
+from the ``top_level.txt`` and ``RECORD`` files in each distribution's metadata.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import csv
+import json
+import os
+import re
+import sys
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from dep_checker.cache import make_cache_key
+from dep_checker.requirements import normalize_name
+
+__all__ = ("DistributionIndex", "get_site_packages")
+
+#: Incremented when the format of the index, or the way it is built, changes.
+_INDEX_VERSION = '1'
+
+#: The maximum number of index files (one per set of site-packages directories) kept in the cache directory.
+_MAX_INDEX_FILES = 4
+
+# The name of the distribution from the name of its metadata directory, e.g. ``ruamel.yaml-0.17.21.dist-info``.
+_METADATA_DIR_RE = re.compile(r"([^-]+)(?:-.*)?\.(?:dist|egg)-info")
+
+# Files which can be imported as modules. Extension modules may have an ABI tag, e.g. ``foo.cpython-311-x86_64.so``.
+_MODULE_RE = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)(?:\.[^.]+)?\.(?:py|pyc|so|pyd)")
+
+
+def get_site_packages() -> List[str]:
+	"""
+	Returns the ``site-packages`` (and ``dist-packages``) directories on :py:data:`sys.path`.
+	"""
+
+	return [
+			path for path in sys.path
+			if os.path.basename(path) in {"site-packages", "dist-packages"} and os.path.isdir(path)
+			]
+
+
+def _read_lines(filename: str) -> List[str]:
+	try:
+		with open(filename, encoding="UTF-8") as fp:
+			return [line.strip() for line in fp if line.strip()]
+	except OSError:
+		return []
+
+
+def _import_names_from_record(record: Iterable[str]) -> Set[str]:
+	# The importable names from a distribution's RECORD, descending into namespace packages.
+	files: List[List[str]] = []
+	packages: Set[str] = set()  # Directories with an __init__.py file
+
+	for row in csv.reader(record):
+		if not row or row[0].startswith("..") or row[0].startswith('/'):
+			# Scripts and data files outside of site-packages
+			continue
+
+		parts = row[0].split('/')
+
+		if parts[0].endswith((".dist-info", ".egg-info", ".data")) or "__pycache__" in parts:
+			continue
+
+		if parts[-1] in {"__init__.py", "__init__.pyc"}:
+			packages.add('/'.join(parts[:-1]))
+
+		files.append(parts)
+
+	names: Set[str] = set()
+
+	for parts in files:
+		for idx in range(len(parts)):
+			if idx == len(parts) - 1:
+				# A module, either at the top level or within a namespace package.
+				match = _MODULE_RE.fullmatch(parts[idx])
+				if match is not None and not match.group(1).startswith("__editable__"):
+					names.add('.'.join([*parts[:idx], match.group(1)]))
+			elif '/'.join(parts[:idx + 1]) in packages:
+				if all(part.isidentifier() for part in parts[:idx + 1]):
+					names.add('.'.join(parts[:idx + 1]))
+			else:
+				# A namespace package, or a directory which can't be imported (e.g. ``share``).
+				continue
+
+			break
+
+	return names
+
+
+def _read_distribution(path: str, metadata_dir: str) -> List[str]:
+	metadata_path = os.path.join(path, metadata_dir)
+	top_level = _read_lines(os.path.join(metadata_path, "top_level.txt"))
+
+	# top_level.txt lists the namespace (e.g. ``ruamel``) rather than the package (e.g. ``ruamel.yaml``),
+	# and isn't written by all build backends, so the RECORD is read if it is needed.
+	if top_level and not any(_is_namespace(path, name) for name in top_level):
+		return [name.replace('/', '.') for name in top_level]
+
+	record = _read_lines(os.path.join(metadata_path, "RECORD"))
+	if record:
+		return sorted(_import_names_from_record(record))
+
+	# setuptools' egg-info only has top_level.txt, but may list pkg_resources-style namespace packages.
+	namespace_packages = set(_read_lines(os.path.join(metadata_path, "namespace_packages.txt")))
+	return [name for name in top_level if name not in namespace_packages]
+
+
+def _is_namespace(path: str, name: str) -> bool:
+	directory = os.path.join(path, name)
+	return os.path.isdir(directory) and not os.path.isfile(os.path.join(directory, "__init__.py"))
+
+
+class DistributionIndex:
+	"""
+	Mapping of requirement names to the names a distribution can be imported as.
+
+	Names within namespace packages (see :confval:`namespace_packages`) include the namespace, e.g. ``ruamel.yaml``.
+
+	:param top_level: Mapping of requirement names, normalized with :func:`~.normalize_name`, to import names.
+	"""
+
+	def __init__(self, top_level: Mapping[str, Sequence[str]]):
+		self.top_level: Dict[str, List[str]] = {name: list(import_names) for name, import_names in top_level.items()}
+
+	@classmethod
+	def build(cls, paths: Optional[Iterable[PathLike]] = None) -> "DistributionIndex":
+		"""
+		Construct an index from the metadata of the distributions installed in the given directories.
+
+		If a distribution is installed in more than one directory the first is used, as with :mod:`importlib.metadata`.
+
+		:param paths: The directories to search. Defaults to the ``site-packages`` directories on :py:data:`sys.path`.
+		"""
+
+		top_level: Dict[str, List[str]] = {}
+		site_packages: List[str] = [os.fspath(path) for path in (get_site_packages() if paths is None else paths)]
+
+		for path in site_packages:
+			try:
+				entries = os.listdir(path)
+			except OSError:
+				continue
+
+			for entry in sorted(entries):
+				match = _METADATA_DIR_RE.fullmatch(entry)
+
+				if match is None:
+					continue
+
+				name = normalize_name(match.group(1))
+				if name not in top_level:
+					top_level[name] = _read_distribution(path, entry)
+
+		return cls(top_level)
+
+	@classmethod
+	def load(
+			cls,
+			cache_dir: Optional[PathLike] = None,
+			paths: Optional[Iterable[PathLike]] = None,
+			) -> "DistributionIndex":
+		"""
+		Load the index from ``cache_dir``, building it if it isn't cached or the environment has changed.
+
+		The index is keyed on the modification times of the directories,
+		which change whenever a distribution is installed, upgraded or removed.
+
+		:param cache_dir: The directory to store the index in. If :py:obj:`None` the index is built each time.
+		:param paths: The directories to search. Defaults to the ``site-packages`` directories on :py:data:`sys.path`.
+		"""
+
+		site_packages: List[str] = [os.fspath(path) for path in (get_site_packages() if paths is None else paths)]
+
+		if cache_dir is None:
+			return cls.build(site_packages)
+
+		key_parts = [_INDEX_VERSION]
+		for path in site_packages:
+			try:
+				key_parts.append(f"{os.path.abspath(path)}:{os.stat(path).st_mtime_ns}")
+			except OSError:
+				continue
+
+		key = make_cache_key(*key_parts)
+		cache_dir = PathPlus(cache_dir)
+		index_file = cache_dir / f"distributions-{key}.json"
+
+		try:
+			data = json.loads(index_file.read_text())
+		except (OSError, ValueError):
+			data = None
+
+		if isinstance(data, dict) and data.get("key") == key and isinstance(data.get("top_level"), dict):
+			return cls(data["top_level"])
+
+		index = cls.build(site_packages)
+
+		try:
+			cache_dir.maybe_make(parents=True)
+
+			gitignore = cache_dir / ".gitignore"
+			if not gitignore.is_file():
+				gitignore.write_clean("# Created by dep_checker\n*")
+
+			tmp_file = index_file.with_suffix(f".{os.getpid()}.tmp")
+			tmp_file.write_text(json.dumps({"key": key, "top_level": index.top_level}, separators=(',', ':')))
+			os.replace(tmp_file, index_file)
+
+			index_files = sorted(
+					cache_dir.glob("distributions-*.json"),
+					key=lambda path: path.stat().st_mtime,
+					reverse=True,
+					)
+
+			for stale_file in index_files[_MAX_INDEX_FILES:]:
+				stale_file.unlink()
+		except OSError:  # pragma: no cover
+			# The index is only cached as an optimisation.
+			pass
+
+		return index
+
+	def import_names(self, requirement: str) -> List[str]:
+		"""
+		Returns the names the given requirement can be imported as, or an empty list if it isn't installed.
+
+		The preferred name is first: the requirement's own name if it can be imported as that,
+		otherwise the first public name alphabetically.
+
+		:param requirement:
+		"""
+
+		import_names = self.top_level.get(normalize_name(requirement), [])
+		own_name = normalize_name(requirement).replace('-', '_')
+
+		def sort_key(import_name: str) -> Tuple[bool, bool, str]:
+			return import_name.lower() != own_name, import_name.startswith('_'), import_name
+
+		return sorted(import_names, key=sort_key)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+#
+#  git.py
+"""
+Read a package's files at a given git revision directly from the object store, without checking it out.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import subprocess
+from types import TracebackType
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Type
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from dep_checker.utils import DEFAULT_EXCLUDE, PathMatcher
+
+__all__ = ["GitObjectStore"]
+
+# The mode of symbolic links in a tree.
+_SYMLINK_MODE = b"120000"
+
+
+class GitObjectStore:
+	"""
+	Reads files from a git repository's object store.
+
+	Blobs are read through a single long-lived ``git cat-file --batch`` process,
+	which is started when entering the ``with`` block and stopped when leaving it.
+
+	:param work_dir: A directory within the repository.
+		Paths are interpreted relative to this directory, as with ``git ls-tree``.
+	"""
+
+	def __init__(self, work_dir: PathLike = '.'):
+		self.work_dir = PathPlus(work_dir).abspath()
+		self._process: Optional[subprocess.Popen] = None
+
+	def _git(self, *args: str) -> bytes:
+		process = subprocess.run(
+				["git", *args],
+				cwd=self.work_dir,
+				stdout=subprocess.PIPE,
+				stderr=subprocess.PIPE,
+				)
+
+		if process.returncode:
+			raise ValueError(process.stderr.decode("UTF-8", errors="replace").strip())
+
+		return process.stdout
+
+	def resolve(self, rev: str) -> str:
+		"""
+		Returns the hash of the commit referred to by ``rev``.
+
+		:param rev: A commit-ish, such as a branch name, tag or commit hash.
+
+		:raises ValueError: If ``rev`` isn't a valid revision, or ``work_dir`` isn't within a git repository.
+		"""
+
+		try:
+			return self._git("rev-parse", "--verify", f"{rev}^{{commit}}").decode().strip()
+		except ValueError as e:
+			raise ValueError(f"Can't resolve the revision {rev!r}: {e}") from None
+
+	def ls_tree(self, rev: str, *paths: str) -> List[Tuple[PathPlus, str]]:
+		"""
+		Returns the blobs at or beneath the given paths at ``rev``.
+
+		Symbolic links are skipped, as their blobs contain the path they point to rather than the file's content.
+
+		:param rev: A commit-ish, such as a branch name, tag or commit hash.
+		:param paths: Paths relative to ``work_dir``.
+
+		:returns: A list of ``(path, object_hash)`` tuples, with paths relative to ``work_dir``.
+		"""
+
+		output = self._git("ls-tree", "-r", "-z", rev, "--", *paths)
+		blobs = []
+
+		for entry in output.split(b'\0'):
+			if not entry:
+				continue
+
+			info, path = entry.split(b'\t', 1)
+			mode, object_type, object_hash = info.split(b' ')
+
+			if object_type == b"blob" and mode != _SYMLINK_MODE:
+				blobs.append((PathPlus(path.decode("UTF-8")), object_hash.decode()))
+
+		return blobs
+
+	def iter_files_to_check(
+			self,
+			rev: str,
+			pkg_name: str,
+			exclude: Iterable[str] = (),
+			) -> Iterator[Tuple[PathPlus, str]]:
+		"""
+		Returns an iterator over all Python files in ``pkg_name`` at ``rev``, and their object hashes.
+
+		Mirrors :func:`dep_checker.iter_files_to_check`.
+
+		:param rev: A commit-ish, such as a branch name, tag or commit hash.
+		:param pkg_name:
+		:param exclude: Glob patterns for files and directories to skip, in addition to :data:`~.DEFAULT_EXCLUDE`.
+
+		:raises FileNotFoundError: If neither :file:`{<pkg_name>}.py` or the directory ``pkg_name`` is found.
+		"""
+
+		module = f"{pkg_name}.py"
+		package = pkg_name.replace('.', '/')
+		blobs = self.ls_tree(rev, module, package)
+
+		for filename, object_hash in blobs:
+			if filename.as_posix() == module:
+				yield filename, object_hash
+				return
+
+		if not blobs:
+			raise FileNotFoundError(f"Can't find a package called {pkg_name!r} in {rev!r}")
+
+		matcher = PathMatcher((*DEFAULT_EXCLUDE, *exclude))
+
+		for filename, object_hash in blobs:
+			if filename.suffix != ".py" or matcher.match_any_parent(filename.as_posix()):
+				continue
+
+			yield filename, object_hash
+
+	def read(self, obj: str) -> bytes:
+		"""
+		Returns the content of the given blob.
+
+		:param obj: The hash of the blob, or a ``<rev>:<path>`` expression.
+
+		:raises FileNotFoundError: If the object doesn't exist.
+		"""
+
+		if self._process is None:
+			raise RuntimeError("GitObjectStore.read() must be called within a 'with' block.")
+
+		stdin: IO[bytes] = self._process.stdin  # type: ignore[assignment]
+		stdout: IO[bytes] = self._process.stdout  # type: ignore[assignment]
+
+		stdin.write(obj.encode("UTF-8") + b'\n')
+		stdin.flush()
+
+		header = stdout.readline().rstrip(b'\n').split(b' ')
+
+		if len(header) != 3:
+			raise FileNotFoundError(f"{obj!r} does not exist")
+
+		size = int(header[2])
+		content = stdout.read(size)
+		stdout.read(1)  # trailing newline
+
+		return content
+
+	def read_file(self, rev: str, filename: PathLike) -> bytes:
+		"""
+		Returns the content of ``filename`` at ``rev``.
+
+		:param rev: A commit-ish, such as a branch name, tag or commit hash.
+		:param filename: A path relative to ``work_dir``.
+
+		:raises FileNotFoundError: If the file doesn't exist at ``rev``.
+		"""
+
+		return self.read(f"{rev}:./{PathPlus(filename).as_posix()}")
+
+	def __enter__(self) -> "GitObjectStore":
+		self._process = subprocess.Popen(
+				["git", "cat-file", "--batch"],
+				cwd=self.work_dir,
+				stdin=subprocess.PIPE,
+				stdout=subprocess.PIPE,
+				)
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		if self._process is not None:
+			self._process.stdin.close()  # type: ignore[union-attr]
+			self._process.wait()
+			self._process.stdout.close()  # type: ignore[union-attr]
+			self._process = None
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+#
+#  gitignore.py
+"""
+Match paths against the rules in ``.gitignore`` files.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+import re
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+if TYPE_CHECKING:
+	# 3rd party
+	from domdf_python_tools.paths import PathPlus
+
+__all__ = ["GitIgnore", "find_repository_root", "translate_pattern"]
+
+
+class _Rule(NamedTuple):
+	regex: str
+	negated: bool
+	dir_only: bool
+
+
+def translate_pattern(pattern: str, base: str = '') -> Optional[Tuple[str, bool, bool]]:
+	"""
+	Translate a line from a ``.gitignore`` file into a regular expression.
+
+	:param pattern: The line from the file.
+	:param base: The directory containing the ``.gitignore`` file, relative to the root of the repository.
+
+	:returns: A tuple of the regular expression (matching paths relative to the root of the repository),
+		whether the pattern is negated, and whether it only matches directories;
+		or :py:obj:`None` if the line is blank or a comment.
+	"""
+
+	# Trailing spaces are ignored unless escaped
+	pattern = re.sub(r"(?<!\\) +$", '', pattern.rstrip("\r\n"))
+
+	if not pattern or pattern.startswith('#'):
+		return None
+
+	negated = pattern.startswith('!')
+	if negated:
+		pattern = pattern[1:]
+	elif pattern.startswith("\\!") or pattern.startswith("\\#"):
+		pattern = pattern[1:]
+
+	dir_only = pattern.endswith('/')
+	pattern = pattern.rstrip('/')
+
+	if not pattern:
+		return None
+
+	# A slash anywhere but the end anchors the pattern to the directory of the .gitignore file
+	anchored = '/' in pattern
+	pattern = pattern.lstrip('/')
+
+	regex = _translate_glob(pattern)
+
+	if not anchored:
+		regex = f"(?:.*/)?{regex}"
+
+	if base:
+		regex = f"{re.escape(base)}/{regex}"
+
+	return regex, negated, dir_only
+
+
+def _translate_glob(pattern: str) -> str:
+	parts = []
+	idx = 0
+	length = len(pattern)
+
+	while idx < length:
+		char = pattern[idx]
+
+		if pattern.startswith("**", idx):
+			before = idx == 0 or pattern[idx - 1] == '/'
+			after = idx + 2 == length or pattern[idx + 2] == '/'
+
+			if before and after:
+				if idx + 2 == length:
+					# Trailing "/**" matches everything inside
+					parts.append(".*")
+					idx += 2
+				else:
+					# Leading "**/" or "/**/" matches zero or more directories
+					parts.append("(?:.*/)?")
+					idx += 3
+				continue
+
+			parts.append("[^/]*")
+			idx += 2
+
+		elif char == '*':
+			parts.append("[^/]*")
+			idx += 1
+
+		elif char == '?':
+			parts.append("[^/]")
+			idx += 1
+
+		elif char == '[':
+			end = pattern.find(']', idx + 2)
+			if end == -1:
+				parts.append(re.escape(char))
+				idx += 1
+				continue
+
+			contents = pattern[idx + 1:end].replace('\\', "\\\\")
+			if contents[0] in "!^":
+				contents = '^' + contents[1:]
+
+			parts.append(f"[{contents}]")
+			idx = end + 1
+
+		elif char == '\\' and idx + 1 < length:
+			parts.append(re.escape(pattern[idx + 1]))
+			idx += 2
+
+		else:
+			parts.append(re.escape(char))
+			idx += 1
+
+	return ''.join(parts)
+
+
+class GitIgnore:
+	"""
+	Compiled matcher for the rules in one or more ``.gitignore`` files.
+
+	All rules are combined into a single regular expression, so each path is matched once
+	regardless of the number of rules. As with git, the last matching rule wins.
+
+	Instances are immutable; :meth:`~.GitIgnore.extend` returns a new matcher
+	with the rules from a nested ``.gitignore`` file added.
+
+	:param rules: The rules, as returned by :func:`~.translate_pattern`.
+	"""
+
+	def __init__(self, rules: Iterable[Tuple[str, bool, bool]] = ()):
+		self._rules: List[_Rule] = [_Rule(*rule) for rule in rules]
+		self._file_regex = self._compile(rule for rule in self._rules if not rule.dir_only)
+		self._dir_regex = self._compile(self._rules)
+
+	@staticmethod
+	def _compile(rules: Iterable[_Rule]) -> Optional[Tuple[Pattern, List[bool]]]:
+		# Alternatives are tried in order, so the rules are reversed to find the last match first.
+		rules = list(rules)[::-1]
+		if not rules:
+			return None
+
+		regex = '|'.join(f"({rule.regex})" for rule in rules)
+		return re.compile(regex, re.DOTALL), [rule.negated for rule in rules]
+
+	def __bool__(self) -> bool:
+		return bool(self._rules)
+
+	def extend(self, lines: Iterable[str], base: str = '') -> "GitIgnore":
+		"""
+		Returns a new matcher with the rules from the given lines added.
+
+		:param lines: The lines of a ``.gitignore`` file.
+		:param base: The directory containing the ``.gitignore`` file, relative to the root of the repository.
+		"""
+
+		new_rules = [rule for rule in (translate_pattern(line, base.strip('/')) for line in lines) if rule]
+		if not new_rules:
+			return self
+
+		return GitIgnore([*self._rules, *new_rules])
+
+	def extend_from_file(self, filename: PathLike, base: str = '') -> "GitIgnore":
+		"""
+		Returns a new matcher with the rules from the given file added.
+
+		Missing or unreadable files are ignored.
+
+		:param filename:
+		:param base: The directory containing the ``.gitignore`` file, relative to the root of the repository.
+		"""
+
+		try:
+			with open(filename, encoding="UTF-8", errors="replace") as fp:
+				lines = fp.read().splitlines()
+		except OSError:
+			return self
+
+		return self.extend(lines, base)
+
+	def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+		"""
+		Returns whether the given path is ignored.
+
+		This doesn't check whether any of the directories containing the path are ignored.
+
+		:param path: The path relative to the root of the repository, with ``/`` as the separator.
+		:param is_dir: Whether the path is a directory.
+		"""
+
+		compiled = self._dir_regex if is_dir else self._file_regex
+		if compiled is None:
+			return False
+
+		regex, negated = compiled
+		match = regex.fullmatch(path)
+
+		if match is None:
+			return False
+
+		# The index of the outermost group which matched identifies the rule.
+		return not negated[_matched_group(match) - 1]
+
+	@classmethod
+	def for_directory(cls, directory: PathLike) -> Tuple["GitIgnore", Optional["PathPlus"]]:
+		"""
+		Returns a matcher for the rules which apply in ``directory`` from outside of it,
+		and the root of the repository containing it.
+
+		These are the rules from :file:`.git/info/exclude` and the ``.gitignore`` files
+		in the root of the repository and each directory down to (but not including) ``directory``.
+		``.gitignore`` files in ``directory`` and its subdirectories should be added during traversal.
+
+		If ``directory`` isn't within a git repository an empty matcher and :py:obj:`None` are returned.
+
+		:param directory:
+		"""  # noqa: D400
+
+		# 3rd party
+		from domdf_python_tools.paths import PathPlus
+
+		directory = PathPlus(directory).abspath()
+		root = find_repository_root(directory)
+
+		if root is None:
+			return cls(), None
+
+		ignore = cls().extend_from_file(root / ".git" / "info" / "exclude")
+
+		parts = directory.relative_to(root).parts
+		for depth in range(len(parts)):
+			base = '/'.join(parts[:depth])
+			ignore = ignore.extend_from_file(root.joinpath(*parts[:depth], ".gitignore"), base)
+
+		return ignore, root
+
+
+def _matched_group(match: "re.Match") -> int:
+	# Each rule is a single group, and the rules' regular expressions have no groups of their own.
+	for idx, group in enumerate(match.groups(), start=1):
+		if group is not None:
+			return idx
+
+	raise ValueError("No group matched")  # pragma: no cover
+
+
+def find_repository_root(directory: PathLike) -> Optional["PathPlus"]:
+	"""
+	Returns the root of the git repository containing ``directory``, or :py:obj:`None` if it isn't in one.
+
+	:param directory:
+	"""
+
+	# 3rd party
+	from domdf_python_tools.paths import PathPlus
+
+	directory = PathPlus(directory).abspath()
+
+	for candidate in (directory, *directory.parents):
+		if os.path.exists(os.path.join(candidate, ".git")):
+			return candidate
+
+	return None
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+#
+#  manifest.py
+"""
+Check many packages in one run, as listed in a manifest file.
+
+Each non-blank line of the manifest has the form::
+
+	<pkg_name> [<work_dir> [<req_file>]]
+
+``work_dir`` defaults to the directory containing the manifest, and relative paths are interpreted relative to it.
+``req_file`` defaults to :file:`requirements.txt`, and relative paths are interpreted relative to ``work_dir``.
+Lines starting with ``#`` are ignored.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+from operator import attrgetter
+from typing import Dict, List, NamedTuple, Optional
+
+# 3rd party
+from consolekit.terminal_colours import Style
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from dep_checker import (
+		DepChecker,
+		_echo,
+		_echo_results,
+		_get_reader,
+		_read_config,
+		_resolve_colour,
+		_write_results
+		)
+from dep_checker.config import AllowedUnused, Exclude, NameMapping, NamespacePackages
+from dep_checker.distributions import DistributionIndex
+from dep_checker.requirements import read_full_requirements, read_requirement_names
+
+__all__ = ["ManifestEntry", "read_manifest", "check_manifest"]
+
+
+class ManifestEntry(NamedTuple):
+	"""
+	A package listed in a manifest.
+	"""
+
+	#: The name of the package.
+	pkg_name: str
+
+	#: The absolute path of the directory to find the source of the package in.
+	work_dir: PathPlus
+
+	#: The absolute path of the package's requirements file.
+	req_file: PathPlus
+
+
+def read_manifest(filename: PathLike) -> List[ManifestEntry]:
+	"""
+	Parse the given manifest file.
+
+	:param filename:
+
+	:raises ValueError: If a line of the manifest is invalid.
+	"""
+
+	filename = PathPlus(filename).abspath()
+	entries = []
+
+	for lineno, line in enumerate(filename.read_lines(), start=1):
+		line = line.strip()
+		if not line or line.startswith('#'):
+			continue
+
+		fields = line.split()
+		if len(fields) > 3:
+			raise ValueError(f"{filename.as_posix()}:{lineno}: expected at most 3 fields, got {len(fields)}")
+
+		pkg_name = fields[0]
+		work_dir = filename.parent / (fields[1] if len(fields) > 1 else '.')
+		req_file = work_dir / (fields[2] if len(fields) > 2 else "requirements.txt")
+
+		entries.append(ManifestEntry(pkg_name, work_dir.abspath(), req_file.abspath()))
+
+	return entries
+
+
+def check_manifest(
+		manifest: PathLike,
+		allowed_unused: Optional[List[str]] = None,
+		colour: Optional[bool] = None,
+		name_mapping: Optional[Dict[str, str]] = None,
+		namespace_packages: Optional[List[str]] = None,
+		cache_dir: Optional[PathLike] = None,
+		jobs: Optional[int] = 1,
+		fail_fast: bool = False,
+		errors_only: bool = False,
+		exclude: Optional[List[str]] = None,
+		respect_gitignore: bool = False,
+		python_version: Optional[str] = None,
+		full_requirements_parse: bool = False,
+		infer_mappings: bool = False,
+		output_format: str = "text",
+		) -> int:
+	"""
+	Check imports for each package in the given manifest, against their requirements files.
+
+	The configuration for each package is read from its directory, as when checking it on its own,
+	or else from the directory containing the manifest or the current directory.
+	Options which are given override the configuration for every package.
+	Requirements files shared by several packages are only read once.
+
+	:param manifest: The manifest file.
+	:param allowed_unused: List of requirements which are allowed to be unused in the source code.
+	:default allowed_unused: ``[]``
+	:param colour: Whether to use coloured output.
+	:no-default colour:
+	:param name_mapping: Optional mapping of requirement names to import names, if they differ.
+	:no-default name_mapping:
+	:param namespace_packages: List of namespace packages, e.g. ``ruamel.yaml``.
+	:no-default namespace_packages:
+	:param cache_dir: Directory to cache the imports found in each file in between runs.
+		If :py:obj:`None` every file is parsed on each run.
+	:param jobs: The number of processes to parse files in.
+		If :py:obj:`None` the number of CPUs is used.
+	:param fail_fast: Stop at the first unlisted or unused requirement.
+	:param errors_only: Only show unlisted and unused requirements.
+	:param exclude: Glob patterns for files and directories which shouldn't be checked.
+	:no-default exclude:
+	:param respect_gitignore: Whether to skip files and directories ignored by git.
+	:param python_version: The version of Python the packages target, such as ``'3.8'``,
+		which determines which modules are part of the standard library.
+	:param full_requirements_parse: Parse each requirement in full with :mod:`shippinglabel.requirements`,
+		rather than only reading the names.
+	:param infer_mappings: Whether to infer the names each requirement can be imported as,
+		and which are namespace packages, from the distributions installed in the current environment.
+	:param output_format: The format to write the results to stdout in; see :func:`~.check_imports`.
+		With ``'jsonl'`` each object also has the name of the package under the ``package`` key.
+		Filenames in a ``'sarif'`` log are relative to the directory containing the manifest.
+
+	:rtype:
+
+	* Returns ``0`` if, for every package, all requirements are used and listed as requirements.
+	* Returns ``1`` otherwise.
+	"""
+
+	if output_format != "text":
+		# this package
+		from dep_checker.output import FORMATS
+
+		if output_format not in FORMATS:
+			raise ValueError(f"Unknown output format {output_format!r}")
+
+		# Passing requirements aren't findings, so aren't included.
+		errors_only = errors_only or output_format == "sarif"
+
+	manifest = PathPlus(manifest).abspath()
+	default_config = _read_config(manifest.parent)
+	use_colour = _resolve_colour(colour)
+
+	entries = read_manifest(manifest)
+	requirements: Dict[PathPlus, List[str]] = {}
+
+	for entry in entries:
+		if entry.req_file not in requirements:
+			if full_requirements_parse:
+				requirements[entry.req_file] = list(map(attrgetter("name"), read_full_requirements(entry.req_file)))
+			else:
+				requirements[entry.req_file] = read_requirement_names(entry.req_file)
+
+	reader = _get_reader()
+	checkers = []
+
+	# Loaded once and shared by every package, as the index is of the current environment.
+	distribution_index: Optional[DistributionIndex] = None
+	if infer_mappings:
+		distribution_index = DistributionIndex.load(None if cache_dir is None else PathPlus(cache_dir).abspath())
+
+	for entry in entries:
+		config = reader.find(entry.work_dir)
+		if config is None:
+			config = default_config
+
+		checker = DepChecker(
+				entry.pkg_name,
+				requirements=requirements[entry.req_file],
+				allowed_unused=AllowedUnused.get(config) if allowed_unused is None else allowed_unused,
+				name_mapping=NameMapping.get(config) if name_mapping is None else name_mapping,
+				namespace_packages=NamespacePackages.get(config) if namespace_packages is None else namespace_packages,
+				exclude=Exclude.get(config) if exclude is None else exclude,
+				respect_gitignore=respect_gitignore,
+				python_version=python_version,
+				cache_dir=cache_dir,
+				infer_mappings=infer_mappings,
+				distribution_index=distribution_index,
+				)
+		checkers.append((checker, entry.work_dir))
+
+	ret = 0
+	all_results = DepChecker.check_many(checkers, jobs=jobs, cache_dir=cache_dir, errors_only=errors_only)
+
+	if output_format != "text":
+		runs = [
+				({"package": entry.pkg_name}, results, entry.work_dir, entry.req_file)
+				for entry, results in zip(entries, all_results)
+				]
+		return _write_results(runs, output_format, fail_fast, base_dir=manifest.parent)
+
+	for idx, (entry, results) in enumerate(zip(entries, all_results)):
+		if idx:
+			_echo('', use_colour)
+
+		work_dir = PathPlus(os.path.relpath(entry.work_dir, manifest.parent)).as_posix()
+		_echo(Style.BRIGHT(f"{entry.pkg_name} ({work_dir})"), use_colour)
+		ret |= _echo_results(results, use_colour, fail_fast)
+
+		if ret and fail_fast:
+			break
+
+	return ret
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+#
+#  output.py
+"""
+Machine-readable output formats for the results of a check.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+from typing import IO, Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+# this package
+from dep_checker import PassingRequirement, UnlistedRequirement, UnusedRequirement, __version__
+
+__all__ = ["FORMATS", "SARIF_SCHEMA", "SarifLog", "write_jsonl"]
+
+#: The formats the results can be output in.
+FORMATS = ("text", "jsonl", "sarif")
+
+#: The JSON schema of the SARIF logs produced by :class:`~.SarifLog`.
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+_Result = Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]
+
+_RULES: Sequence[Mapping[str, Any]] = [
+		{
+				"id": "unlisted-requirement",
+				"name": "UnlistedRequirement",
+				"shortDescription": {"text": "Imported but not listed as a requirement."},
+				"defaultConfiguration": {"level": "error"},
+				},
+		{
+				"id": "unused-requirement",
+				"name": "UnusedRequirement",
+				"shortDescription": {"text": "Listed as a requirement but never imported."},
+				"defaultConfiguration": {"level": "warning"},
+				},
+		]
+
+
+def write_jsonl(
+		results: Iterable[_Result],
+		fp: IO[bytes],
+		fail_fast: bool = False,
+		properties: Optional[Mapping[str, Any]] = None,
+		) -> int:
+	"""
+	Write each result to ``fp`` as a line of JSON, as soon as it is produced.
+
+	Each object is the result's ``_asdict()``, which includes its class name under the ``class`` key.
+	Results are not retained, so the memory used doesn't grow with the number of results.
+
+	:param results:
+	:param fp: A binary file, which should be buffered.
+	:param fail_fast: Stop at the first unlisted or unused requirement.
+	:param properties: Additional keys to add to each object.
+
+	:returns: ``1`` if there was an unlisted or unused requirement, ``0`` otherwise.
+	"""
+
+	ret = 0
+
+	for item in results:
+		data = item._asdict()
+
+		if properties:
+			data.update(properties)
+
+		fp.write(json.dumps(data).encode("UTF-8"))
+		fp.write(b'\n')
+
+		if not isinstance(item, PassingRequirement):
+			ret = 1
+
+			if fail_fast:
+				break
+
+	return ret
+
+
+class SarifLog:
+	"""
+	Collects the results of one or more checks into a `SARIF <https://sarifweb.azurewebsites.net/>`_ log,
+	for code scanning dashboards.
+
+	Only unlisted and unused requirements are included, as passing requirements aren't findings.
+
+	:param base_dir: The directory filenames in the log are given relative to, usually the root of the repository.
+	"""  # noqa: D400
+
+	def __init__(self, base_dir: PathLike = '.'):
+		# 3rd party
+		from domdf_python_tools.paths import PathPlus
+
+		self.base_dir = PathPlus(base_dir).abspath()
+
+		#: The SARIF ``result`` objects.
+		self.results: List[Dict[str, Any]] = []
+
+	def _location(self, filename: PathLike, lineno: Optional[int] = None) -> Dict[str, Any]:
+		# 3rd party
+		from domdf_python_tools.paths import PathPlus
+
+		filename = PathPlus(filename).abspath()
+		relative = os.path.relpath(filename, self.base_dir)
+
+		artifact_location: Dict[str, str]
+		if relative.startswith(os.pardir):
+			artifact_location = {"uri": filename.as_uri()}
+		else:
+			artifact_location = {"uri": PathPlus(relative).as_posix(), "uriBaseId": "SRCROOT"}
+
+		physical_location: Dict[str, Any] = {"artifactLocation": artifact_location}
+
+		if lineno is not None:
+			physical_location["region"] = {"startLine": lineno}
+
+		return {"physicalLocation": physical_location}
+
+	def add_results(
+			self,
+			results: Iterable[_Result],
+			work_dir: PathLike,
+			requirements_file: PathLike,
+			fail_fast: bool = False,
+			properties: Optional[Mapping[str, Any]] = None,
+			) -> int:
+		"""
+		Add the results of a check to the log.
+
+		:param results:
+		:param work_dir: The directory the filenames in the results are relative to.
+		:param requirements_file: The file the requirements were read from, which unused requirements are reported in.
+		:param fail_fast: Stop at the first unlisted or unused requirement.
+		:param properties: Additional properties to add to each SARIF result, such as the targeted Python version.
+
+		:returns: ``1`` if there was an unlisted or unused requirement, ``0`` otherwise.
+		"""
+
+		# 3rd party
+		from domdf_python_tools.paths import PathPlus
+
+		ret = 0
+		work_dir = PathPlus(work_dir).abspath()
+
+		for item in results:
+			if isinstance(item, UnlistedRequirement):
+				rule_index = 0
+				location = self._location(work_dir / item.filename, item.lineno)
+			elif isinstance(item, UnusedRequirement):
+				rule_index = 1
+				location = self._location(requirements_file)
+			else:
+				continue
+
+			result: Dict[str, Any] = {
+					"ruleId": _RULES[rule_index]["id"],
+					"ruleIndex": rule_index,
+					"level": _RULES[rule_index]["defaultConfiguration"]["level"],
+					# Without the leading cross.
+					"message": {"text": item.format_error()[2:]},
+					"locations": [location],
+					}
+
+			if properties:
+				result["properties"] = dict(properties)
+
+			self.results.append(result)
+			ret = 1
+
+			if fail_fast:
+				break
+
+		return ret
+
+	def as_dict(self) -> Dict[str, Any]:
+		"""
+		Returns the SARIF log, as a dictionary.
+		"""
+
+		return {
+				"$schema": SARIF_SCHEMA,
+				"version": "2.1.0",
+				"runs": [{
+						"tool": {
+								"driver": {
+										"name": "dep_checker",
+										"version": __version__,
+										"informationUri": "https://github.com/python-coincidence/dep_checker",
+										"rules": _RULES,
+										},
+								},
+						"originalUriBaseIds": {"SRCROOT": {"uri": self.base_dir.as_uri() + '/'}},
+						"results": self.results,
+						}],
+				}
+
+	def write(self, fp: IO[bytes]) -> None:
+		"""
+		Write the SARIF log to ``fp``, as JSON.
+
+		:param fp: A binary file.
+		"""
+
+		fp.write(json.dumps(self.as_dict(), indent=2).encode("UTF-8"))
+		fp.write(b'\n')
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+#
+#  pipeline.py
+"""
+Overlap the discovery and reading of files with the parsing of files which have already been read.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import queue
+import threading
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple, TypeVar
+
+__all__ = ["iter_pipelined", "DEFAULT_WORKERS", "DEFAULT_MAX_IN_FLIGHT"]
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+#: The default number of threads which read files.
+DEFAULT_WORKERS = 4
+
+#: The default maximum number of items which have been discovered but not yet consumed.
+DEFAULT_MAX_IN_FLIGHT = 64
+
+# Sent by the discovery thread once all items have been queued.
+_END = object()
+
+
+def iter_pipelined(
+		items: Iterable[_T],
+		stage: Callable[[_T], _R],
+		*,
+		workers: int = DEFAULT_WORKERS,
+		max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+		) -> Generator[Tuple[_T, _R], None, None]:
+	"""
+	Apply ``stage`` to each element of ``items`` in a pool of threads,
+	yielding ``(item, stage(item))`` tuples in the same order as ``items``.
+
+	``items`` is iterated in its own thread, so discovery, ``stage`` and the consumer all overlap.
+	At most ``max_in_flight`` items are held between discovery and the consumer at any time,
+	so memory use doesn't grow with the number of items.
+
+	Exceptions raised by ``items`` or ``stage`` are re-raised in the consumer at the position they occurred.
+	If the consumer stops early the threads stop taking new items, and are joined when the iterator is closed.
+
+	:param items:
+	:param stage: Function to call on each item, typically one which performs I/O.
+	:param workers: The number of threads to call ``stage`` in.
+	:param max_in_flight: The maximum number of items which have been discovered but not yet yielded.
+	"""  # noqa: D400
+
+	slots = threading.Semaphore(max_in_flight)
+	stop = threading.Event()
+	todo: "queue.Queue[Optional[Tuple[int, _T]]]" = queue.Queue()  # Bounded by ``slots``
+	done: "queue.Queue[Tuple[Any, ...]]" = queue.Queue()
+
+	def discover() -> None:
+		idx = 0
+
+		try:
+			for item in items:
+				slots.acquire()
+				if stop.is_set():
+					return
+
+				todo.put((idx, item))
+				idx += 1
+
+		except BaseException as e:  # pylint: disable=broad-except
+			done.put((idx, None, False, e))
+			idx += 1
+
+		finally:
+			done.put((_END, idx))
+
+			for _ in range(workers):
+				todo.put(None)
+
+	def work() -> None:
+		while True:
+			entry = todo.get()
+			if entry is None:
+				return
+
+			idx, item = entry
+			if stop.is_set():
+				continue
+
+			try:
+				done.put((idx, item, True, stage(item)))
+			except BaseException as e:  # pylint: disable=broad-except
+				done.put((idx, item, False, e))
+
+	threads: List[threading.Thread] = [threading.Thread(target=discover, daemon=True)]
+	threads.extend(threading.Thread(target=work, daemon=True) for _ in range(workers))
+
+	for thread in threads:
+		thread.start()
+
+	# Items which finished out of order, waiting for the ones before them.
+	finished: Dict[int, Tuple[_T, bool, Any]] = {}
+	next_idx = 0
+	total: Optional[int] = None
+
+	try:
+		while total is None or next_idx < total:
+			if next_idx not in finished:
+				idx, *rest = done.get()
+
+				if idx is _END:
+					total = rest[0]
+				else:
+					finished[idx] = tuple(rest)
+
+				continue
+
+			item, ok, value = finished.pop(next_idx)
+			next_idx += 1
+
+			if not ok:
+				raise value
+
+			slots.release()
+			yield item, value
+
+	finally:
+		stop.set()
+
+		# Unblock the discovery thread if it is waiting for a slot.
+		for _ in range(max_in_flight):
+			slots.release()
+
+		for thread in threads:
+			thread.join()
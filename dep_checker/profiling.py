@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+#
+#  profiling.py
+"""
+Measure the time spent in each phase of a check.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import contextlib
+import csv
+import json
+import pathlib
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, TypeVar
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+__all__ = ["Profiler", "FileMetrics", "PHASES", "SCAN_PHASES", "COUNTERS"]
+
+_T = TypeVar("_T")
+
+#: The phases of a check which are timed on the main thread, in the order they occur.
+PHASES = ("config", "requirements", "scan", "matching", "output")
+
+#: The parts of the ``scan`` phase. These happen concurrently in several threads (and, with multiple jobs,
+#: processes), so the time in each is summed across them and may exceed the time of the ``scan`` phase.
+SCAN_PHASES = ("discovery", "cache", "read", "parse", "visit")
+
+#: The things which are counted during a check: the files checked, those whose imports were obtained from the cache,
+#: the bytes read from the others, and the imports found.
+COUNTERS = ("files", "cached_files", "bytes_read", "imports")
+
+
+class FileMetrics(NamedTuple):
+	"""
+	The measurements for a single file.
+
+	.. versionadded:: 0.10.0
+	"""
+
+	#: The name of the file, relative to the working directory.
+	filename: str
+
+	#: The total time spent on the file, in seconds.
+	time: float
+
+	#: The time spent reading the file, in seconds.
+	read_time: float
+
+	#: The time spent parsing the file, in seconds.
+	parse_time: float
+
+	#: The time spent finding the imports in the parsed file, in seconds.
+	visit_time: float
+
+	#: The time spent looking the file up in, or adding it to, the cache, in seconds.
+	cache_time: float
+
+	#: The number of bytes read from the file. ``0`` if its imports were obtained from the cache.
+	size: int
+
+	#: The number of imports found in the file.
+	imports: int
+
+	#: Whether the file's imports were obtained from the cache, rather than by reading it.
+	cached: bool
+
+
+class Profiler:
+	"""
+	Accumulates the time spent in each phase of a check, and counts of the files checked.
+
+	Times are measured with :func:`time.perf_counter`. The profiler is thread-safe.
+
+	:param record_files: Whether to also record the measurements for each file.
+		See :meth:`~.Profiler.file_metrics`.
+	"""
+
+	def __init__(self, record_files: bool = False):
+		self._start = time.perf_counter()
+		self._lock = threading.Lock()
+
+		# Mapping of filenames to the phases and counters recorded for them, if recording them.
+		self._files: Optional[Dict[str, Dict[str, float]]] = {} if record_files else None
+
+		#: Mapping of phase names to the total time spent in them, in seconds.
+		self.phases: Dict[str, float] = {}
+
+		#: Mapping of counter names (see :data:`~.COUNTERS`) to their values.
+		self.counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+	def add(self, phase: str, seconds: float, filename: Optional[PathLike] = None) -> None:
+		"""
+		Add time to the given phase.
+
+		:param phase:
+		:param seconds:
+		:param filename: The file the time was spent on, if recording the measurements for each file.
+		"""
+
+		with self._lock:
+			self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+			if filename is not None and self._files is not None:
+				self._add_to_file(filename, phase, seconds)
+
+	@contextlib.contextmanager
+	def phase(self, phase: str, filename: Optional[PathLike] = None) -> Iterator[None]:
+		"""
+		Context manager which adds the time spent within it to the given phase.
+
+		:param phase:
+		:param filename: The file the time is spent on, if recording the measurements for each file.
+		"""
+
+		start = time.perf_counter()
+
+		try:
+			yield
+		finally:
+			self.add(phase, time.perf_counter() - start, filename)
+
+	def iter_timed(self, phase: str, iterable: Iterable[_T]) -> Iterator[_T]:
+		"""
+		Iterate over ``iterable``, adding the time spent producing each element to the given phase.
+
+		:param phase:
+		:param iterable:
+		"""
+
+		iterator = iter(iterable)
+
+		while True:
+			start = time.perf_counter()
+
+			try:
+				item = next(iterator)
+			except StopIteration:
+				self.add(phase, time.perf_counter() - start)
+				return
+
+			self.add(phase, time.perf_counter() - start)
+			yield item
+
+	def count(self, counter: str, value: int = 1, filename: Optional[PathLike] = None) -> None:
+		"""
+		Add to the given counter.
+
+		:param counter:
+		:param value:
+		:param filename: The file counted, if recording the measurements for each file.
+		"""
+
+		with self._lock:
+			self.counts[counter] = self.counts.get(counter, 0) + value
+
+			if filename is not None and self._files is not None:
+				self._add_to_file(filename, counter, value)
+
+	def _add_to_file(self, filename: PathLike, key: str, value: float) -> None:
+		# Must be called with the lock held.
+		metrics = self._files.setdefault(pathlib.PurePath(filename).as_posix(), {})  # type: ignore[union-attr]
+		metrics[key] = metrics.get(key, 0) + value
+
+	def file_metrics(self) -> List[FileMetrics]:
+		"""
+		Returns the measurements for each file, slowest first.
+
+		:raises ValueError: If the profiler isn't recording the measurements for each file.
+		"""
+
+		if self._files is None:
+			raise ValueError("The profiler isn't recording the measurements for each file.")
+
+		with self._lock:
+			files = [(filename, dict(metrics)) for filename, metrics in self._files.items()]
+
+		all_metrics = []
+
+		for filename, metrics in files:
+			read_time = metrics.get("read", 0.0)
+			parse_time = metrics.get("parse", 0.0)
+			visit_time = metrics.get("visit", 0.0)
+			cache_time = metrics.get("cache", 0.0)
+
+			all_metrics.append(
+					FileMetrics(
+							filename=filename,
+							time=read_time + parse_time + visit_time + cache_time,
+							read_time=read_time,
+							parse_time=parse_time,
+							visit_time=visit_time,
+							cache_time=cache_time,
+							size=int(metrics.get("bytes_read", 0)),
+							imports=int(metrics.get("imports", 0)),
+							cached=bool(metrics.get("cached_files")),
+							)
+					)
+
+		all_metrics.sort(key=lambda file: (-file.time, file.filename))
+		return all_metrics
+
+	def format_slowest(self, count: int = 10) -> str:
+		"""
+		Returns a table of the ``count`` files which took the longest to check.
+
+		:param count:
+
+		:raises ValueError: If the profiler isn't recording the measurements for each file.
+		"""
+
+		lines = [f"{'Time':>10}{'Read':>10}{'Parse':>10}{'Visit':>10}{'Size':>11}{'Imports':>9}  File"]
+
+		for file in self.file_metrics()[:count]:
+			lines.append(
+					f"{_format_time(file.time):>10}{_format_time(file.read_time):>10}"
+					f"{_format_time(file.parse_time):>10}{_format_time(file.visit_time):>10}"
+					f"{_format_size(file.size):>11}{file.imports:>9}  {file.filename}"
+					+ (" (cached)" if file.cached else '')
+					)
+
+		return '\n'.join(lines)
+
+	def write_file_metrics(self, filename: PathLike) -> None:
+		"""
+		Write the measurements for each file to the given file, slowest first.
+
+		The file is written as CSV if its name ends in ``.csv``, and as JSON otherwise.
+
+		:param filename:
+
+		:raises ValueError: If the profiler isn't recording the measurements for each file.
+		"""
+
+		all_metrics = self.file_metrics()
+
+		if pathlib.PurePath(filename).suffix.lower() == ".csv":
+			with open(filename, 'w', encoding="UTF-8", newline='') as fp:
+				writer = csv.writer(fp)
+				writer.writerow(FileMetrics._fields)
+				writer.writerows(all_metrics)
+		else:
+			with open(filename, 'w', encoding="UTF-8") as fp:
+				json.dump([file._asdict() for file in all_metrics], fp, indent=2)
+				fp.write('\n')
+
+	@property
+	def total(self) -> float:
+		"""
+		The time since the profiler was created, in seconds.
+		"""
+
+		return time.perf_counter() - self._start
+
+	@property
+	def files_per_second(self) -> float:
+		"""
+		The number of files checked per second of the ``scan`` phase.
+		"""
+
+		scan_time = self.phases.get("scan", 0.0)
+		return self.counts["files"] / scan_time if scan_time else 0.0
+
+	def as_dict(self) -> Dict[str, Any]:
+		"""
+		Returns the measurements as a dictionary, suitable for serialising as JSON.
+		"""
+
+		return {
+				"total": self.total,
+				"phases": {phase: self.phases[phase] for phase in (*PHASES, *SCAN_PHASES) if phase in self.phases},
+				**self.counts,
+				"files_per_second": self.files_per_second,
+				}
+
+	def format_table(self) -> str:
+		"""
+		Returns a summary of the measurements, as a table.
+		"""
+
+		total = self.total
+		lines: List[str] = [f"{'Phase':<16}{'Time':>12}{'Share':>9}"]
+
+		def add_line(name: str, seconds: float) -> None:
+			share = f"{seconds / total:.1%}" if total else ''
+			lines.append(f"{name:<16}{_format_time(seconds):>12}{share:>9}")
+
+		for phase in PHASES:
+			if phase not in self.phases:
+				continue
+
+			add_line(phase, self.phases[phase])
+
+			if phase == "scan":
+				for scan_phase in SCAN_PHASES:
+					if scan_phase in self.phases:
+						add_line(f"  {scan_phase}", self.phases[scan_phase])
+
+		add_line("total", total)
+
+		lines.append('')
+		lines.append(
+				f"{self.counts['files']} files ({self.counts['cached_files']} from the cache), "
+				f"{_format_size(self.counts['bytes_read'])} read, {self.counts['imports']} imports, "
+				f"{self.files_per_second:.0f} files/s"
+				)
+
+		if any(phase in self.phases for phase in SCAN_PHASES):
+			lines.append("Times for the parts of the scan are summed across threads and processes.")
+
+		return '\n'.join(lines)
+
+
+def _format_time(seconds: float) -> str:
+	if seconds >= 1:
+		return f"{seconds:.3f} s"
+
+	return f"{seconds * 1000:.1f} ms"
+
+
+def _format_size(size: int) -> str:
+	for unit in ("B", "KiB", "MiB"):
+		if size < 1024:
+			return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+		size /= 1024  # type: ignore[assignment]
+
+	return f"{size:.1f} GiB"
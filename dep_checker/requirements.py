@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+#
+#  requirements.py
+"""
+Read the names of the requirements in requirements files.
+
+Only the names are needed to check imports,
+so this avoids the cost of fully parsing each requirement's specifiers and markers.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+import re
+import threading
+import warnings
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+if TYPE_CHECKING:
+	# 3rd party
+	from shippinglabel.requirements import ComparableRequirement
+
+__all__ = [
+		"normalize_name",
+		"parse_requirement_names",
+		"read_requirement_names",
+		"read_full_requirements",
+		"parse_req_source",
+		"pyproject_requirement_names",
+		"clear_cache",
+		]
+
+# The name at the start of a PEP 508 requirement, and the character which follows it.
+_NAME_RE = re.compile(r"\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*($|[\[(<>=!~;@\s])")
+
+_NORMALIZE_RE = re.compile(r"[-_.]+")
+
+# Options which include another file, and whether the file is of constraints rather than requirements.
+_INCLUDE_OPTIONS = {
+		"-r": False,
+		"--requirement": False,
+		"-c": True,
+		"--constraint": True,
+		}
+
+_INCLUDE_RE = re.compile(r"(-r|--requirement|-c|--constraint)(?:\s*=\s*|\s+|(?<=-[rc]))(\S.*)")
+
+_INLINE_COMMENT_RE = re.compile(r"(^|\s+)#.*$")
+
+
+def normalize_name(name: str) -> str:
+	"""
+	Normalize the name of a requirement as described in :pep:`503`.
+
+	``ruamel-yaml`` is special-cased to ``ruamel.yaml``, as with :mod:`shippinglabel.requirements`.
+
+	:param name:
+	"""
+
+	name = _NORMALIZE_RE.sub('-', name).lower()
+
+	if name == "ruamel-yaml":
+		return "ruamel.yaml"
+
+	return name
+
+
+class _ParsedFile(NamedTuple):
+	names: Tuple[str, ...]
+	includes: Tuple[Tuple[str, bool], ...]  # (filename, is_constraint)
+
+
+def _iter_logical_lines(lines: Iterable[str]) -> Iterable[str]:
+	# Strips comments and joins lines ending with a backslash, as pip does.
+	buffer = ''
+
+	for line in lines:
+		line = _INLINE_COMMENT_RE.sub('', line)
+
+		if line.endswith('\\'):
+			buffer += line[:-1]
+			continue
+
+		line = (buffer + line).strip()
+		buffer = ''
+
+		if line:
+			yield line
+
+	if buffer.strip():
+		yield buffer.strip()
+
+
+def _parse(lines: Iterable[str]) -> _ParsedFile:
+	names: List[str] = []
+	includes: List[Tuple[str, bool]] = []
+
+	for line in _iter_logical_lines(lines):
+		if line.startswith('-'):
+			include = _INCLUDE_RE.fullmatch(line)
+			if include is not None:
+				includes.append((include.group(2).strip(), _INCLUDE_OPTIONS[include.group(1)]))
+
+			# Other options, such as --index-url and editable installs, don't name requirements.
+			continue
+
+		match = _NAME_RE.match(line)
+		if match is None:
+			warnings.warn(f"Ignored invalid requirement {line!r}")
+			continue
+
+		names.append(normalize_name(match.group(1)))
+
+	return _ParsedFile(tuple(names), tuple(includes))
+
+
+def parse_requirement_names(lines: Iterable[str]) -> List[str]:
+	"""
+	Parse the names of the requirements from the lines of a requirements file.
+
+	Names are normalized with :func:`~.normalize_name`, and are returned in the order they first appear.
+	``-r`` and ``-c`` options are ignored, as there is no file to resolve them relative to.
+
+	:param lines:
+	"""
+
+	return list(dict.fromkeys(_parse(lines).names))
+
+
+# Mapping of absolute filenames to the (mtime, size) of the file when it was parsed, and the result.
+_cache: Dict[str, Tuple[Tuple[int, int], _ParsedFile]] = {}
+_cache_lock = threading.Lock()
+
+
+def clear_cache() -> None:
+	"""
+	Discard the cached contents of all requirements files.
+	"""
+
+	with _cache_lock:
+		_cache.clear()
+
+
+def _read_file(filename: str) -> _ParsedFile:
+	stat = os.stat(filename)
+	stat_key = (stat.st_mtime_ns, stat.st_size)
+
+	with _cache_lock:
+		cached = _cache.get(filename)
+
+	if cached is not None and cached[0] == stat_key:
+		return cached[1]
+
+	parsed = _parse(PathPlus(filename).read_text(encoding="UTF-8").splitlines())
+
+	with _cache_lock:
+		_cache[filename] = (stat_key, parsed)
+
+	return parsed
+
+
+def read_requirement_names(req_file: PathLike, *, include_constraints: bool = False) -> List[str]:
+	"""
+	Read the names of the requirements in the given requirements file,
+	and in any files it includes with ``-r`` (and ``-c``, if ``include_constraints`` is :py:obj:`True`).
+
+	Names are normalized with :func:`~.normalize_name`, and are returned in the order they first appear.
+
+	The contents of each file are cached, keyed on its modification time and size,
+	so reading an unchanged file again is cheap.
+
+	:param req_file:
+	:param include_constraints: Whether to also include the names from constraints files.
+		Constraints only restrict the versions of packages which are installed for other reasons,
+		so by default they aren't treated as requirements.
+
+	:raises FileNotFoundError: If the file, or a file it includes, doesn't exist.
+	"""  # noqa: D400
+
+	names: Dict[str, None] = {}
+	seen: Set[str] = set()
+
+	def visit(filename: str) -> None:
+		if filename in seen:
+			# Included more than once, or circularly
+			return
+
+		seen.add(filename)
+		parsed = _read_file(filename)
+		names.update(dict.fromkeys(parsed.names))
+
+		for include, is_constraint in parsed.includes:
+			if is_constraint and not include_constraints:
+				continue
+
+			visit(os.path.normpath(os.path.join(os.path.dirname(filename), include)))
+
+	visit(os.path.abspath(req_file))
+
+	return list(names)
+
+
+def read_full_requirements(
+		req_file: PathLike,
+		*,
+		include_constraints: bool = False,
+		) -> Set["ComparableRequirement"]:
+	"""
+	Fully parse the requirements in the given requirements file, and in any files it includes,
+	with :func:`shippinglabel.requirements.parse_requirements`.
+
+	This is slower than :func:`~.read_requirement_names`, but provides the specifiers and markers of each requirement.
+	The result isn't cached.
+
+	:param req_file:
+	:param include_constraints: Whether to also include the requirements from constraints files.
+	"""  # noqa: D400
+
+	# 3rd party
+	from shippinglabel.requirements import parse_requirements
+
+	requirements: Set["ComparableRequirement"] = set()
+	seen: Set[str] = set()
+
+	def visit(filename: str) -> None:
+		if filename in seen:
+			return
+
+		seen.add(filename)
+		lines = PathPlus(filename).read_lines()
+		requirements.update(parse_requirements(line for line in lines if not line.lstrip().startswith('-'))[0])
+
+		for include, is_constraint in _parse(lines).includes:
+			if is_constraint and not include_constraints:
+				continue
+
+			visit(os.path.normpath(os.path.join(os.path.dirname(filename), include)))
+
+	visit(os.path.abspath(req_file))
+
+	return requirements
+
+
+def parse_req_source(req_source: str) -> List[str]:
+	"""
+	Parse a requirements source in the form ``pyproject[:extra,...]``, and return the names of the extras.
+
+	``pyproject`` selects the dependencies listed in the ``[project]`` table of ``pyproject.toml``,
+	and each extra adds the dependencies from its entry in ``[project.optional-dependencies]``.
+
+	:param req_source:
+
+	:raises ValueError: If the source isn't in that form.
+	"""
+
+	source, _, extras = req_source.partition(':')
+
+	if source.strip() != "pyproject":
+		raise ValueError(f"Unsupported requirements source {req_source!r}. Expected 'pyproject[:extra,...]'.")
+
+	return [extra.strip() for extra in extras.split(',') if extra.strip()]
+
+
+def pyproject_requirement_names(
+		document: Mapping[str, Any],
+		extras: Sequence[str] = (),
+		) -> List[str]:
+	"""
+	Returns the names of the requirements listed in the ``[project]`` table of a parsed ``pyproject.toml`` file.
+
+	Names are normalized with :func:`~.normalize_name`, and are returned in the order they first appear.
+
+	:param document: The parsed ``pyproject.toml`` file.
+	:param extras: The names of extras whose dependencies should also be included.
+
+	:raises ValueError: If the file has no ``[project]`` table, if its dependencies are dynamic,
+		or if one of the extras isn't defined.
+	"""
+
+	project: Optional[Mapping[str, Any]] = document.get("project")
+
+	if project is None:
+		raise ValueError("pyproject.toml has no [project] table.")
+
+	dynamic = project.get("dynamic", ())
+	if "dependencies" in dynamic:
+		raise ValueError("The dependencies in pyproject.toml are dynamic, so can't be read.")
+
+	lines: List[str] = list(project.get("dependencies", ()))
+	# Extras are compared by their normalized names, as described in :pep:`685`.
+	optional_dependencies: Dict[str, List[str]] = {
+			_NORMALIZE_RE.sub('-', name).lower(): dependencies
+			for name, dependencies in project.get("optional-dependencies", {}).items()
+			}
+
+	for extra in extras:
+		normalized_extra = _NORMALIZE_RE.sub('-', extra).lower()
+
+		if normalized_extra in optional_dependencies:
+			lines.extend(optional_dependencies[normalized_extra])
+		elif "optional-dependencies" in dynamic:
+			raise ValueError("The optional dependencies in pyproject.toml are dynamic, so can't be read.")
+		else:
+			raise ValueError(f"Unknown extra {extra!r} in pyproject.toml.")
+
+	return parse_requirement_names(lines)
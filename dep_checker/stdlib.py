@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+#
+#  stdlib.py
+"""
+The names of the standard library modules in each version of Python.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import functools
+import re
+from typing import FrozenSet, List, Optional, Tuple
+
+__all__ = ["get_stdlib", "parse_python_version", "supported_versions"]
+
+_VERSION_RE = re.compile(r"(\d+)\.(\d+)(?:\.\d+)?")
+
+
+def parse_python_version(python_version: str) -> str:
+	"""
+	Normalise a Python version such as ``'3.8'`` or ``'3.8.10'`` to the form ``'3.8'``.
+
+	:param python_version:
+
+	:raises ValueError: If the version is invalid, or there isn't a list of modules for it.
+	"""
+
+	match = _VERSION_RE.fullmatch(python_version.strip())
+	version = '' if match is None else f"{match.group(1)}.{match.group(2)}"
+
+	if version not in _versions():
+		raise ValueError(
+				f"Unsupported Python version {python_version!r}. "
+				f"Supported versions are {', '.join(supported_versions())}."
+				)
+
+	return version
+
+
+def supported_versions() -> List[str]:
+	"""
+	Returns the Python versions which there are lists of standard library modules for, oldest first.
+	"""
+
+	return list(_versions())
+
+
+def get_stdlib(python_version: Optional[str] = None) -> FrozenSet[str]:
+	"""
+	Returns the names of the top-level standard library modules for the given version of Python.
+
+	:param python_version: The Python version, such as ``'3.8'``.
+		If :py:obj:`None`, the modules from every version of Python (and every platform) are returned.
+
+	:raises ValueError: If there isn't a list of modules for the version.
+	"""
+
+	if python_version is None:
+		return _merged_stdlib()
+
+	return _stdlib_for_version(parse_python_version(python_version))
+
+
+@functools.lru_cache(maxsize=None)
+def _merged_stdlib() -> FrozenSet[str]:
+	# this package
+	from dep_checker._stdlib_list import stdlib
+
+	return frozenset(stdlib)
+
+
+@functools.lru_cache(maxsize=None)
+def _versions() -> Tuple[str, ...]:
+	# this package
+	from dep_checker._stdlib_versions import changes
+
+	return tuple(changes)
+
+
+@functools.lru_cache(maxsize=None)
+def _stdlib_for_version(version: str) -> FrozenSet[str]:
+	# The tables are stored as the changes from the previous version, so are applied cumulatively.
+
+	# this package
+	from dep_checker._stdlib_versions import changes
+
+	versions = _versions()
+	idx = versions.index(version)
+
+	if idx:
+		modules = set(_stdlib_for_version(versions[idx - 1]))
+	else:
+		modules = set()
+
+	added, removed = changes[version]
+	modules.update(added.split())
+	modules.difference_update(removed.split())
+
+	return frozenset(modules)
@@ -28,66 +28,141 @@ Private utilities.
 
 # stdlib
 import ast
+import fnmatch
+import mmap
+import os
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from operator import attrgetter
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, Match, Optional, Set, Tuple, Type, Union
 
 # 3rd party
-from astatine import get_attribute_name, is_type_checking
+from domdf_python_tools.typing import PathLike
 
 # this package
 from dep_checker import _stdlib_list
-
-__all__ = ["Visitor", "is_suppress_importerror"]
+from dep_checker.gitignore import GitIgnore
+
+__all__ = [
+		"Visitor",
+		"NamespaceTrie",
+		"is_suppress_importerror",
+		"DEFAULT_EXCLUDE",
+		"PathMatcher",
+		"iter_python_files",
+		]
+
+#: The exceptions which indicate an import is optional.
+_IMPORT_ERRORS = frozenset({"ImportError", "ModuleNotFoundError"})
+
+#: The names under which :func:`contextlib.suppress` is commonly used.
+_SUPPRESS_NAMES = frozenset({"suppress", "contextlib.suppress", "contextlib2.suppress"})
+
+#: Mapping of AST node types to their fields which contain statements (and so may contain imports).
+_STATEMENT_FIELDS: Dict[Type[ast.AST], Tuple[str, ...]] = {
+		ast.Module: ("body", ),
+		ast.Interactive: ("body", ),
+		ast.FunctionDef: ("body", ),
+		ast.AsyncFunctionDef: ("body", ),
+		ast.ClassDef: ("body", ),
+		ast.For: ("body", "orelse"),
+		ast.AsyncFor: ("body", "orelse"),
+		ast.While: ("body", "orelse"),
+		ast.If: ("body", "orelse"),
+		ast.With: ("body", ),
+		ast.AsyncWith: ("body", ),
+		ast.Try: ("body", "handlers", "orelse", "finalbody"),
+		ast.ExceptHandler: ("body", ),
+		}
+
+if sys.version_info >= (3, 10):  # pragma: no cover (<py310)
+	_STATEMENT_FIELDS[ast.Match] = ("cases", )
+	_STATEMENT_FIELDS[ast.match_case] = ("body", )
+
+if sys.version_info >= (3, 11):  # pragma: no cover (<py311)
+	_STATEMENT_FIELDS[ast.TryStar] = ("body", "handlers", "orelse", "finalbody")
+
+_COMPOUND_STATEMENTS = frozenset(_STATEMENT_FIELDS)
 
 
 class Visitor(ast.NodeVisitor):
 	"""
 	:class:`ast.NodeVisitor` to identify imports in a module.
 
+	Only statements are traversed; expressions (which can't contain imports) are never descended into.
+	The visitor doesn't hold any per-module state when used via :meth:`~.Visitor.iter_imports`,
+	so a single instance can be reused for many modules.
+
 	:param pkg_name:
-	:param namespace_packages:
+	:param namespace_packages: Mapping of namespaces (which may themselves contain dots)
+		to the names of the namespace packages within them.
+	:param stdlib: The names of standard library modules, which are ignored.
+		Defaults to all modules in the standard library of any version of Python.
+
+	.. versionchanged:: 0.10.0
+
+		* Rewritten as a statement-only walker, with the new
+		  :meth:`~.Visitor.iter_imports` and :meth:`~.Visitor.resolve_name` methods.
+		* Namespace packages may be nested more than two levels deep.
+		* Added the ``stdlib`` argument.
 	"""
 
-	def __init__(self, pkg_name: str, namespace_packages: Optional[Dict[str, List[str]]] = None):
+	def __init__(
+			self,
+			pkg_name: str,
+			namespace_packages: Optional[Dict[str, List[str]]] = None,
+			stdlib: Optional[Collection[str]] = None,
+			):
 		self.import_sources: List[Tuple[str, int]] = []
 		self.pkg_name = re.sub(r"[-/\\]", '_', pkg_name.rstrip(r"\/"))
 		self.namespace_packages = namespace_packages or {}
+		self.stdlib: Collection[str] = _stdlib_list.stdlib if stdlib is None else stdlib
 
-	def record_import(self, name: str, lineno: int) -> None:
+		self._namespace_trie = NamespaceTrie(
+				f"{namespace}.{child}" for namespace, children in self.namespace_packages.items()
+				for child in children
+				)
+		self._resolved_names: Dict[str, Optional[str]] = {}
+
+	def resolve_name(self, name: str) -> Optional[str]:
 		"""
-		Record an import.
+		Returns the name of the top-level package (or namespace package) for the given module.
+
+		Returns :py:obj:`None` if the module is part of the standard library or is the package being checked.
+
+		The result for each name is memoized.
+
+		.. versionadded:: 0.10.0
 
 		:param name: The name of the module being imported.
-		:param lineno:
 
 		.. TODO:: handle ``from namespace import package``
 		"""
 
-		for namespace, children in self.namespace_packages.items():
-			name_elements = name.split('.')
-			if name_elements[0] == namespace:
-				if len(name_elements) > 1 and name_elements[1] in children:
-					name = '.'.join(name_elements[:2])
-					break
-		else:
-			# Not a namespace package
-			name = name.split('.')[0]
+		try:
+			return self._resolved_names[name]
+		except KeyError:
+			pass
 
-		if name not in _stdlib_list.stdlib and name != self.pkg_name:
-			self.import_sources.append((name, lineno))
+		resolved_name: Optional[str] = self._namespace_trie.resolve(name)
 
-	def visit_Import(self, node: ast.Import) -> None:  # noqa: D102
-		name: ast.alias
-		for name in node.names:
-			self.record_import(name.name, node.lineno)
+		if resolved_name in self.stdlib or resolved_name == self.pkg_name:
+			resolved_name = None
+
+		self._resolved_names[name] = resolved_name
+		return resolved_name
+
+	def record_import(self, name: str, lineno: int) -> None:
+		"""
+		Record an import.
 
-	def visit_ImportFrom(self, node: ast.ImportFrom) -> None:  # noqa: D102
-		if node.level != 0:
-			# relative import
-			return
+		:param name: The name of the module being imported.
+		:param lineno:
+		"""
 
-		if node.module:
-			self.record_import(node.module, node.lineno)
+		resolved_name = self.resolve_name(name)
+		if resolved_name is not None:
+			self.import_sources.append((resolved_name, lineno))
 
 	def visit(self, node: ast.AST) -> List[Tuple[str, int]]:
 		"""
@@ -98,22 +173,112 @@ class Visitor(ast.NodeVisitor):
 		:returns: A list of imports and their locations (as two-element ``(name, lineno)`` tuples).
 		"""
 
-		super().visit(node)
+		self.import_sources.extend(self.iter_imports(node))
 		return self.import_sources
 
-	def visit_Try(self, node: ast.Try) -> Any:  # noqa: D102
-		for handler in node.handlers:
-			if isinstance(handler.type, ast.Name):
-				# print(handler.type.id)
+	def iter_source_import_spans(self, source: Union[str, bytes, mmap.mmap]) -> Iterator[Tuple[str, int, int]]:
+		"""
+		Parse the given source code and iterate over the imports in it, including the last line of each import.
+
+		.. versionadded:: 0.10.0
+
+		:param source: The source code, either decoded or as bytes (including a memory-mapped file).
+			The encoding of bytes is detected per :pep:`263`.
+
+		:returns: An iterator of three-element ``(name, lineno, end_lineno)`` tuples.
+		"""
+
+		return self.iter_import_spans(ast.parse(source))
+
+	def iter_imports(self, node: ast.AST) -> Iterator[Tuple[str, int]]:
+		"""
+		Lazily traverse the statements in the AST, yielding the imports found.
 
-				# TODO: check guarded imports
+		.. versionadded:: 0.10.0
+
+		:param node:
 
-				if handler.type.id not in {"ImportError", "ModuleNotFoundError"}:
-					self.generic_visit(node)
+		:returns: An iterator of imports and their locations (as two-element ``(name, lineno)`` tuples).
+		"""
+
+		for name, lineno, _ in self.iter_import_spans(node):
+			yield name, lineno
+
+	def iter_import_spans(self, node: ast.AST) -> Iterator[Tuple[str, int, int]]:
+		"""
+		Lazily traverse the statements in the AST, yielding the imports found and the lines they span.
 
-	def visit_With(self, node: ast.With) -> Any:  # noqa: D102
-		if not is_suppress_importerror(node):
-			self.generic_visit(node)
+		.. versionadded:: 0.10.0
+
+		:param node:
+
+		:returns: An iterator of three-element ``(name, lineno, end_lineno)`` tuples.
+		"""
+
+		stack: List[Iterator[ast.AST]] = [iter((node, ))]
+
+		while stack:
+			for child in stack[-1]:
+				if isinstance(child, ast.Import):
+					end_lineno = getattr(child, "end_lineno", None) or child.lineno
+					alias: ast.alias
+					for alias in child.names:
+						name = self.resolve_name(alias.name)
+						if name is not None:
+							yield name, child.lineno, end_lineno
+
+				elif isinstance(child, ast.ImportFrom):
+					# level != 0 is a relative import
+					if child.module and not child.level:
+						name = self.resolve_name(child.module)
+						if name is not None:
+							yield name, child.lineno, getattr(child, "end_lineno", None) or child.lineno
+
+				elif type(child) in _COMPOUND_STATEMENTS:
+					stack.append(iter(self.child_statements(child)))
+					break
+			else:
+				stack.pop()
+
+	def child_statements(self, node: ast.AST) -> List[ast.AST]:
+		"""
+		Returns the statements within ``node`` which should be searched for imports.
+
+		Imports guarded by ``if TYPE_CHECKING:``, ``try: ... except ImportError:``
+		or ``with suppress(ImportError):`` are excluded.
+
+		.. versionadded:: 0.10.0
+
+		:param node:
+		"""
+
+		if isinstance(node, ast.If):
+			# 3rd party
+			from astatine import is_type_checking
+
+			# TODO: check guarded imports
+			if is_type_checking(node.test):
+				return []
+
+		elif isinstance(node, ast.With):
+			if is_suppress_importerror(node):
+				return []
+
+		elif isinstance(node, ast.Try):
+			# The block is searched once for each handler for an exception other than ImportError.
+			repeat = 0
+			for handler in node.handlers:
+				if isinstance(handler.type, ast.Name):
+					# print(handler.type.id)
+
+					# TODO: check guarded imports
+
+					if handler.type.id not in _IMPORT_ERRORS:
+						repeat += 1
+
+			return _statements(node) * repeat
+
+		return _statements(node)
 
 	# def visit_Try(self, node: ast.Try) -> Any:
 	# 	for handler in node.handlers:
@@ -136,11 +301,67 @@ class Visitor(ast.NodeVisitor):
 	# 			# raise NotImplementedError(type(handler.type))
 	# 			pass
 
-	def visit_If(self, node: ast.If) -> Any:  # noqa: D102
-		# TODO: check guarded imports
 
-		if not is_type_checking(node.test):
-			self.generic_visit(node)
+class NamespaceTrie:
+	"""
+	Prefix trie of namespace packages, which resolves module names to the name of the package providing them.
+
+	.. versionadded:: 0.10.0
+
+	:param names: The dotted names of namespace packages, e.g. ``ruamel.yaml`` or ``google.cloud.storage``.
+	"""
+
+	def __init__(self, names: Iterable[str] = ()):
+		self._root: Dict[str, dict] = {}
+
+		for name in names:
+			self.add(name)
+
+	def add(self, name: str) -> None:
+		"""
+		Add a namespace package to the trie.
+
+		:param name:
+		"""
+
+		node = self._root
+		for part in name.split('.'):
+			node = node.setdefault(part, {})
+
+		# Module names can't be empty, so this marks the end of a namespace package.
+		node[''] = {}
+
+	def resolve(self, name: str) -> str:
+		"""
+		Returns the name of the namespace package providing the given module,
+		or the top-level package name if it isn't part of a namespace package.
+
+		:param name:
+		"""  # noqa: D400
+
+		parts = name.split('.')
+		node = self._root
+		depth = 1
+
+		for idx, part in enumerate(parts, 1):
+			if part not in node:
+				break
+
+			node = node[part]
+			if '' in node:
+				depth = idx
+
+		return '.'.join(parts[:depth])
+
+
+def _statements(node: ast.AST) -> List[ast.AST]:
+	# The statements directly within the node, in the order ast.NodeVisitor would visit them.
+	statements: List[ast.AST] = []
+
+	for field in _STATEMENT_FIELDS[type(node)]:
+		statements.extend(getattr(node, field))
+
+	return statements
 
 
 def is_suppress_importerror(node: ast.With) -> bool:
@@ -153,6 +374,9 @@ def is_suppress_importerror(node: ast.With) -> bool:
 	:param node:
 	"""  # noqa: D400
 
+	# 3rd party
+	from astatine import get_attribute_name
+
 	item: ast.withitem
 	for item in node.items:
 		if not isinstance(item.context_expr, ast.Call):
@@ -163,7 +387,7 @@ def is_suppress_importerror(node: ast.With) -> bool:
 		except NotImplementedError:  # pragma: no cover
 			continue
 
-		if name not in {"suppress", "contextlib.suppress", "contextlib2.suppress"}:
+		if name not in _SUPPRESS_NAMES:
 			continue
 
 		for arg in item.context_expr.args:
@@ -172,7 +396,190 @@ def is_suppress_importerror(node: ast.With) -> bool:
 			except NotImplementedError:  # pragma: no cover
 				continue
 
-			if arg_name in {"ImportError", "ModuleNotFoundError"}:
+			if arg_name in _IMPORT_ERRORS:
 				return True
 
 	return False
+
+
+#: Directories which are never checked, in addition to any configured with :confval:`exclude`.
+DEFAULT_EXCLUDE = (
+		".git",
+		".hg",
+		".svn",
+		".tox",
+		".nox",
+		".mypy_cache",
+		".pytest_cache",
+		"__pycache__",
+		"node_modules",
+		"venv",
+		".venv",
+		)
+
+
+class PathMatcher:
+	"""
+	Matches paths against a list of glob patterns.
+
+	A path matches if any pattern matches either its name or the whole (relative, ``/``-separated) path.
+	The patterns are compiled into a single regular expression.
+
+	.. versionadded:: 0.10.0
+
+	:param patterns:
+	"""
+
+	def __init__(self, patterns: Iterable[str]):
+		self.patterns = [pattern.strip('/') for pattern in patterns if pattern.strip('/')]
+
+		self._match: Optional[Callable[[str], Optional[Match[str]]]]
+		if self.patterns:
+			self._match = re.compile('|'.join(map(fnmatch.translate, self.patterns))).match
+		else:
+			self._match = None
+
+	def __call__(self, path: str, name: str) -> bool:
+		"""
+		Returns whether the path is matched by any of the patterns.
+
+		:param path: The path relative to the working directory.
+		:param name: The last component of ``path``.
+		"""
+
+		if self._match is None:
+			return False
+
+		return self._match(name) is not None or self._match(path) is not None
+
+	def match_any_parent(self, path: str) -> bool:
+		"""
+		Returns whether the path, or any of the directories containing it, are matched by any of the patterns.
+
+		:param path: The path relative to the working directory.
+		"""
+
+		parts = path.split('/')
+
+		for idx, name in enumerate(parts, start=1):
+			if self('/'.join(parts[:idx]), name):
+				return True
+
+		return False
+
+
+def iter_python_files(
+		basepath: PathLike,
+		directory: str,
+		exclude: Iterable[str] = (),
+		respect_gitignore: bool = False,
+		) -> Iterator[str]:
+	"""
+	Returns an iterator over the Python files in ``directory`` and its subdirectories.
+
+	Excluded directories are pruned before they are descended into,
+	and files (or directories) reached through several symlinks are only yielded once.
+	Files are only :func:`os.stat`-ed if they are symlinks.
+
+	Within each directory files are yielded in name order, followed by the contents of each subdirectory.
+
+	.. versionadded:: 0.10.0
+
+	:param basepath: The working directory.
+	:param directory: The directory to search, relative to ``basepath``, with ``/`` as the separator.
+	:param exclude: Glob patterns for files and directories to skip, in addition to :data:`~.DEFAULT_EXCLUDE`.
+	:param respect_gitignore: Whether to also skip files and directories ignored by git,
+		according to the ``.gitignore`` files in the repository and :file:`.git/info/exclude`.
+
+	:returns: An iterator of paths relative to ``basepath``, with ``/`` as the separator.
+
+	.. versionchanged:: 0.10.0  Added the ``respect_gitignore`` option.
+	"""
+
+	matcher = PathMatcher((*DEFAULT_EXCLUDE, *exclude))
+	directory = directory.strip('/')
+
+	root_stat = os.stat(os.path.join(basepath, directory))
+	root_dev = root_stat.st_dev
+
+	# The path of ``basepath`` relative to the root of the repository, for matching against .gitignore rules.
+	ignore: Optional[GitIgnore] = None
+	repo_prefix = ''
+
+	if respect_gitignore:
+		ignore, repo_root = GitIgnore.for_directory(os.path.join(basepath, directory))
+		if repo_root is not None:
+			repo_prefix = os.path.relpath(os.path.abspath(basepath), repo_root).replace(os.sep, '/')
+			repo_prefix = '' if repo_prefix == '.' else f"{repo_prefix}/"
+		else:
+			ignore = None
+
+	seen_dirs: Set[Tuple[int, int]] = {(root_dev, root_stat.st_ino)}
+	seen_files: Set[Tuple[int, int]] = set()
+
+	# The directories to search, the .gitignore rules which apply in them, and the device they are on.
+	stack: List[Tuple[str, Optional[GitIgnore], int]] = [(directory, ignore, root_dev)]
+
+	while stack:
+		current, ignore, current_dev = stack.pop()
+
+		try:
+			with os.scandir(os.path.join(basepath, current)) as it:
+				entries = sorted(it, key=attrgetter("name"))
+		except OSError:  # pragma: no cover
+			continue
+
+		if ignore is not None and any(entry.name == ".gitignore" for entry in entries):
+			ignore = ignore.extend_from_file(
+					os.path.join(basepath, current, ".gitignore"),
+					f"{repo_prefix}{current}",
+					)
+
+		subdirectories = []
+
+		for entry in entries:
+			path = f"{current}/{entry.name}"
+
+			if matcher(path, entry.name):
+				continue
+
+			try:
+				if entry.is_dir():
+					if ignore and ignore.is_ignored(f"{repo_prefix}{path}", is_dir=True):
+						continue
+
+					key = _entry_key(entry, current_dev)
+					if key not in seen_dirs:
+						seen_dirs.add(key)
+						subdirectories.append((path, ignore, key[0]))
+
+				elif entry.name.endswith(".py") and entry.is_file():
+					if ignore and ignore.is_ignored(f"{repo_prefix}{path}"):
+						continue
+
+					key = _entry_key(entry, current_dev)
+					if key not in seen_files:
+						seen_files.add(key)
+						yield path
+
+			except OSError:  # pragma: no cover
+				# e.g. a broken symlink
+				continue
+
+		stack.extend(reversed(subdirectories))
+
+
+def _entry_key(entry: "os.DirEntry[str]", parent_dev: int) -> Tuple[int, int]:
+	# Identifies the file or directory an entry refers to, by its device and inode.
+	# The inode of a symlink is that of the link itself, so the target has to be stat-ed.
+	if entry.is_symlink():
+		stat = entry.stat()
+		return stat.st_dev, stat.st_ino
+
+	if entry.is_dir(follow_symlinks=False):
+		# A directory may be a mount point, so be on a different device to the one containing it.
+		stat = entry.stat(follow_symlinks=False)
+		return stat.st_dev, stat.st_ino
+
+	# A file is on the same device as the directory containing it.
+	return parent_dev, entry.inode()
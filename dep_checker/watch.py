@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+#
+#  watch.py
+"""
+Incrementally recheck a package as its files change.
+
+.. versionadded:: 0.10.0
+"""
+#
+#  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus, in_directory
+from domdf_python_tools.typing import PathLike
+
+# this package
+from dep_checker import (
+		DepChecker,
+		PassingRequirement,
+		UnlistedRequirement,
+		UnusedRequirement,
+		_scan_file
+		)
+from dep_checker.cache import ScanResult
+
+__all__ = ["ImportIndex", "Watcher"]
+
+_Results = List[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]]
+
+
+class ImportIndex:
+	"""
+	In-memory index of the imports in each file of a package,
+	which can be updated one file at a time.
+
+	Each file's imports are matched against the requirements when the file is updated,
+	and for each requirement the index records the files which import it,
+	so updating a file only touches the entries for that file rather than rechecking the whole package.
+
+	The files are kept in the order they were discovered in,
+	so the results are in the same order as :meth:`DepChecker.check <.DepChecker.check>`.
+
+	:param checker: The :class:`~.DepChecker` whose requirements and options are used.
+	"""  # noqa: D400
+
+	def __init__(self, checker: DepChecker):
+		self.checker = checker
+
+		#: Mapping of filenames to the imports found in them.
+		self.files: Dict[PathPlus, ScanResult] = {}
+
+		# Mapping of filenames to the requirements they import, and the first line each is imported on.
+		self._requirements: Dict[PathPlus, Dict[str, int]] = {}
+
+		# Mapping of requirements to the files which import them, and the first line they are imported on.
+		self._references: Dict[str, Dict[PathPlus, int]] = defaultdict(dict)
+
+		# The first file (in the order they were discovered in) which imports each requirement.
+		# Entries are removed when they may have changed, and found again when the results are next requested.
+		self._first: Dict[str, PathPlus] = {}
+
+		# Mapping of filenames to the unlisted imports in them, in the order the files were discovered in.
+		self._unlisted: Dict[PathPlus, List[UnlistedRequirement]] = {}
+		self._unlisted_ordered = True
+		self._unlisted_end = -1  # The greatest position of a file added to ``_unlisted``.
+
+		# The position of each file in the order they were discovered in.
+		self._positions: Dict[PathPlus, int] = {}
+		self._next_position = 0
+
+		self._classified: Dict[str, Optional[bool]] = {}
+
+	def _classify(self, import_name: str) -> Optional[bool]:
+		try:
+			return self._classified[import_name]
+		except KeyError:
+			is_requirement = self._classified[import_name] = self.checker._classify(import_name)
+			return is_requirement
+
+	def update(self, filename: PathPlus, result: ScanResult) -> None:
+		"""
+		Add or replace the imports for the given file.
+
+		A file which is already in the index keeps its position. New files are added at the end;
+		use :meth:`~.ImportIndex.reorder` to restore the order they were discovered in.
+
+		:param filename:
+		:param result: The imports in the file, and the line numbers marked with ``# nodep``.
+		"""
+
+		if filename in self.files:
+			self._discard(filename)
+		else:
+			self._positions[filename] = self._next_position
+			self._next_position += 1
+
+		self.files[filename] = result
+
+		file_imports, nodep = result
+		requirements: Dict[str, int] = {}
+		unlisted: List[UnlistedRequirement] = []
+
+		for import_name, lineno in file_imports:
+			is_requirement = self._classify(import_name)
+
+			if is_requirement is None:
+				# Part of the standard library, or the package itself
+				continue
+
+			if is_requirement:
+				if import_name in self.checker.requirements:
+					req_name = import_name
+				else:
+					req_name = self.checker._aliases[import_name]
+
+				requirements[req_name] = min((requirements.get(req_name, lineno), lineno))
+			elif lineno not in nodep:
+				unlisted.append(UnlistedRequirement(name=import_name, lineno=lineno, filename=filename.as_posix()))
+
+		position = self._positions[filename]
+		self._requirements[filename] = requirements
+
+		for req_name, lineno in requirements.items():
+			self._references[req_name][filename] = lineno
+
+			first = self._first.get(req_name)
+			if first is not None and position < self._positions[first]:
+				self._first[req_name] = filename
+
+		if unlisted:
+			if position < self._unlisted_end:
+				self._unlisted_ordered = False
+			else:
+				self._unlisted_end = position
+
+			self._unlisted[filename] = unlisted
+
+	def _discard(self, filename: PathPlus) -> None:
+		# Remove the file's contributions to the results.
+		self._unlisted.pop(filename, None)
+
+		for req_name in self._requirements.pop(filename, {}):
+			self._references[req_name].pop(filename, None)
+
+			if self._first.get(req_name) == filename:
+				del self._first[req_name]
+
+	def remove(self, filename: PathPlus) -> None:
+		"""
+		Remove the given file from the index.
+
+		:param filename:
+		"""
+
+		if filename not in self.files:
+			return
+
+		self._discard(filename)
+		del self.files[filename]
+		del self._positions[filename]
+
+	def reorder(self, filenames: Iterable[PathPlus]) -> None:
+		"""
+		Order the files in the index in the order they appear in ``filenames``.
+
+		:param filenames: The files in the order they were discovered in.
+			Files which aren't in the index are ignored.
+		"""
+
+		self.files = {filename: self.files[filename] for filename in filenames if filename in self.files}
+		self._positions = {filename: position for position, filename in enumerate(self.files)}
+		self._next_position = len(self._positions)
+		self._first.clear()
+		self._unlisted_ordered = False
+
+	def results(self) -> _Results:
+		"""
+		Returns the results of the check, in the same order as :meth:`DepChecker.check <.DepChecker.check>`.
+		"""
+
+		if not self._unlisted_ordered:
+			self._unlisted = dict(sorted(self._unlisted.items(), key=lambda item: self._positions[item[0]]))
+			self._unlisted_end = max(map(self._positions.__getitem__, self._unlisted), default=-1)
+			self._unlisted_ordered = True
+
+		results: _Results = [item for unlisted in self._unlisted.values() for item in unlisted]
+
+		for req_name in sorted(self.checker.requirements):
+			references = self._references.get(req_name)
+
+			if references:
+				first = self._first.get(req_name)
+				if first is None:
+					first = self._first[req_name] = min(references, key=self._positions.__getitem__)
+
+				results.append(PassingRequirement(name=req_name, lineno=references[first], filename=first.as_posix()))
+			elif req_name not in self.checker.allowed_unused:
+				results.append(UnusedRequirement(name=req_name))
+
+		return results
+
+
+class Watcher:
+	"""
+	Polls the files in a package for changes, reparsing only those which have changed.
+
+	:param checker: The :class:`~.DepChecker` whose requirements and options are used.
+	:param work_dir: The directory to find the source of the package in.
+	:param interval: The time in seconds between polls.
+	"""
+
+	def __init__(self, checker: DepChecker, work_dir: PathLike = '.', interval: float = 1.0):
+		self.checker = checker
+		self.work_dir = PathPlus(work_dir).abspath()
+		self.interval = interval
+
+		#: The index of the imports in each file.
+		self.index = ImportIndex(checker)
+
+		#: The files which were parsed during the last call to :meth:`~.Watcher.scan` or :meth:`~.Watcher.poll`.
+		self.last_scanned: List[PathPlus] = []
+
+		self._stats: Dict[PathPlus, Tuple[int, int]] = {}
+
+	def _stat(self, filename: PathPlus) -> Tuple[int, int]:
+		stat = os.stat(self.work_dir / filename)
+		return stat.st_mtime_ns, stat.st_size
+
+	def scan(self) -> _Results:
+		"""
+		Perform the initial scan of every file in the package.
+		"""
+
+		self.last_scanned = []
+
+		with in_directory(self.work_dir):
+			for filename, result in self.checker._iter_scanned_files(self.work_dir):
+				self._stats[filename] = self._stat(filename)
+				self.index.update(filename, result)
+				self.last_scanned.append(filename)
+
+		return self.index.results()
+
+	def poll(self) -> bool:
+		"""
+		Check for new, modified or deleted files, and update the index accordingly.
+
+		Returns whether any files changed.
+		"""
+
+		self.last_scanned = []
+		seen: Dict[PathPlus, None] = {}
+		added = changed = False
+
+		with in_directory(self.work_dir):
+			for filename in self.checker._iter_files_to_check(self.work_dir):
+				seen[filename] = None
+
+				try:
+					stat = self._stat(filename)
+				except FileNotFoundError:  # pragma: no cover (race)
+					continue
+
+				if self._stats.get(filename) == stat:
+					continue
+
+				try:
+					_, result = _scan_file(filename, dict(self.checker.namespace_packages))
+				except SyntaxError:
+					# Probably saved part way through an edit; keep the previous result until it's fixed.
+					continue
+
+				added = added or filename not in self.index.files
+				self._stats[filename] = stat
+				self.index.update(filename, result)
+				self.last_scanned.append(filename)
+				changed = True
+
+			if added:
+				self.index.reorder(seen)
+
+			for filename in set(self._stats) - seen.keys():
+				del self._stats[filename]
+				self.index.remove(filename)
+				changed = True
+
+		return changed
+
+	def watch(self) -> Iterator[_Results]:
+		"""
+		Yields the results of the initial scan, and then the updated results each time a file changes.
+
+		The iterator never ends, so should be interrupted with :exc:`KeyboardInterrupt`
+		or by the caller breaking out of the loop.
+		"""
+
+		yield self.scan()
+
+		while True:
+			time.sleep(self.interval)
+
+			if self.poll():
+				yield self.index.results()
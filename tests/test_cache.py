@@ -0,0 +1,159 @@
+# stdlib
+import os
+from typing import List
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from dep_checker import DepChecker
+from dep_checker.cache import ImportCache, ScanResult, make_cache_key
+
+
+def test_make_cache_key():
+	assert make_cache_key("foo", "bar") == make_cache_key("foo", "bar")
+	assert make_cache_key("foo", "bar") != make_cache_key("foo", "baz")
+	assert make_cache_key("foo", "bar") != make_cache_key("foobar")
+
+
+class CountingScanner:
+
+	def __init__(self):
+		self.calls = 0
+
+	def __call__(self, content: bytes) -> ScanResult:
+		self.calls += 1
+		source = content.decode("UTF-8")
+		imports = [(line.split()[1], lineno) for lineno, line in enumerate(source.splitlines(), 1)]
+		return imports, {lineno for lineno, line in enumerate(source.splitlines(), 1) if "nodep" in line}
+
+
+def test_import_cache(tmp_pathplus: PathPlus):
+	scanner = CountingScanner()
+	source_file = tmp_pathplus / "source.py"
+	source_file.write_lines(["import foo", "import bar"])
+
+	with ImportCache(tmp_pathplus / "cache", "key") as cache:
+		assert cache.fetch(source_file, scanner) == ([("foo", 1), ("bar", 2)], set())
+		assert cache.misses == 1
+
+	assert (tmp_pathplus / "cache" / ".gitignore").is_file()
+
+	with ImportCache(tmp_pathplus / "cache", "key") as cache:
+		assert cache.fetch(source_file, scanner) == ([("foo", 1), ("bar", 2)], set())
+		assert cache.hits == 1
+		assert scanner.calls == 1
+
+	# Same content, different mtime
+	stat = source_file.stat()
+	os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+	with ImportCache(tmp_pathplus / "cache", "key") as cache:
+		assert cache.fetch(source_file, scanner) == ([("foo", 1), ("bar", 2)], set())
+		assert cache.hits == 1
+		assert scanner.calls == 1
+
+	source_file.write_lines(["import baz", "import spam  # nodep"])
+
+	with ImportCache(tmp_pathplus / "cache", "key") as cache:
+		assert cache.fetch(source_file, scanner) == ([("baz", 1), ("spam", 2)], {2})
+		assert cache.misses == 1
+		assert scanner.calls == 2
+
+	with ImportCache(tmp_pathplus / "cache", "key") as cache:
+		assert cache.fetch(source_file, scanner) == ([("baz", 1), ("spam", 2)], {2})
+		assert cache.hits == 1
+		assert scanner.calls == 2
+
+	# Different key
+	with ImportCache(tmp_pathplus / "cache", "other-key") as cache:
+		assert cache.fetch(source_file, scanner) == ([("baz", 1), ("spam", 2)], {2})
+		assert cache.misses == 1
+		assert scanner.calls == 3
+
+
+def test_import_cache_modified_while_reading(tmp_pathplus: PathPlus):
+	scanner = CountingScanner()
+	source_file = tmp_pathplus / "source.py"
+	source_file.write_lines(["import foo"])
+
+	def modifying_scanner(content: bytes) -> ScanResult:
+		# The file is changed after it has been read, but before it is stored in the cache.
+		source_file.write_lines(["import foo", "import bar"])
+		return scanner(content)
+
+	with ImportCache(tmp_pathplus / "cache", "key") as cache:
+		assert cache.fetch(source_file, modifying_scanner) == ([("foo", 1)], set())
+
+	with ImportCache(tmp_pathplus / "cache", "key") as cache:
+		assert cache.fetch(source_file, scanner) == ([("foo", 1), ("bar", 2)], set())
+		assert cache.misses == 1
+		assert scanner.calls == 2
+
+
+def test_import_cache_corrupt(tmp_pathplus: PathPlus):
+	scanner = CountingScanner()
+	source_file = tmp_pathplus / "source.py"
+	source_file.write_lines(["import foo"])
+
+	cache = ImportCache(tmp_pathplus / "cache", "key")
+	cache.cache_file.parent.maybe_make()
+	cache.cache_file.write_text("{not json")
+
+	with cache:
+		assert cache.fetch(source_file, scanner) == ([("foo", 1)], set())
+		assert cache.misses == 1
+
+
+def test_import_cache_eviction(tmp_pathplus: PathPlus):
+	scanner = CountingScanner()
+	filenames: List[PathPlus] = []
+
+	for idx in range(5):
+		filename = tmp_pathplus / f"source{idx}.py"
+		filename.write_lines([f"import foo{idx}"])
+		filenames.append(filename)
+
+	with ImportCache(tmp_pathplus / "cache", "key", max_entries=3) as cache:
+		for filename in filenames[:3]:
+			cache.fetch(filename, scanner)
+
+	with ImportCache(tmp_pathplus / "cache", "key", max_entries=3) as cache:
+		for filename in filenames[3:]:
+			cache.fetch(filename, scanner)
+
+	with ImportCache(tmp_pathplus / "cache", "key", max_entries=3) as cache:
+		for filename in filenames:
+			cache.fetch(filename, scanner)
+
+		# The two most recently used files are still in the cache, along with one of the others.
+		assert cache.hits == 3
+		assert cache.misses == 2
+
+
+@pytest.mark.parametrize("package", [False, True])
+def test_dep_checker_cache(
+		single_file_project: PathPlus,
+		requirements: List[str],
+		package: bool,
+		):
+	if package:
+		(single_file_project / "my_project").mkdir()
+		(single_file_project / "my_project.py").move(single_file_project / "my_project" / "__init__.py")
+
+	expected = list(DepChecker("my_project", requirements).check(single_file_project))
+
+	cache_dir = single_file_project / ".dep_checker_cache"
+	checker = DepChecker("my_project", requirements, cache_dir=cache_dir)
+	assert list(checker.check(single_file_project)) == expected
+	assert list(cache_dir.glob("imports-*.json"))
+	assert list(checker.check(single_file_project)) == expected
+
+	# Changing the namespace packages invalidates the cache.
+	namespace_packages = ["ruamel.yaml"]
+	uncached_checker = DepChecker("my_project", requirements, namespace_packages=namespace_packages)
+	expected = list(uncached_checker.check(single_file_project))
+	checker = DepChecker("my_project", requirements, cache_dir=cache_dir, namespace_packages=namespace_packages)
+	assert list(checker.check(single_file_project)) == expected
+	assert len(list(cache_dir.glob("imports-*.json"))) == 2
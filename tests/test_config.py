@@ -1,4 +1,5 @@
 # stdlib
+import os
 from configparser import ConfigParser
 
 # 3rd party
@@ -8,7 +9,7 @@ from coincidence import AdvancedDataRegressionFixture
 from domdf_python_tools.paths import PathPlus
 
 # this package
-from dep_checker import AllowedUnused, ConfigReader, NameMapping, NamespacePackages
+from dep_checker import AllowedUnused, ConfigReader, Exclude, NameMapping, NamespacePackages
 
 
 class TestIni:
@@ -193,6 +194,110 @@ def test_configreader_default(tmp_pathplus: PathPlus):
 	assert reader.visit() == {}
 
 
+def test_configreader_cache(tmp_pathplus: PathPlus, monkeypatch):
+	parsed = []
+	loads = dom_toml.loads
+
+	def counting_loads(content: str):
+		parsed.append(content)
+		return loads(content)
+
+	monkeypatch.setattr(dom_toml, "loads", counting_loads)
+
+	reader = ConfigReader("dep_checker", default_factory=dict, work_dir=tmp_pathplus)
+	pyproject = tmp_pathplus / "pyproject.toml"
+
+	# Not parsed at all without the section name
+	pyproject.write_lines(["[project]", "name = 'foo'"])
+	assert reader.visit() == {}
+	assert parsed == []
+
+	pyproject.write_lines(["[tool.dep_checker]", "allowed_unused = ['foo']"])
+	assert reader.visit() == {"allowed_unused": ["foo"]}
+	assert len(parsed) == 1
+
+	# Unchanged, so not parsed again; and the cached value can't be modified by callers
+	reader.visit()["allowed_unused"].append("bar")
+	assert reader.visit() == {"allowed_unused": ["foo"]}
+	assert len(parsed) == 1
+
+	pyproject.write_lines(["[tool.dep_checker]", "allowed_unused = ['foo', 'bar']"])
+	os.utime(pyproject, ns=(0, 0))
+	assert reader.visit() == {"allowed_unused": ["foo", "bar"]}
+	assert len(parsed) == 2
+
+	reader.reload()
+	assert reader.visit() == {"allowed_unused": ["foo", "bar"]}
+	assert len(parsed) == 3
+
+	pyproject.unlink()
+	assert reader.visit() == {}
+
+
+@pytest.mark.parametrize("filename", ["tox.ini", "setup.cfg"])
+def test_configreader_interpolation_other_section(tmp_pathplus: PathPlus, filename: str):
+	reader = ConfigReader("dep_checker", default_factory=dict, work_dir=tmp_pathplus)
+
+	(tmp_pathplus / filename).write_lines([
+			"[pytest]",
+			"log_date_format = %Y-%m-%d %H:%M:%S",
+			'',
+			"[dep_checker]",
+			"allowed_unused = foo",
+			])
+
+	assert reader.visit() == {"allowed_unused": "foo"}
+
+
+def test_configreader_work_dir(tmp_pathplus: PathPlus):
+	reader = ConfigReader("dep_checker", default_factory=dict)
+
+	(tmp_pathplus / "sub").mkdir()
+	(tmp_pathplus / "tox.ini").write_lines(["[dep_checker]", "allowed_unused = foo"])
+
+	assert reader.visit(tmp_pathplus) == {"allowed_unused": "foo"}
+	assert reader.find(tmp_pathplus / "sub") is None
+	assert reader.visit(tmp_pathplus / "sub") == {}
+
+
+def test_configreader_load_pyproject_toml(tmp_pathplus: PathPlus, monkeypatch):
+	reader = ConfigReader("dep_checker", default_factory=dict)
+	parsed = []
+
+	def parse_toml(content: str):
+		parsed.append(content)
+		return dom_toml.loads(content)
+
+	monkeypatch.setattr(reader, "_parse_toml", parse_toml)
+
+	assert reader.load_pyproject_toml(tmp_pathplus) is None
+
+	(tmp_pathplus / "pyproject.toml").write_lines(["[project]", 'name = "my-project"'])
+
+	# The section name isn't in the file, so it isn't parsed for the configuration...
+	assert reader.visit_pyproject_toml(tmp_pathplus) is None
+	assert not parsed
+
+	# ...but is when the whole document is needed, and only once.
+	assert reader.load_pyproject_toml(tmp_pathplus) == {"project": {"name": "my-project"}}
+	assert reader.load_pyproject_toml(tmp_pathplus) == {"project": {"name": "my-project"}}
+	assert reader.visit_pyproject_toml(tmp_pathplus) is None
+	assert len(parsed) == 1
+
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			'name = "my-project"',
+			"[tool.dep_checker]",
+			'allowed_unused = ["foo"]',
+			])
+
+	assert reader.visit_pyproject_toml(tmp_pathplus) == {"allowed_unused": ["foo"]}
+	doc = reader.load_pyproject_toml(tmp_pathplus)
+	assert doc is not None
+	assert doc["project"] == {"name": "my-project"}
+	assert len(parsed) == 2
+
+
 def test_defaults():
 	assert AllowedUnused.get(None) == []
 	assert AllowedUnused.get() == []
@@ -202,3 +307,23 @@ def test_defaults():
 
 	assert NameMapping.get(None) == {}
 	assert NameMapping.get() == {}
+
+	assert Exclude.get(None) == []
+	assert Exclude.get() == []
+
+
+@pytest.mark.parametrize(
+		"config",
+		[
+				pytest.param({"exclude": "build, my_project/_vendor"}, id="ini_comma"),
+				pytest.param({"exclude": "\nbuild\nmy_project/_vendor"}, id="ini_newline"),
+				pytest.param({"exclude": ["build", "my_project/_vendor"]}, id="toml"),
+				],
+		)
+def test_exclude(config):
+	assert Exclude.get(config) == ["build", "my_project/_vendor"]
+
+
+def test_exclude_invalid():
+	with pytest.raises(ValueError, match="'exclude' must be a list of strings"):
+		Exclude.get({"exclude": ["build", 1]})
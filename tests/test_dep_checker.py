@@ -106,6 +106,15 @@ def test_with_config(
 	advanced_data_regression.check(capsys.readouterr())
 
 
+def test_config_in_work_dir(single_file_project: PathPlus, tmp_path, capsys):
+	(single_file_project / "tox.ini").write_lines(["[dep_checker]", "allowed_unused = numpy"])
+
+	with in_directory(tmp_path):
+		assert check_imports("my_project", work_dir=single_file_project, colour=False) == 1
+
+	assert "numpy never imported" not in capsys.readouterr().out
+
+
 def test_make_requirement_tuple():
 	data = {"class": "UnlistedRequirement", "filename": "my_project.py", "lineno": 5, "name": "pytest"}
 	result = make_requirement_tuple(data)
@@ -133,3 +142,127 @@ def test_make_requirement_tuple():
 	data = {"class": "UnusedRequirement", "name": "pytest", "filename": "my_project.py"}
 	with pytest.raises(TypeError, match=r"(__new__|<lambda>)\(\) got an unexpected keyword argument 'filename'"):
 		make_requirement_tuple(data)
+
+
+@pytest.mark.parametrize("jobs", ['2', "auto"])
+def test_cli_jobs(package_project: PathPlus, jobs: str):
+	with in_directory(package_project):
+		runner = CliRunner()
+		serial_result: Result = runner.invoke(main, args=["my_project", "--no-colour", "--no-cache"])
+		result: Result = runner.invoke(main, args=["my_project", "--no-colour", "--no-cache", "--jobs", jobs])
+
+	assert result.stdout == serial_result.stdout
+	assert result.exit_code == 1
+
+
+@pytest.mark.parametrize("jobs", ['0', "-1", "many"])
+def test_cli_jobs_invalid(package_project: PathPlus, jobs: str):
+	with in_directory(package_project):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["my_project", "--jobs", jobs])
+
+	assert "is not a positive integer or 'auto'" in result.stdout
+	assert result.exit_code == 2
+
+
+def test_cli_fail_fast(package_project: PathPlus):
+	with in_directory(package_project):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["my_project", "--no-colour", "--no-cache", "--fail-fast"])
+
+	assert result.exit_code == 1
+	assert result.stdout == "✘ pytest imported at my_project/__init__.py:5 but not listed as a requirement\n"
+
+
+def test_cli_errors_only(package_project: PathPlus):
+	with in_directory(package_project):
+		runner = CliRunner()
+		expected: Result = runner.invoke(main, args=["my_project", "--no-colour", "--no-cache"])
+		result: Result = runner.invoke(main, args=["my_project", "--no-colour", "--no-cache", "--errors-only"])
+
+	assert result.exit_code == 1
+	assert result.stdout.splitlines() == [line for line in expected.stdout.splitlines() if not line.startswith('✔')]
+
+
+def test_cli_python_version(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "my_project.py").write_lines(["import tomllib", "import click"])
+	(tmp_pathplus / "requirements.txt").write_lines(["click"])
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner()
+		result: Result = runner.invoke(
+				main,
+				args=["my_project", "--no-colour", "--no-cache", "--python-version", "3.11", "--python-version", "3.8"],
+				)
+
+	assert result.exit_code == 1
+	assert result.stdout.splitlines() == [
+			"Python 3.11",
+			"✔ click imported at my_project.py:2",
+			'',
+			"Python 3.8",
+			"✘ tomllib imported at my_project.py:1 but not listed as a requirement",
+			"✔ click imported at my_project.py:2",
+			]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["my_project", "--no-colour", "--python-version", "3.5"])
+
+	assert result.exit_code == 1
+	assert "Unsupported Python version '3.5'" in result.stderr
+
+
+@pytest.mark.parametrize("full_requirements_parse", [True, False])
+def test_check_imports_included_requirements(tmp_pathplus: PathPlus, capsys, full_requirements_parse: bool):
+	(tmp_pathplus / "my_project.py").write_lines(["import click", "import yaml"])
+	(tmp_pathplus / "requirements.txt").write_lines(["click>=7", "-r requirements-extra.txt"])
+	(tmp_pathplus / "requirements-extra.txt").write_lines(["PyYAML"])
+
+	ret = check_imports(
+			"my_project",
+			work_dir=tmp_pathplus,
+			colour=False,
+			name_mapping={"pyyaml": "yaml"},
+			full_requirements_parse=full_requirements_parse,
+			)
+
+	assert ret == 0
+	assert capsys.readouterr().out.splitlines() == [
+			"✔ click imported at my_project.py:1",
+			"✔ yaml imported at my_project.py:2",
+			]
+
+
+def test_cli_req_source(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "my_project.py").write_lines(["import click", "import sphinx"])
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			'name = "my-project"',
+			'dependencies = ["click>=7"]',
+			"[project.optional-dependencies]",
+			'docs = ["sphinx"]',
+			"[tool.dep_checker]",
+			'allowed_unused = ["click"]',
+			])
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["my_project", "--no-colour", "--req-source", "pyproject:docs"])
+
+	assert result.exit_code == 0
+	assert result.stdout.splitlines() == [
+			"✔ click imported at my_project.py:1",
+			"✔ sphinx imported at my_project.py:2",
+			]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["my_project", "--no-colour", "--req-source", "pyproject"])
+
+	assert result.exit_code == 1
+	assert "✘ sphinx imported at my_project.py:2 but not listed as a requirement" in result.stdout.splitlines()
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["my_project", "--no-colour", "--req-source", "pyproject:testing"])
+
+	assert result.exit_code == 1
+	assert "Unknown extra 'testing' in pyproject.toml." in result.stderr
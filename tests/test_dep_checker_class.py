@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # 3rd party
 import pytest
@@ -7,7 +7,8 @@ from coincidence.regressions import AdvancedDataRegressionFixture
 from domdf_python_tools.paths import PathPlus
 
 # this package
-from dep_checker import DepChecker
+import dep_checker
+from dep_checker import DepChecker, PassingRequirement
 
 
 def test_dep_checker(
@@ -56,3 +57,164 @@ def test_with_config(
 	checker = DepChecker("my_project", requirements, **config)
 
 	advanced_data_regression.check([r._asdict() for r in checker.check(single_file_project)])
+
+
+@pytest.mark.parametrize("jobs", [2, None])
+@pytest.mark.parametrize("cache", [False, True])
+def test_dep_checker_jobs(
+		package_project: PathPlus,
+		imports: List[str],
+		requirements: List[str],
+		jobs: Optional[int],
+		cache: bool,
+		):
+	for idx in range(10):
+		(package_project / "my_project" / f"submodule{idx}.py").write_lines(imports[idx:])
+
+	(package_project / "my_project" / "subpackage").mkdir()
+	(package_project / "my_project" / "subpackage" / "__init__.py").write_lines(reversed(imports[:15]))
+
+	expected = [r._asdict() for r in DepChecker("my_project", requirements).check(package_project)]
+
+	cache_dir = (package_project / ".dep_checker_cache") if cache else None
+	checker = DepChecker("my_project", requirements, jobs=jobs, cache_dir=cache_dir)
+	assert [r._asdict() for r in checker.check(package_project)] == expected
+	assert [r._asdict() for r in checker.check(package_project)] == expected
+
+
+def test_dep_checker_nodep_multiline(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "my_project.py").write_lines([
+			"from pytest import (  # nodep",
+			"\tfixture,",
+			"\t)",
+			"from sphinx import (",
+			"\tapplication,  # nodep",
+			"\t)",
+			"import click, \\",
+			"\tconsolekit  # nodep",
+			"import numpy",
+			"x = 1  # nodep",
+			"from pandas import (",
+			"\tDataFrame,",
+			"\t)  # nodep",
+			])
+
+	checker = DepChecker("my_project", [])
+	assert [r._asdict() for r in checker.check(tmp_pathplus)] == [
+			{"class": "UnlistedRequirement", "name": "numpy", "lineno": 9, "filename": "my_project.py"},
+			]
+
+
+def test_dep_checker_nested_namespace(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "my_project.py").write_lines([
+			"import os",
+			"from google.cloud import storage",
+			"import google.cloud.bigquery",
+			"from google.cloud.storage import blob",
+			"import google.protobuf",
+			])
+
+	checker = DepChecker(
+			"my_project",
+			["google.cloud.storage", "google"],
+			namespace_packages=["google.cloud.storage"],
+			)
+	assert [r._asdict() for r in checker.check(tmp_pathplus)] == [
+			{"class": "PassingRequirement", "name": "google", "lineno": 2, "filename": "my_project.py"},
+			{"class": "PassingRequirement", "name": "google.cloud.storage", "lineno": 4, "filename": "my_project.py"},
+			]
+
+
+def test_dep_checker_errors_only(single_file_project: PathPlus, requirements: List[str]):
+	checker = DepChecker("my_project", requirements)
+	expected = [result for result in checker.check(single_file_project) if not isinstance(result, PassingRequirement)]
+	assert list(checker.check(single_file_project, errors_only=True)) == expected
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_dep_checker_stop_early(tmp_pathplus: PathPlus, jobs: int):
+	(tmp_pathplus / "my_project").mkdir()
+	for idx in range(20):
+		(tmp_pathplus / "my_project" / f"module{idx}.py").write_lines([f"import foo{idx}"])
+
+	results = DepChecker("my_project", [], jobs=jobs).check(tmp_pathplus)
+	first = next(iter(results))
+	assert first._asdict()["class"] == "UnlistedRequirement"
+
+	# Closing the generator cancels outstanding work and doesn't hang.
+	results.close()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+@pytest.mark.parametrize("mmap_threshold", [0, 1024 * 1024])
+def test_dep_checker_encoding(tmp_pathplus: PathPlus, monkeypatch, jobs: int, mmap_threshold: int):
+	monkeypatch.setattr(dep_checker, "MMAP_THRESHOLD", mmap_threshold)
+
+	(tmp_pathplus / "my_project").mkdir()
+	(tmp_pathplus / "my_project" / "__init__.py").write_bytes(
+			"# -*- coding: latin-1 -*-\nname = 'Mañana'\nimport numpy  # nodep ñ\nimport pandas\n".encode("latin-1")
+			)
+	(tmp_pathplus / "my_project" / "empty.py").write_bytes(b'')
+
+	checker = DepChecker("my_project", [], jobs=jobs)
+	assert [r._asdict() for r in checker.check(tmp_pathplus)] == [
+			{"class": "UnlistedRequirement", "name": "pandas", "lineno": 4, "filename": "my_project/__init__.py"},
+			]
+
+
+def test_dep_checker_exclude(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "my_project" / "_vendor").mkdir(parents=True)
+	(tmp_pathplus / "my_project" / "__init__.py").write_lines(["import click"])
+	(tmp_pathplus / "my_project" / "_vendor" / "six.py").write_lines(["import numpy"])
+
+	checker = DepChecker("my_project", ["click"], exclude=["_vendor"])
+	assert [r._asdict() for r in checker.check(tmp_pathplus)] == [
+			{"class": "PassingRequirement", "name": "click", "lineno": 1, "filename": "my_project/__init__.py"},
+			]
+
+
+def test_dep_checker_python_version(tmp_pathplus: PathPlus, monkeypatch):
+	(tmp_pathplus / "my_project.py").write_lines([
+			"import tomllib",
+			"import StringIO",
+			"import distutils",
+			"import click",
+			])
+
+	checker = DepChecker("my_project", ["click"], python_version="3.8.10")
+	assert checker.python_version == "3.8"
+	assert [r._asdict() for r in checker.check(tmp_pathplus, errors_only=True)] == [
+			{"class": "UnlistedRequirement", "name": "tomllib", "lineno": 1, "filename": "my_project.py"},
+			{"class": "UnlistedRequirement", "name": "StringIO", "lineno": 2, "filename": "my_project.py"},
+			]
+
+	scanned = []
+	scan_bytes = dep_checker._scan_bytes
+
+	def counting_scan_bytes(content: bytes, *args, **kwargs):
+		scanned.append(content)
+		return scan_bytes(content, *args, **kwargs)
+
+	monkeypatch.setattr(dep_checker, "_scan_bytes", counting_scan_bytes)
+
+	results = DepChecker("my_project", ["click"]).check_python_versions(tmp_pathplus, ["3.13", "2.7"], errors_only=True)
+	assert len(scanned) == 1
+
+	assert {version: [r.name for r in version_results] for version, version_results in results.items()} == {
+			"3.13": ["StringIO", "distutils"],
+			"2.7": ["tomllib"],
+			}
+
+
+@pytest.mark.parametrize("python_version", ["3.1", "4.0", "three", ''])
+def test_dep_checker_python_version_unsupported(python_version: str):
+	with pytest.raises(ValueError, match=f"Unsupported Python version '{python_version}'. Supported versions are 2.7, "):
+		DepChecker("my_project", [], python_version=python_version)
+
+
+def test_process_pool():
+	# Workers are started from the pipeline's threads, so mustn't be forked from this process.
+	with dep_checker._process_pool(1) as executor:
+		assert executor._mp_context is not None
+		assert executor._mp_context.get_start_method() in {"forkserver", "spawn"}
+		assert executor.submit(dep_checker._scan_bytes, b"import click", {}).result()[1] == ([("click", 1)], set())
@@ -0,0 +1,164 @@
+# stdlib
+from typing import Dict, List, Sequence
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from dep_checker import DepChecker, PassingRequirement, UnusedRequirement, distributions
+from dep_checker.distributions import DistributionIndex
+
+
+def make_distribution(
+		site_packages: PathPlus,
+		dirname: str,
+		record: List[str],
+		top_level: Sequence[str] = (),
+		) -> None:
+	metadata_dir = site_packages / dirname
+	metadata_dir.maybe_make(parents=True)
+	(metadata_dir / "RECORD").write_lines(f"{filename},," for filename in record)
+
+	if top_level:
+		(metadata_dir / "top_level.txt").write_lines(top_level)
+
+	for filename in record:
+		if not filename.startswith(".."):
+			(site_packages / filename).parent.maybe_make(parents=True)
+			(site_packages / filename).touch()
+
+
+@pytest.fixture()
+def site_packages(tmp_pathplus: PathPlus) -> PathPlus:
+	site_packages = tmp_pathplus / "site-packages"
+
+	make_distribution(
+			site_packages,
+			"biopython-1.79.dist-info",
+			["Bio/__init__.py", "Bio/Seq.py", "BioSQL/__init__.py", "biopython-1.79.dist-info/RECORD"],
+			top_level=["Bio", "BioSQL"],
+			)
+	make_distribution(
+			site_packages,
+			"PyYAML-6.0.dist-info",
+			["yaml/__init__.py", "_yaml/__init__.py", "../../bin/yaml-tool"],
+			)
+	make_distribution(
+			site_packages,
+			"ruamel.yaml-0.17.21.dist-info",
+			["ruamel/yaml/__init__.py", "ruamel/yaml/main.py", "ruamel.yaml-0.17.21-py3.9-nspkg.pth"],
+			top_level=["ruamel"],
+			)
+	make_distribution(
+			site_packages,
+			"google_cloud_storage-2.0.dist-info",
+			["google/cloud/storage/__init__.py", "google/cloud/storage/__pycache__/blob.cpython-39.pyc"],
+			)
+	make_distribution(
+			site_packages,
+			"six-1.16.0.dist-info",
+			["six.py", "__pycache__/six.cpython-39.pyc"],
+			)
+	make_distribution(
+			site_packages,
+			"regex-2021.8.3.dist-info",
+			["regex/__init__.py", "regex/_regex.cpython-39-x86_64-linux-gnu.so"],
+			)
+
+	return site_packages
+
+
+def test_build(site_packages: PathPlus):
+	index = DistributionIndex.build([site_packages])
+
+	assert index.top_level == {
+			"biopython": ["Bio", "BioSQL"],
+			"pyyaml": ["_yaml", "yaml"],
+			"ruamel.yaml": ["ruamel.yaml"],
+			"google-cloud-storage": ["google.cloud.storage"],
+			"six": ["six"],
+			"regex": ["regex"],
+			}
+
+	assert index.import_names("PyYAML") == ["yaml", "_yaml"]
+	assert index.import_names("biopython") == ["Bio", "BioSQL"]
+	assert index.import_names("ruamel-yaml") == ["ruamel.yaml"]
+	assert index.import_names("google-cloud-storage") == ["google.cloud.storage"]
+	assert index.import_names("numpy") == []
+
+
+def test_build_first_path_wins(site_packages: PathPlus, tmp_pathplus: PathPlus):
+	user_site = tmp_pathplus / "user-site-packages"
+	make_distribution(user_site, "six-1.15.0.dist-info", ["six_renamed.py"])
+
+	assert DistributionIndex.build([user_site, site_packages]).top_level["six"] == ["six_renamed"]
+	assert DistributionIndex.build([site_packages, user_site]).top_level["six"] == ["six"]
+
+
+def test_load_cached(site_packages: PathPlus, tmp_pathplus: PathPlus, monkeypatch):
+	cache_dir = tmp_pathplus / "cache"
+	builds = []
+	build = DistributionIndex.build.__func__  # type: ignore[attr-defined]
+
+	def counting_build(cls, paths=None):
+		builds.append(paths)
+		return build(cls, paths)
+
+	monkeypatch.setattr(DistributionIndex, "build", classmethod(counting_build))
+
+	expected = DistributionIndex.build([site_packages]).top_level
+	builds.clear()
+
+	assert DistributionIndex.load(cache_dir, [site_packages]).top_level == expected
+	assert len(builds) == 1
+	assert len(list(cache_dir.glob("distributions-*.json"))) == 1
+
+	assert DistributionIndex.load(cache_dir, [site_packages]).top_level == expected
+	assert len(builds) == 1
+
+	# Installing a distribution changes the modification time of site-packages
+	make_distribution(site_packages, "numpy-1.21.0.dist-info", ["numpy/__init__.py"])
+	index = DistributionIndex.load(cache_dir, [site_packages])
+	assert len(builds) == 2
+	assert index.top_level["numpy"] == ["numpy"]
+
+
+def test_dep_checker_infer_mappings(site_packages: PathPlus, tmp_pathplus: PathPlus, monkeypatch):
+	monkeypatch.setattr(distributions, "get_site_packages", lambda: [str(site_packages)])
+
+	project = tmp_pathplus / "project"
+	project.mkdir()
+	(project / "my_project.py").write_lines([
+			"import Bio",
+			"import _yaml",
+			"import ruamel.yaml",
+			"import google.cloud.storage",
+			])
+
+	requirements = ["biopython", "PyYAML", "ruamel.yaml", "google-cloud-storage", "six"]
+	name_mapping: Dict[str, str] = {"six": "six_renamed"}
+
+	checker = DepChecker("my_project", requirements, name_mapping=name_mapping, infer_mappings=True)
+	assert dict(checker.namespace_packages) == {"ruamel": ["yaml"], "google.cloud": ["storage"]}
+
+	assert list(checker.check(project)) == [
+			PassingRequirement(name="Bio", filename="my_project.py", lineno=1),
+			PassingRequirement(name="google.cloud.storage", filename="my_project.py", lineno=4),
+			PassingRequirement(name="ruamel.yaml", filename="my_project.py", lineno=3),
+			UnusedRequirement(name="six_renamed"),
+			PassingRequirement(name="yaml", filename="my_project.py", lineno=2),
+			]
+
+
+def test_dep_checker_distribution_index(site_packages: PathPlus, monkeypatch):
+	index = DistributionIndex.build([site_packages])
+	monkeypatch.setattr(DistributionIndex, "load", None)
+
+	checker = DepChecker("my_project", ["biopython", "PyYAML"], infer_mappings=True, distribution_index=index)
+	assert checker.requirements == {"Bio", "yaml"}
+	assert checker._aliases == {"BioSQL": "Bio", "_yaml": "yaml"}
+
+	# Only used if inferring the mappings.
+	checker = DepChecker("my_project", ["biopython", "PyYAML"], distribution_index=index)
+	assert checker.requirements == {"biopython", "PyYAML"}
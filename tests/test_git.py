@@ -0,0 +1,134 @@
+# stdlib
+import os
+import subprocess
+import sys
+
+# 3rd party
+import pytest
+from consolekit.testing import CliRunner, Result
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from dep_checker import DepChecker, check_imports
+from dep_checker.__main__ import main
+from dep_checker.git import GitObjectStore
+from dep_checker.profiling import Profiler
+
+
+def git(repo: PathPlus, *args: str) -> None:
+	subprocess.run(
+			["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+			cwd=repo,
+			check=True,
+			stdout=subprocess.DEVNULL,
+			)
+
+
+@pytest.fixture()
+def git_repo(package_project: PathPlus) -> PathPlus:
+	(package_project / "my_project" / "utils.py").write_lines(["import numpy"])
+	(package_project / "my_project" / "data.txt").write_text("import spam")
+
+	git(package_project, "init", "-q")
+	git(package_project, "add", "-A")
+	git(package_project, "commit", "-q", "-m", "Initial commit")
+	git(package_project, "tag", "v1")
+
+	return package_project
+
+
+def test_git_object_store(git_repo: PathPlus):
+	with GitObjectStore(git_repo) as store:
+		files = dict(store.iter_files_to_check("v1", "my_project"))
+		assert sorted(files) == [PathPlus("my_project/__init__.py"), PathPlus("my_project/utils.py")]
+		assert store.read(files[PathPlus("my_project/utils.py")]) == b"import numpy\n"
+		assert store.read_file("v1", "my_project/utils.py") == b"import numpy\n"
+
+		with pytest.raises(FileNotFoundError):
+			store.read_file("v1", "my_project/missing.py")
+
+		with pytest.raises(FileNotFoundError, match="Can't find a package called 'missing' in 'v1'"):
+			list(store.iter_files_to_check("v1", "missing"))
+
+		with pytest.raises(ValueError):
+			store.resolve("not-a-rev")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Symlinks require elevated privileges on Windows")
+def test_git_object_store_symlinks(git_repo: PathPlus):
+	os.symlink("utils.py", git_repo / "my_project" / "linked.py")
+	git(git_repo, "add", "-A")
+	git(git_repo, "commit", "-q", "-m", "Add a symlink")
+
+	with GitObjectStore(git_repo) as store:
+		files = dict(store.iter_files_to_check("HEAD", "my_project"))
+		assert sorted(files) == [PathPlus("my_project/__init__.py"), PathPlus("my_project/utils.py")]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_dep_checker_check_rev(git_repo: PathPlus, jobs: int):
+	checker = DepChecker("my_project", ["numpy", "pandas", "click"], jobs=jobs)
+	expected = list(checker.check(git_repo))
+
+	# Changes to the working tree don't affect the result.
+	(git_repo / "my_project" / "utils.py").write_lines(["import click"])
+	(git_repo / "my_project" / "new.py").write_lines(["import attrs"])
+
+	assert list(checker.check_rev("v1", git_repo)) == expected
+	assert list(checker.check(git_repo)) != expected
+
+	git(git_repo, "add", "-A")
+	git(git_repo, "commit", "-q", "-m", "Update")
+
+	assert list(checker.check_rev("HEAD", git_repo)) == list(checker.check(git_repo))
+	assert list(checker.check_rev("v1", git_repo)) == expected
+
+
+def test_dep_checker_check_rev_stop_early(git_repo: PathPlus):
+	results = DepChecker("my_project", [], jobs=2).check_rev("v1", git_repo)
+	assert next(results)._asdict()["class"] == "UnlistedRequirement"
+
+	# Closing the generator cancels outstanding work and doesn't hang.
+	results.close()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_dep_checker_check_rev_profiler(git_repo: PathPlus, jobs: int):
+	expected = list(DepChecker("my_project", ["numpy", "pandas", "click"]).check_rev("v1", git_repo))
+
+	profiler = Profiler()
+	checker = DepChecker("my_project", ["numpy", "pandas", "click"], jobs=jobs, profiler=profiler)
+	assert list(checker.check_rev("v1", git_repo)) == expected
+
+	assert set(profiler.phases) == {"scan", "matching", "discovery", "read", "parse", "visit"}
+	assert profiler.counts["files"] == len(list(checker._iter_files_to_check(git_repo)))
+
+
+def test_cli_rev(git_repo: PathPlus):
+	with in_directory(git_repo):
+		runner = CliRunner()
+		expected: Result = runner.invoke(main, args=["my_project", "--no-colour", "--no-cache"])
+
+	(git_repo / "requirements.txt").write_lines(["numpy"])
+	(git_repo / "my_project" / "__init__.py").unlink()
+
+	with in_directory(git_repo):
+		result: Result = runner.invoke(main, args=["my_project", "--no-colour", "--rev", "v1"])
+
+	assert result.stdout == expected.stdout
+	assert result.exit_code == expected.exit_code == 1
+
+	with in_directory(git_repo):
+		result = runner.invoke(main, args=["my_project", "--no-colour", "--rev", "not-a-rev"])
+
+	assert result.exit_code == 1
+	assert "not-a-rev" in result.stdout
+
+
+def test_check_imports_invalid_rev(git_repo: PathPlus):
+	# Reported as an invalid revision, rather than as the requirements file being missing from it.
+	with pytest.raises(ValueError, match="Can't resolve the revision 'not-a-rev'"):
+		check_imports("my_project", work_dir=git_repo, rev="not-a-rev")
+
+	with pytest.raises(ValueError, match="Can't resolve the revision 'not-a-rev'"):
+		check_imports("my_project", work_dir=git_repo, rev="not-a-rev", req_source="pyproject")
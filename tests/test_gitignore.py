@@ -0,0 +1,87 @@
+# stdlib
+import subprocess
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from dep_checker.gitignore import GitIgnore, find_repository_root, translate_pattern
+
+
+@pytest.mark.parametrize(
+		"line",
+		['', "   ", "# a comment", '/', '!'],
+		)
+def test_translate_pattern_blank(line: str):
+	assert translate_pattern(line) is None
+
+
+@pytest.mark.parametrize(
+		"lines, path, is_dir, expected",
+		[
+				(["build"], "build", True, True),
+				(["build"], "src/build", True, True),
+				(["build"], "src/build", False, True),
+				(["build/"], "src/build", False, False),
+				(["build/"], "src/build", True, True),
+				(["/build"], "src/build", True, False),
+				(["/build"], "build", True, True),
+				(["src/build"], "src/build", True, True),
+				(["src/build"], "a/src/build", True, False),
+				(["*.py"], "src/foo.py", False, True),
+				(["src/*.py"], "src/sub/foo.py", False, False),
+				(["src/**/*.py"], "src/sub/deeper/foo.py", False, True),
+				(["src/**/*.py"], "src/foo.py", False, True),
+				(["**/gen"], "a/b/gen", True, True),
+				(["gen/**"], "gen/a/b.py", False, True),
+				(["foo?.py"], "foo1.py", False, True),
+				(["foo?.py"], "foo10.py", False, False),
+				(["foo[0-9].py"], "foo1.py", False, True),
+				(["foo[!0-9].py"], "foo1.py", False, False),
+				(["foo[!0-9].py"], "fooa.py", False, True),
+				(["\\#notes.py"], "#notes.py", False, True),
+				(["*.py", "!keep.py"], "keep.py", False, False),
+				(["*.py", "!keep.py"], "other.py", False, True),
+				(["!keep.py", "*.py"], "keep.py", False, True),
+				(["trailing.py   "], "trailing.py", False, True),
+				],
+		)
+def test_gitignore(lines, path: str, is_dir: bool, expected: bool):
+	assert GitIgnore().extend(lines).is_ignored(path, is_dir) is expected
+
+
+def test_gitignore_nested():
+	ignore = GitIgnore().extend(["*.pyc", "/generated"]).extend(["generated", "!important.py", "/local.py"], "src")
+
+	assert ignore.is_ignored("generated", is_dir=True)
+	assert ignore.is_ignored("src/generated", is_dir=True)
+	assert ignore.is_ignored("src/sub/generated", is_dir=True)
+	assert not ignore.is_ignored("lib/sub/generated", is_dir=True)
+	assert ignore.is_ignored("src/local.py")
+	assert not ignore.is_ignored("src/sub/local.py")
+	assert not ignore.is_ignored("local.py")
+	assert ignore.is_ignored("foo.pyc")
+
+	assert not GitIgnore()
+	assert not GitIgnore().is_ignored("foo.py")
+
+
+def test_for_directory(tmp_pathplus: PathPlus):
+	subprocess.run(["git", "init", "--quiet", str(tmp_pathplus)], check=True)
+	(tmp_pathplus / ".git" / "info").maybe_make(parents=True)
+	(tmp_pathplus / ".git" / "info" / "exclude").write_clean("excluded.py")
+	(tmp_pathplus / ".gitignore").write_clean("/root_only.py")
+	(tmp_pathplus / "src").mkdir()
+	(tmp_pathplus / "src" / ".gitignore").write_clean("src_only.py")
+	(tmp_pathplus / "src" / "pkg").mkdir()
+	(tmp_pathplus / "src" / "pkg" / ".gitignore").write_clean("not_loaded.py")
+
+	ignore, root = GitIgnore.for_directory(tmp_pathplus / "src" / "pkg")
+
+	assert root == tmp_pathplus
+	assert find_repository_root(tmp_pathplus / "src" / "pkg") == tmp_pathplus
+	assert ignore.is_ignored("src/pkg/excluded.py")
+	assert ignore.is_ignored("root_only.py")
+	assert ignore.is_ignored("src/pkg/src_only.py")
+	assert not ignore.is_ignored("src/pkg/not_loaded.py")
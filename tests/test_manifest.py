@@ -0,0 +1,169 @@
+# stdlib
+import json
+from typing import List
+
+# 3rd party
+import pytest
+from consolekit.testing import CliRunner, Result
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from dep_checker import DepChecker
+from dep_checker.__main__ import main
+from dep_checker.distributions import DistributionIndex
+from dep_checker.manifest import ManifestEntry, check_manifest, read_manifest
+
+
+@pytest.fixture()
+def monorepo(tmp_pathplus: PathPlus, imports: List[str], requirements: List[str]) -> PathPlus:
+	(tmp_pathplus / "packages" / "foo" / "foo").mkdir(parents=True)
+	(tmp_pathplus / "packages" / "foo" / "foo" / "__init__.py").write_lines(imports)
+	(tmp_pathplus / "packages" / "foo" / "requirements.txt").write_lines(requirements)
+
+	(tmp_pathplus / "packages" / "bar").mkdir(parents=True)
+	(tmp_pathplus / "packages" / "bar" / "bar.py").write_lines(["import click", "import foo", "import numpy"])
+	(tmp_pathplus / "packages" / "bar" / "reqs.txt").write_lines(["click", "foo"])
+
+	(tmp_pathplus / "manifest.txt").write_lines([
+			"# The packages to check",
+			"foo packages/foo",
+			'',
+			"bar packages/bar reqs.txt",
+			"foo packages/foo ../bar/reqs.txt",
+			])
+
+	return tmp_pathplus
+
+
+def test_read_manifest(monorepo: PathPlus):
+	assert read_manifest(monorepo / "manifest.txt") == [
+			ManifestEntry("foo", monorepo / "packages/foo", monorepo / "packages/foo/requirements.txt"),
+			ManifestEntry("bar", monorepo / "packages/bar", monorepo / "packages/bar/reqs.txt"),
+			ManifestEntry("foo", monorepo / "packages/foo", monorepo / "packages/bar/reqs.txt"),
+			]
+
+	(monorepo / "manifest.txt").write_lines(["foo packages/foo requirements.txt extra"])
+
+	with pytest.raises(ValueError, match="manifest.txt:1: expected at most 3 fields, got 4"):
+		read_manifest(monorepo / "manifest.txt")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_check_many(monorepo: PathPlus, requirements: List[str], jobs: int):
+	packages = [
+			(DepChecker("foo", requirements), monorepo / "packages/foo"),
+			(DepChecker("bar", ["click", "foo"]), monorepo / "packages/bar"),
+			(DepChecker("foo", ["click", "foo"]), monorepo / "packages/foo"),
+			]
+
+	expected = [list(checker.check(work_dir)) for checker, work_dir in packages]
+	assert DepChecker.check_many(packages, jobs=jobs) == expected
+
+	cache_dir = monorepo / ".dep_checker_cache"
+	assert DepChecker.check_many(packages, jobs=jobs, cache_dir=cache_dir) == expected
+	assert DepChecker.check_many(packages, jobs=jobs, cache_dir=cache_dir) == expected
+
+	# Each physical file is stored (and so parsed) once.
+	cache_files = list(cache_dir.glob("imports-*.json"))
+	assert len(cache_files) == 1
+	assert cache_files[0].load_json()["entries"].keys() == {
+			(monorepo / "packages/foo/foo/__init__.py").as_posix(),
+			(monorepo / "packages/bar/bar.py").as_posix(),
+			}
+
+
+def test_check_manifest_infer_mappings(monorepo: PathPlus, monkeypatch):
+	loaded = []
+	load = DistributionIndex.load
+
+	def counting_load(*args, **kwargs) -> DistributionIndex:
+		loaded.append(args)
+		return load(*args, **kwargs)
+
+	monkeypatch.setattr(DistributionIndex, "load", counting_load)
+
+	# The index is shared by every package rather than being loaded for each.
+	assert check_manifest(monorepo / "manifest.txt", colour=False, infer_mappings=True) == 1
+	assert loaded == [(None, )]
+
+
+def test_cli_manifest(monorepo: PathPlus):
+	with in_directory(monorepo):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["--manifest", "manifest.txt", "--no-colour", "--no-cache"])
+
+	assert result.exit_code == 1
+
+	sections = result.stdout.split("\n\n")
+	assert [section.splitlines()[0] for section in sections] == [
+			"foo (packages/foo)",
+			"bar (packages/bar)",
+			"foo (packages/foo)",
+			]
+
+	with in_directory(monorepo / "packages" / "bar"):
+		separate: Result = runner.invoke(main, args=["bar", "--req-file", "reqs.txt", "--no-colour", "--no-cache"])
+
+	assert sections[1].splitlines()[1:] == separate.stdout.splitlines()
+
+
+def test_cli_manifest_package_config(monorepo: PathPlus):
+	(monorepo / "tox.ini").write_lines(["[dep_checker]", "allowed_unused = numpy"])
+	(monorepo / "packages" / "bar" / "tox.ini").write_lines(["[dep_checker]", "allowed_unused = attrs"])
+	(monorepo / "packages" / "bar" / "reqs.txt").write_lines(["attrs", "click", "foo", "toml"])
+
+	with in_directory(monorepo):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["--manifest", "manifest.txt", "--no-colour", "--no-cache"])
+
+	sections = result.stdout.split("\n\n")
+
+	with in_directory(monorepo / "packages" / "bar"):
+		separate: Result = runner.invoke(main, args=["bar", "--req-file", "reqs.txt", "--no-colour", "--no-cache"])
+
+	assert sections[1].splitlines()[1:] == separate.stdout.splitlines()
+	assert "✘ toml never imported" in separate.stdout.splitlines()
+	assert "attrs" not in separate.stdout
+
+	# Packages without their own configuration use that from the manifest's directory.
+	assert sections[0].startswith("foo (packages/foo)")
+	assert "numpy never imported" not in sections[0]
+
+
+def test_cli_manifest_format(monorepo: PathPlus):
+	with in_directory(monorepo):
+		runner = CliRunner()
+		result: Result = runner.invoke(
+				main,
+				args=["--manifest", "manifest.txt", "--no-cache", "--format", "jsonl", "--errors-only"],
+				)
+
+	assert result.exit_code == 1
+	assert {"name": "numpy", "lineno": 3, "filename": "bar.py", "class": "UnlistedRequirement", "package": "bar"} in [
+			json.loads(line) for line in result.stdout.splitlines()
+			]
+
+	with in_directory(monorepo):
+		result = runner.invoke(main, args=["--manifest", "manifest.txt", "--no-cache", "--format", "sarif"])
+
+	assert result.exit_code == 1
+
+	results = json.loads(result.stdout)["runs"][0]["results"]
+	locations = {
+			(result["message"]["text"], result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"])
+			for result in results
+			}
+	assert ("numpy imported at bar.py:3 but not listed as a requirement", "packages/bar/bar.py") in locations
+	assert all(result["properties"]["package"] in {"foo", "bar"} for result in results)
+
+
+def test_cli_manifest_invalid(monorepo: PathPlus):
+	with in_directory(monorepo):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["foo", "--manifest", "manifest.txt"])
+		assert result.exit_code == 1
+		assert "--manifest cannot be used with PKG_NAME" in result.stdout
+
+		result = runner.invoke(main, args=[])
+		assert result.exit_code == 1
+		assert "Either PKG_NAME or --manifest is required." in result.stdout
@@ -0,0 +1,268 @@
+# stdlib
+import io
+import json
+from typing import List, Union
+
+# 3rd party
+import pytest
+from consolekit.testing import CliRunner, Result
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from dep_checker import (
+		PassingRequirement,
+		UnlistedRequirement,
+		UnusedRequirement,
+		__version__,
+		check_imports,
+		make_requirement_tuple
+		)
+from dep_checker.__main__ import main
+from dep_checker.output import SARIF_SCHEMA, SarifLog, write_jsonl
+
+RESULTS: List[Union[UnlistedRequirement, PassingRequirement, UnusedRequirement]] = [
+		PassingRequirement(name="click", lineno=1, filename="my_project/__init__.py"),
+		UnlistedRequirement(name="toml", lineno=3, filename="my_project/utils.py"),
+		UnusedRequirement(name="pytest"),
+		]
+
+
+@pytest.fixture()
+def project(tmp_pathplus: PathPlus) -> PathPlus:
+	(tmp_pathplus / "my_project").maybe_make()
+	(tmp_pathplus / "my_project" / "__init__.py").write_lines(["import click", "import os"])
+	(tmp_pathplus / "my_project" / "utils.py").write_lines(["import toml"])
+	(tmp_pathplus / "requirements.txt").write_lines(["click", "pytest"])
+	return tmp_pathplus
+
+
+def test_write_jsonl():
+	fp = io.BytesIO()
+	assert write_jsonl(RESULTS, fp) == 1
+
+	lines = fp.getvalue().decode("UTF-8").splitlines()
+	assert [make_requirement_tuple(json.loads(line)) for line in lines] == RESULTS
+	assert json.loads(lines[0]) == {
+			"name": "click",
+			"lineno": 1,
+			"filename": "my_project/__init__.py",
+			"class": "PassingRequirement",
+			}
+
+
+def test_write_jsonl_options():
+	fp = io.BytesIO()
+	assert write_jsonl(RESULTS, fp, fail_fast=True, properties={"python_version": "3.8"}) == 1
+
+	assert [json.loads(line) for line in fp.getvalue().splitlines()] == [
+			{
+					"name": "click",
+					"lineno": 1,
+					"filename": "my_project/__init__.py",
+					"class": "PassingRequirement",
+					"python_version": "3.8",
+					},
+			{
+					"name": "toml",
+					"lineno": 3,
+					"filename": "my_project/utils.py",
+					"class": "UnlistedRequirement",
+					"python_version": "3.8",
+					},
+			]
+
+	fp = io.BytesIO()
+	assert write_jsonl(RESULTS[:1], fp) == 0
+	assert write_jsonl([], fp) == 0
+
+
+def test_write_jsonl_streams():
+	# Each result is written before the next is produced.
+	fp = io.BytesIO()
+	written: List[int] = []
+
+	def results():
+		for item in RESULTS:
+			written.append(len(fp.getvalue().splitlines()))
+			yield item
+
+	write_jsonl(results(), fp)
+	assert written == [0, 1, 2]
+
+
+def test_sarif_log(tmp_pathplus: PathPlus):
+	sarif = SarifLog(tmp_pathplus)
+	ret = sarif.add_results(
+			RESULTS,
+			tmp_pathplus / "src",
+			tmp_pathplus / "requirements.txt",
+			properties={"python_version": "3.8"},
+			)
+	assert ret == 1
+
+	log = sarif.as_dict()
+	assert log["$schema"] == SARIF_SCHEMA
+	assert log["version"] == "2.1.0"
+
+	run, = log["runs"]
+	assert run["tool"]["driver"]["name"] == "dep_checker"
+	assert run["tool"]["driver"]["version"] == __version__
+	assert [rule["id"] for rule in run["tool"]["driver"]["rules"]] == ["unlisted-requirement", "unused-requirement"]
+	assert run["originalUriBaseIds"] == {"SRCROOT": {"uri": tmp_pathplus.as_uri() + '/'}}
+
+	assert run["results"] == [
+			{
+					"ruleId": "unlisted-requirement",
+					"ruleIndex": 0,
+					"level": "error",
+					"message": {"text": "toml imported at my_project/utils.py:3 but not listed as a requirement"},
+					"locations": [{
+							"physicalLocation": {
+									"artifactLocation": {"uri": "src/my_project/utils.py", "uriBaseId": "SRCROOT"},
+									"region": {"startLine": 3},
+									},
+							}],
+					"properties": {"python_version": "3.8"},
+					},
+			{
+					"ruleId": "unused-requirement",
+					"ruleIndex": 1,
+					"level": "warning",
+					"message": {"text": "pytest never imported"},
+					"locations": [{
+							"physicalLocation": {
+									"artifactLocation": {"uri": "requirements.txt", "uriBaseId": "SRCROOT"},
+									},
+							}],
+					"properties": {"python_version": "3.8"},
+					},
+			]
+
+	fp = io.BytesIO()
+	sarif.write(fp)
+	assert json.loads(fp.getvalue()) == log
+
+
+def test_sarif_log_outside_base(tmp_pathplus: PathPlus):
+	sarif = SarifLog(tmp_pathplus / "base")
+	assert sarif.add_results(RESULTS, tmp_pathplus, tmp_pathplus / "requirements.txt", fail_fast=True) == 1
+
+	result, = sarif.results
+	assert result["locations"][0]["physicalLocation"]["artifactLocation"] == {
+			"uri": (tmp_pathplus / "my_project" / "utils.py").as_uri(),
+			}
+	assert "properties" not in result
+
+	sarif = SarifLog(tmp_pathplus)
+	assert sarif.add_results(RESULTS[:1], tmp_pathplus, tmp_pathplus / "requirements.txt") == 0
+	assert sarif.results == []
+
+
+def test_check_imports_format_invalid(project: PathPlus):
+	with pytest.raises(ValueError, match="Unknown output format 'xml'"):
+		check_imports("my_project", work_dir=project, output_format="xml")
+
+	with pytest.raises(ValueError, match="'watch' can only be used with the 'text' output format."):
+		check_imports("my_project", work_dir=project, output_format="jsonl", watch=True)
+
+
+def test_cli_format_jsonl(project: PathPlus):
+	with in_directory(project):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["my_project", "--no-cache", "--format", "jsonl", "--colour"])
+
+	assert result.exit_code == 1
+	assert [json.loads(line) for line in result.stdout.splitlines()] == [
+			{"name": "toml", "lineno": 1, "filename": "my_project/utils.py", "class": "UnlistedRequirement"},
+			{"name": "click", "lineno": 1, "filename": "my_project/__init__.py", "class": "PassingRequirement"},
+			{"name": "pytest", "class": "UnusedRequirement"},
+			]
+
+	with in_directory(project):
+		result = runner.invoke(
+				main,
+				args=["my_project", "--no-cache", "--format", "jsonl", "--errors-only", "--fail-fast"],
+				)
+
+	assert result.exit_code == 1
+	assert [json.loads(line) for line in result.stdout.splitlines()] == [
+			{"name": "toml", "lineno": 1, "filename": "my_project/utils.py", "class": "UnlistedRequirement"},
+			]
+
+
+def test_cli_format_jsonl_python_versions(project: PathPlus):
+	(project / "my_project" / "utils.py").write_lines(["import tomllib", "import toml  # nodep"])
+
+	with in_directory(project):
+		runner = CliRunner()
+		result: Result = runner.invoke(
+				main,
+				args=[
+						"my_project",
+						"--no-cache",
+						"--format=jsonl",
+						"--errors-only",
+						"--python-version=3.10",
+						"--python-version=3.11",
+						],
+				)
+
+	assert result.exit_code == 1
+	assert [json.loads(line) for line in result.stdout.splitlines()] == [
+			{
+					"name": "tomllib",
+					"lineno": 1,
+					"filename": "my_project/utils.py",
+					"class": "UnlistedRequirement",
+					"python_version": "3.10",
+					},
+			{"name": "pytest", "class": "UnusedRequirement", "python_version": "3.10"},
+			{"name": "pytest", "class": "UnusedRequirement", "python_version": "3.11"},
+			]
+
+
+def test_cli_format_sarif(project: PathPlus):
+	with in_directory(project):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["my_project", "--no-cache", "--format", "sarif"])
+
+	assert result.exit_code == 1
+
+	log = json.loads(result.stdout)
+	assert [(result["ruleId"], result["message"]["text"]) for result in log["runs"][0]["results"]] == [
+			("unlisted-requirement", "toml imported at my_project/utils.py:1 but not listed as a requirement"),
+			("unused-requirement", "pytest never imported"),
+			]
+	assert log["runs"][0]["results"][1]["locations"][0]["physicalLocation"]["artifactLocation"] == {
+			"uri": "requirements.txt",
+			"uriBaseId": "SRCROOT",
+			}
+
+	(project / "requirements.txt").write_lines(["click", "toml"])
+
+	with in_directory(project):
+		result = runner.invoke(main, args=["my_project", "--no-cache", "--format", "sarif"])
+
+	assert result.exit_code == 0
+	assert json.loads(result.stdout)["runs"][0]["results"] == []
+
+
+def test_cli_format_sarif_req_source(project: PathPlus):
+	(project / "pyproject.toml").write_lines([
+			"[project]",
+			'name = "my-project"',
+			'dependencies = ["click", "toml", "attrs"]',
+			])
+
+	with in_directory(project):
+		runner = CliRunner()
+		result: Result = runner.invoke(
+				main,
+				args=["my_project", "--no-cache", "--format", "sarif", "--req-source", "pyproject"],
+				)
+
+	assert result.exit_code == 1
+
+	results = json.loads(result.stdout)["runs"][0]["results"]
+	assert [result["message"]["text"] for result in results] == ["attrs never imported"]
+	assert results[0]["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] == "pyproject.toml"
@@ -0,0 +1,91 @@
+# stdlib
+import random
+import threading
+import time
+from typing import Iterator, List
+
+# 3rd party
+import pytest
+
+# this package
+from dep_checker.pipeline import iter_pipelined
+
+
+def slow_square(value: int) -> int:
+	time.sleep(random.random() / 1000)
+	return value * value
+
+
+def test_iter_pipelined_order():
+	assert list(iter_pipelined(range(200), slow_square, workers=8)) == [(i, i * i) for i in range(200)]
+
+
+def test_iter_pipelined_empty():
+	assert list(iter_pipelined([], slow_square)) == []
+
+
+def test_iter_pipelined_bounded():
+	discovered = 0
+	lock = threading.Lock()
+
+	def items() -> Iterator[int]:
+		nonlocal discovered
+
+		for idx in range(100):
+			with lock:
+				discovered += 1
+			yield idx
+
+	consumed = 0
+	in_flight: List[int] = []
+
+	for _ in iter_pipelined(items(), slow_square, workers=4, max_in_flight=5):
+		consumed += 1
+		time.sleep(0.001)
+
+		with lock:
+			in_flight.append(discovered - consumed)
+
+	assert consumed == 100
+	# The discovery thread may hold one more item while it waits for a slot.
+	assert max(in_flight) <= 5 + 1
+
+
+def test_iter_pipelined_stage_error():
+	def stage(value: int) -> int:
+		if value == 5:
+			raise ValueError("Bad value")
+		return value
+
+	results = []
+
+	with pytest.raises(ValueError, match="Bad value"):
+		for item, _ in iter_pipelined(range(10), stage):
+			results.append(item)
+
+	# Items before the error are still yielded, in order.
+	assert results == [0, 1, 2, 3, 4]
+
+
+def test_iter_pipelined_discovery_error():
+	def items() -> Iterator[int]:
+		yield 1
+		raise FileNotFoundError("Missing")
+
+	results = []
+
+	with pytest.raises(FileNotFoundError, match="Missing"):
+		for item, _ in iter_pipelined(items(), slow_square):
+			results.append(item)
+
+	assert results == [1]
+
+
+def test_iter_pipelined_close():
+	threads_before = threading.active_count()
+
+	pipeline = iter_pipelined(iter(range(10_000)), slow_square, workers=4, max_in_flight=8)
+	assert next(pipeline) == (0, 0)
+	pipeline.close()
+
+	assert threading.active_count() == threads_before
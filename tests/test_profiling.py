@@ -0,0 +1,277 @@
+# stdlib
+import json
+import time
+
+# 3rd party
+import pytest
+from coincidence.regressions import AdvancedDataRegressionFixture
+from consolekit.testing import CliRunner, Result
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from dep_checker import DepChecker
+from dep_checker.__main__ import main
+from dep_checker.profiling import PHASES, SCAN_PHASES, FileMetrics, Profiler
+
+
+@pytest.fixture()
+def project(tmp_pathplus: PathPlus) -> PathPlus:
+	(tmp_pathplus / "my_project").maybe_make()
+	(tmp_pathplus / "my_project" / "__init__.py").write_lines(["import click", "import os"])
+	(tmp_pathplus / "my_project" / "cli.py").write_lines(["import click", "from sphinx import addnodes"])
+	(tmp_pathplus / "my_project" / "utils.py").write_lines(["import toml  # nodep"])
+	(tmp_pathplus / "requirements.txt").write_lines(["click", "sphinx", "pytest"])
+	return tmp_pathplus
+
+
+def test_profiler():
+	profiler = Profiler()
+
+	with profiler.phase("scan"):
+		time.sleep(0.01)
+
+	profiler.add("read", 0.5)
+	profiler.add("read", 0.25)
+	profiler.count("files")
+	profiler.count("files")
+	profiler.count("bytes_read", 1024)
+
+	assert profiler.phases["scan"] >= 0.01
+	assert profiler.phases["read"] == 0.75
+	assert profiler.counts == {"files": 2, "cached_files": 0, "bytes_read": 1024, "imports": 0}
+	assert profiler.files_per_second == 2 / profiler.phases["scan"]
+
+	data = profiler.as_dict()
+	assert list(data["phases"]) == ["scan", "read"]
+	assert data["files"] == 2
+	assert data["total"] >= profiler.phases["scan"]
+
+	table = profiler.format_table().splitlines()
+	assert table[0].split() == ["Phase", "Time", "Share"]
+	assert table[1].startswith("scan ")
+	assert table[2].startswith("  read ")
+	assert table[2].split()[1:3] == ["750.0", "ms"]
+	assert table[3].startswith("total ")
+	assert table[5].startswith("2 files (0 from the cache), 1.0 KiB read, 0 imports, ")
+
+
+def test_profiler_phase_exception():
+	profiler = Profiler()
+
+	with pytest.raises(ValueError, match="Oops"), profiler.phase("config"):
+		raise ValueError("Oops")
+
+	assert "config" in profiler.phases
+
+
+def test_profiler_iter_timed():
+	profiler = Profiler()
+
+	def slow():
+		time.sleep(0.01)
+		yield 1
+		time.sleep(0.01)
+		yield 2
+
+	assert list(profiler.iter_timed("discovery", slow())) == [1, 2]
+	assert profiler.phases["discovery"] >= 0.02
+
+
+def test_profiler_empty():
+	profiler = Profiler()
+
+	assert profiler.files_per_second == 0
+	assert profiler.as_dict()["phases"] == {}
+	assert "Times for the parts of the scan" not in profiler.format_table()
+
+
+def test_profiler_file_metrics(tmp_pathplus: PathPlus):
+	profiler = Profiler(record_files=True)
+
+	profiler.add("read", 0.5, PathPlus("my_project/big.py"))
+	profiler.add("parse", 1.5, "my_project/big.py")
+	profiler.count("bytes_read", 2048, "my_project/big.py")
+	profiler.count("imports", 3, "my_project/big.py")
+	profiler.add("cache", 0.25, "my_project/small.py")
+	profiler.count("cached_files", 1, "my_project/small.py")
+	profiler.add("read", 1.0)
+
+	assert profiler.phases == {"read": 1.5, "parse": 1.5, "cache": 0.25}
+	assert profiler.file_metrics() == [
+			FileMetrics("my_project/big.py", 2.0, 0.5, 1.5, 0.0, 0.0, size=2048, imports=3, cached=False),
+			FileMetrics("my_project/small.py", 0.25, 0.0, 0.0, 0.0, 0.25, size=0, imports=0, cached=True),
+			]
+
+	assert profiler.format_slowest(1).splitlines() == [
+			"      Time      Read     Parse     Visit       Size  Imports  File",
+			"   2.000 s  500.0 ms   1.500 s    0.0 ms    2.0 KiB        3  my_project/big.py",
+			]
+	assert profiler.format_slowest().splitlines()[-1].endswith("my_project/small.py (cached)")
+
+	profiler.write_file_metrics(tmp_pathplus / "metrics.csv")
+	assert (tmp_pathplus / "metrics.csv").read_lines() == [
+			"filename,time,read_time,parse_time,visit_time,cache_time,size,imports,cached",
+			"my_project/big.py,2.0,0.5,1.5,0.0,0.0,2048,3,False",
+			"my_project/small.py,0.25,0.0,0.0,0.0,0.25,0,0,True",
+			'',
+			]
+
+	profiler.write_file_metrics(tmp_pathplus / "metrics.json")
+	data = json.loads((tmp_pathplus / "metrics.json").read_text())
+	assert [FileMetrics(**file) for file in data] == profiler.file_metrics()
+
+
+def test_profiler_file_metrics_not_recording():
+	profiler = Profiler()
+	profiler.add("read", 0.5, "my_project/big.py")
+
+	with pytest.raises(ValueError, match="The profiler isn't recording the measurements for each file."):
+		profiler.file_metrics()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_dep_checker_profiler(project: PathPlus, jobs: int):
+	expected = list(DepChecker("my_project", ["click", "sphinx", "pytest"]).check(project))
+
+	profiler = Profiler()
+	checker = DepChecker("my_project", ["click", "sphinx", "pytest"], jobs=jobs, profiler=profiler)
+	assert list(checker.check(project)) == expected
+
+	assert set(profiler.phases) == {"scan", "matching", "discovery", "read", "parse", "visit"}
+	assert profiler.counts == {"files": 3, "cached_files": 0, "bytes_read": 85, "imports": 5}
+
+
+def test_dep_checker_profiler_cache(project: PathPlus):
+	cache_dir = project / ".cache"
+	requirements = ["click", "sphinx", "pytest"]
+
+	list(DepChecker("my_project", requirements, cache_dir=cache_dir, profiler=Profiler()).check(project))
+
+	(project / "my_project" / "utils.py").write_lines(["import toml"])
+
+	profiler = Profiler()
+	list(DepChecker("my_project", requirements, cache_dir=cache_dir, profiler=profiler).check(project))
+
+	assert "cache" in profiler.phases
+	assert profiler.counts == {"files": 3, "cached_files": 2, "bytes_read": 12, "imports": 5}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_dep_checker_file_metrics(project: PathPlus, jobs: int):
+	cache_dir = project / ".cache"
+	requirements = ["click", "sphinx", "pytest"]
+
+	profiler = Profiler(record_files=True)
+	list(DepChecker("my_project", requirements, cache_dir=cache_dir, jobs=jobs, profiler=profiler).check(project))
+
+	files = {file.filename: file for file in profiler.file_metrics()}
+	assert sorted(files) == ["my_project/__init__.py", "my_project/cli.py", "my_project/utils.py"]
+	assert [(files[name].size, files[name].imports, files[name].cached) for name in sorted(files)] == [
+			(23, 2, False),
+			(41, 2, False),
+			(21, 1, False),
+			]
+	assert all(file.parse_time > 0 for file in files.values())
+	assert sum(file.parse_time for file in files.values()) == pytest.approx(profiler.phases["parse"])
+
+	(project / "my_project" / "utils.py").write_lines(["import toml"])
+
+	profiler = Profiler(record_files=True)
+	list(DepChecker("my_project", requirements, cache_dir=cache_dir, jobs=jobs, profiler=profiler).check(project))
+
+	cached = {file.filename: file.cached for file in profiler.file_metrics()}
+	assert cached == {"my_project/__init__.py": True, "my_project/cli.py": True, "my_project/utils.py": False}
+
+
+def test_dep_checker_profiler_python_versions(project: PathPlus):
+	profiler = Profiler()
+	checker = DepChecker("my_project", ["click", "sphinx", "pytest"], profiler=profiler)
+	checker.check_python_versions(project, ["3.7", "3.9"])
+
+	assert {"scan", "matching"} <= set(profiler.phases)
+	assert profiler.counts["files"] == 3
+
+
+def test_check_imports_profiler_watch(project: PathPlus):
+	# this package
+	from dep_checker import check_imports
+
+	with pytest.raises(ValueError, match="'watch' and 'profiler' cannot be used together."):
+		check_imports("my_project", work_dir=project, watch=True, profiler=Profiler())
+
+
+def test_cli_profile(project: PathPlus):
+	with in_directory(project):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["my_project", "--no-colour", "--no-cache", "--profile"])
+
+	assert result.exit_code == 1
+	assert result.stdout.splitlines()[:3] == [
+			"✔ click imported at my_project/__init__.py:1",
+			"✘ pytest never imported",
+			"✔ sphinx imported at my_project/cli.py:2",
+			]
+
+	phases = [line.split()[0] for line in result.stderr.splitlines()[2:] if line.startswith(' ') or line[:1].isalpha()]
+	assert phases[:phases.index("total") + 1] == [*PHASES[:3], *SCAN_PHASES[:1], *SCAN_PHASES[2:], *PHASES[3:], "total"]
+	assert "3 files (0 from the cache), 85 B read, 5 imports, " in result.stderr
+
+
+def test_cli_profile_output(project: PathPlus, advanced_data_regression: AdvancedDataRegressionFixture):
+	with in_directory(project):
+		runner = CliRunner()
+		result: Result = runner.invoke(
+				main,
+				args=["my_project", "--no-colour", "--no-cache", "--profile-output", "profile.json"],
+				)
+
+	assert result.exit_code == 1
+	assert result.stderr == ''
+
+	data = json.loads((project / "profile.json").read_text())
+	assert set(data["phases"]) == {*PHASES, *SCAN_PHASES} - {"cache"}
+	assert data["total"] >= data["phases"]["scan"]
+	del data["phases"], data["total"], data["files_per_second"]
+	advanced_data_regression.check(data)
+
+
+@pytest.mark.parametrize("filename", ["metrics.csv", "metrics.json"])
+def test_cli_slowest(project: PathPlus, filename: str):
+	with in_directory(project):
+		runner = CliRunner()
+		result: Result = runner.invoke(
+				main,
+				args=["my_project", "--no-colour", "--no-cache", "--slowest", '2', "--file-metrics", filename],
+				)
+
+	assert result.exit_code == 1
+
+	table = result.stderr.splitlines()
+	assert table[0] == ''
+	assert table[1].split() == ["Time", "Read", "Parse", "Visit", "Size", "Imports", "File"]
+	assert len(table) == 4
+	assert "Phase" not in result.stderr
+
+	if filename.endswith(".csv"):
+		assert len((project / filename).read_lines()) == 5
+	else:
+		assert len(json.loads((project / filename).read_text())) == 3
+
+
+def test_cli_slowest_invalid(project: PathPlus):
+	with in_directory(project):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["my_project", "--slowest", '0'])
+
+	assert result.exit_code == 2
+
+
+@pytest.mark.parametrize("option", ["--profile", "--slowest=5", "--file-metrics=metrics.csv"])
+@pytest.mark.parametrize("unsupported", ["--watch", "--manifest=packages.toml"])
+def test_cli_profile_unsupported(project: PathPlus, option: str, unsupported: str):
+	with in_directory(project):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["my_project", option, unsupported])
+
+	assert result.exit_code == 1
+	assert "--profile, --slowest and --file-metrics cannot be used with --watch or --manifest." in result.stderr
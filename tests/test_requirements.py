@@ -0,0 +1,183 @@
+# stdlib
+import os
+from operator import attrgetter
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+from shippinglabel.requirements import read_requirements
+
+# this package
+from dep_checker import requirements
+from dep_checker.requirements import (
+		clear_cache,
+		normalize_name,
+		parse_req_source,
+		parse_requirement_names,
+		pyproject_requirement_names,
+		read_full_requirements,
+		read_requirement_names
+		)
+
+
+@pytest.mark.parametrize(
+		"name, expected",
+		[
+				("foo", "foo"),
+				("Foo.Bar", "foo-bar"),
+				("foo__bar-_.baz", "foo-bar-baz"),
+				("ruamel.yaml", "ruamel.yaml"),
+				("ruamel_yaml", "ruamel.yaml"),
+				("PyYAML", "pyyaml"),
+				],
+		)
+def test_normalize_name(name: str, expected: str):
+	assert normalize_name(name) == expected
+
+
+def test_parse_requirement_names():
+	lines = [
+			"# A comment",
+			"Foo.Bar>=1.0",
+			"ruamel-yaml",
+			"PyYAML ; python_version < '3.8'",
+			"bar[extra]==1  # inline comment",
+			"baz @ https://example.com/baz.tar.gz",
+			"qux \\",
+			"    >=1.0",
+			"a_b(>=1)",
+			"-r other.txt",
+			"-e .",
+			"--index-url https://example.com",
+			'',
+			"foo-bar",
+			]
+
+	assert parse_requirement_names(lines) == ["foo-bar", "ruamel.yaml", "pyyaml", "bar", "baz", "qux", "a-b"]
+
+
+def test_parse_requirement_names_invalid():
+	with pytest.warns(UserWarning, match="Ignored invalid requirement 'git\\+https://example.com/foo.git'"):
+		assert parse_requirement_names(["git+https://example.com/foo.git", "foo"]) == ["foo"]
+
+
+def test_read_requirement_names_matches_shippinglabel(tmp_pathplus: PathPlus):
+	req_file = tmp_pathplus / "requirements.txt"
+	req_file.write_lines([
+			"# A comment",
+			"Foo.Bar>=1.0",
+			"ruamel-yaml",
+			"PyYAML ; python_version < '3.8'",
+			"baz @ https://example.com/baz.tar.gz",
+			"domdf-python-tools>=2.0.0",
+			])
+
+	expected = sorted(map(attrgetter("name"), read_requirements(req_file)[0]))
+	assert sorted(read_requirement_names(req_file)) == expected
+
+
+def test_read_requirement_names_includes(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "sub").mkdir()
+	(tmp_pathplus / "requirements.txt").write_lines([
+			"foo",
+			"-r sub/base.txt",
+			"--requirement=requirements.txt",
+			"-c constraints.txt",
+			])
+	(tmp_pathplus / "sub" / "base.txt").write_lines(["bar", "-r../requirements.txt", "-r ./more.txt"])
+	(tmp_pathplus / "sub" / "more.txt").write_lines(["baz", "foo"])
+	(tmp_pathplus / "constraints.txt").write_lines(["pinned==1.0", "foo==2.0"])
+
+	assert read_requirement_names(tmp_pathplus / "requirements.txt") == ["foo", "bar", "baz"]
+	assert read_requirement_names(
+			tmp_pathplus / "requirements.txt",
+			include_constraints=True,
+			) == ["foo", "bar", "baz", "pinned"]
+
+	full = read_full_requirements(tmp_pathplus / "requirements.txt")
+	assert sorted(map(str, full)) == ["bar", "baz", "foo"]
+
+	(tmp_pathplus / "sub" / "more.txt").unlink()
+
+	with pytest.raises(FileNotFoundError):
+		read_requirement_names(tmp_pathplus / "requirements.txt")
+
+
+def test_read_requirement_names_cache(tmp_pathplus: PathPlus, monkeypatch):
+	clear_cache()
+
+	parsed = []
+	parse = requirements._parse
+
+	def counting_parse(lines):
+		lines = list(lines)
+		parsed.append(lines)
+		return parse(lines)
+
+	monkeypatch.setattr(requirements, "_parse", counting_parse)
+
+	req_file = tmp_pathplus / "requirements.txt"
+	req_file.write_lines(["foo", "-r other.txt"])
+	(tmp_pathplus / "other.txt").write_lines(["bar"])
+
+	assert read_requirement_names(req_file) == ["foo", "bar"]
+	assert read_requirement_names(req_file) == ["foo", "bar"]
+	assert len(parsed) == 2
+
+	# Only the changed file is parsed again
+	(tmp_pathplus / "other.txt").write_lines(["baz"])
+	os.utime(tmp_pathplus / "other.txt", ns=(0, 0))
+	assert read_requirement_names(req_file) == ["foo", "baz"]
+	assert len(parsed) == 3
+
+	clear_cache()
+	assert read_requirement_names(req_file) == ["foo", "baz"]
+	assert len(parsed) == 5
+
+
+@pytest.mark.parametrize(
+		"req_source, expected",
+		[
+				("pyproject", []),
+				("pyproject:", []),
+				("pyproject:docs", ["docs"]),
+				("pyproject:docs, testing", ["docs", "testing"]),
+				],
+		)
+def test_parse_req_source(req_source: str, expected):
+	assert parse_req_source(req_source) == expected
+
+
+@pytest.mark.parametrize("req_source", ["requirements.txt", "setup.cfg:docs", ''])
+def test_parse_req_source_invalid(req_source: str):
+	with pytest.raises(ValueError, match="Unsupported requirements source"):
+		parse_req_source(req_source)
+
+
+def test_pyproject_requirement_names():
+	document = {
+			"project": {
+					"name": "my-project",
+					"dependencies": ["click>=7", "Foo.Bar[baz]; python_version < '3.8'"],
+					"optional-dependencies": {"docs": ["sphinx", "click"], "Type_Checking": ["mypy"]},
+					},
+			}
+
+	assert pyproject_requirement_names(document) == ["click", "foo-bar"]
+	assert pyproject_requirement_names(document, ["docs"]) == ["click", "foo-bar", "sphinx"]
+	assert pyproject_requirement_names(document, ["type-checking"]) == ["click", "foo-bar", "mypy"]
+	assert pyproject_requirement_names({"project": {"name": "my-project"}}) == []
+
+	with pytest.raises(ValueError, match="Unknown extra 'testing' in pyproject.toml."):
+		pyproject_requirement_names(document, ["testing"])
+
+
+def test_pyproject_requirement_names_invalid():
+	with pytest.raises(ValueError, match=r"pyproject.toml has no \[project\] table."):
+		pyproject_requirement_names({"tool": {}})
+
+	with pytest.raises(ValueError, match="The dependencies in pyproject.toml are dynamic"):
+		pyproject_requirement_names({"project": {"dynamic": ["dependencies"]}})
+
+	with pytest.raises(ValueError, match="The optional dependencies in pyproject.toml are dynamic"):
+		pyproject_requirement_names({"project": {"dynamic": ["optional-dependencies"]}}, ["docs"])
@@ -0,0 +1,91 @@
+# stdlib
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+# 3rd party
+import pytest
+
+# Modules which are slow to import, and so should only be imported when needed.
+HEAVY_MODULES = [
+		"astatine",
+		"concurrent.futures.process",
+		"configconfig",
+		"dom_toml",
+		"domdf_python_tools.paths",
+		"jsonschema",
+		"shippinglabel",
+		"dep_checker.config",
+		"dep_checker.git",
+		"dep_checker.manifest",
+		"dep_checker.watch",
+		]
+
+# The maximum cumulative time, in milliseconds, to import the package.
+# Wall-clock timings depend on the machine and what else it's running, so this is only checked when set,
+# e.g. when benchmarking. It takes about 40ms with the bytecode cached (and 60ms without).
+IMPORT_BUDGET = os.environ.get("DEP_CHECKER_IMPORT_BUDGET")
+
+
+def importtime(*args: str) -> Dict[str, int]:
+	"""
+	Run Python with ``-X importtime`` and the given arguments,
+	and return a mapping of imported modules to their cumulative import time in microseconds.
+	"""  # noqa: D400
+
+	process = subprocess.run(
+			[sys.executable, "-X", "importtime", *args],
+			stdout=subprocess.DEVNULL,
+			stderr=subprocess.PIPE,
+			universal_newlines=True,
+			check=True,
+			)
+
+	times = {}
+
+	for line in process.stderr.splitlines():
+		if not line.startswith("import time:"):
+			continue
+
+		_, cumulative, name = line[len("import time:"):].split('|')
+		try:
+			times[name.strip()] = int(cumulative)
+		except ValueError:  # The header
+			continue
+
+	return times
+
+
+@pytest.mark.parametrize(
+		"args",
+		[
+				pytest.param(["-c", "import dep_checker"], id="import"),
+				pytest.param(["-m", "dep_checker", "--help"], id="cli_help"),
+				],
+		)
+def test_heavy_modules_not_imported(args: List[str]):
+	times = importtime(*args)
+
+	assert "dep_checker" in times
+	assert [module for module in HEAVY_MODULES if module in times] == []
+
+
+@pytest.mark.skipif(not IMPORT_BUDGET, reason="Set DEP_CHECKER_IMPORT_BUDGET (in ms) to check the import time")
+def test_import_time_budget():
+	# The fastest of a few runs, to reduce noise from other processes.
+	best = min(importtime("-c", "import dep_checker")["dep_checker"] for _ in range(3))
+	assert best / 1000 < float(IMPORT_BUDGET or 0), f"Importing dep_checker took {best / 1000:.1f}ms"
+
+
+def test_lazy_attributes():
+	# this package
+	import dep_checker
+	from dep_checker.config import AllowedUnused, ConfigReader
+
+	assert dep_checker.AllowedUnused is AllowedUnused
+	assert isinstance(dep_checker.reader, ConfigReader)
+	assert dep_checker.reader is dep_checker.reader
+
+	with pytest.raises(AttributeError, match="has no attribute 'foo'"):
+		dep_checker.foo  # noqa: B018  # pylint: disable=pointless-statement
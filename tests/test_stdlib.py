@@ -0,0 +1,68 @@
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from dep_checker._stdlib_list import stdlib
+from dep_checker.stdlib import get_stdlib, parse_python_version, supported_versions
+
+
+def test_supported_versions():
+	versions = supported_versions()
+	assert versions[0] == "2.7"
+	assert versions == sorted(versions, key=lambda v: tuple(map(int, v.split('.'))))
+	assert {"3.7", "3.8", "3.9", "3.10", "3.11", "3.12", "3.13", "3.14"} <= set(versions)
+
+
+@pytest.mark.parametrize(
+		"version, present, absent",
+		[
+				("2.7", ["StringIO", "urllib2", "os", "_winreg", "msvcrt", "test"], ["tomllib", "asyncio", "winreg"]),
+				("3.8", ["asyncio", "distutils", "winreg", "msvcrt", "test"], ["tomllib", "StringIO", "zoneinfo", "_winreg"]),
+				("3.9", ["zoneinfo", "graphlib"], ["tomllib"]),
+				("3.11", ["tomllib", "distutils"], []),
+				("3.12", ["tomllib"], ["distutils", "imp", "asyncore"]),
+				("3.13", ["tomllib", "test"], ["cgi", "telnetlib", "distutils"]),
+				("3.14", ["annotationlib", "compression", "tomllib", "test"], ["_compression", "cgi"]),
+				],
+		)
+def test_get_stdlib(version: str, present, absent):
+	modules = get_stdlib(version)
+
+	for name in present:
+		assert name in modules
+
+	for name in absent:
+		assert name not in modules
+
+	assert modules <= get_stdlib()
+
+
+def test_get_stdlib_merged():
+	assert get_stdlib() == frozenset(stdlib)
+	assert get_stdlib() is get_stdlib(None)
+
+	# Only used to test CPython itself.
+	assert "xxsubtype" not in get_stdlib()
+	assert "xxsubtype" not in get_stdlib("3.11")
+
+
+def test_get_stdlib_previous_names():
+	# The modules listed by dep_checker 0.9.0, before the tables were generated per version.
+	# Dropping any of these would report imports of them as unlisted requirements.
+	previous = (PathPlus(__file__).parent / "test_stdlib_" / "stdlib_0.9.0.txt").read_lines()
+	assert set(filter(None, previous)) <= get_stdlib(None)
+
+
+@pytest.mark.parametrize(
+		"version, expected",
+		[("3.8", "3.8"), ("3.8.10", "3.8"), (" 3.10 ", "3.10")],
+		)
+def test_parse_python_version(version: str, expected: str):
+	assert parse_python_version(version) == expected
+
+
+@pytest.mark.parametrize("version", ["3", "3.8.10.1", "3.5", "3.x", "99.0"])
+def test_parse_python_version_unsupported(version: str):
+	with pytest.raises(ValueError, match="Unsupported Python version"):
+		parse_python_version(version)
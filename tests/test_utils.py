@@ -1,11 +1,25 @@
 # stdlib
 import ast
+import os
+import shutil
+import subprocess
+import sys
+from typing import List, Tuple
 
 # 3rd party
 import pytest
+from domdf_python_tools.paths import PathPlus
 
 # this package
-from dep_checker.utils import is_suppress_importerror
+from dep_checker import nodep_lines
+from dep_checker.utils import (
+		NamespaceTrie,
+		PathMatcher,
+		Visitor,
+		_entry_key,
+		is_suppress_importerror,
+		iter_python_files
+		)
 
 
 @pytest.mark.parametrize(
@@ -31,3 +45,215 @@ from dep_checker.utils import is_suppress_importerror
 def test_is_suppress_importerror(source: str, expected: bool):
 	node = ast.parse(source).body[0]
 	assert is_suppress_importerror(node) is expected  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+		"source, expected",
+		[
+				("import foo\nimport os\nimport my_project.bar", [("foo", 1)]),
+				("def f():\n\tclass A:\n\t\timport foo", [("foo", 3)]),
+				("if TYPE_CHECKING:\n\timport foo\nelse:\n\timport bar", []),
+				("try:\n\timport foo\nexcept ImportError:\n\tpass", []),
+				("try:\n\timport foo\nexcept TypeError:\n\tpass\nexcept ValueError:\n\tpass", [("foo", 2), ("foo", 2)]),
+				("with suppress(ImportError):\n\timport foo", []),
+				("for x in y:\n\tpass\nelse:\n\timport foo", [("foo", 4)]),
+				("x = [lambda: 0 for _ in range(10)]\nimport foo", [("foo", 2)]),
+				],
+		)
+def test_visitor_iter_imports(source: str, expected: List[Tuple[str, int]]):
+	visitor = Visitor("my_project")
+	imports = visitor.iter_imports(ast.parse(source))
+	assert not isinstance(imports, list)
+	assert list(imports) == expected
+	assert visitor.import_sources == []
+
+
+def test_visitor_reuse():
+	visitor = Visitor("my_project", {"ruamel": ["yaml"]})
+	assert list(visitor.iter_source_import_spans("import ruamel.yaml")) == [("ruamel.yaml", 1, 1)]
+	assert list(visitor.iter_source_import_spans("\nimport ruamel.foo")) == [("ruamel", 2, 2)]
+	assert list(visitor.iter_source_import_spans(b"import os")) == []
+	assert visitor.import_sources == []
+
+	assert visitor.visit(ast.parse("import foo")) == [("foo", 1)]
+	assert visitor.visit(ast.parse("import bar")) == [("foo", 1), ("bar", 1)]
+
+
+def test_nodep_lines():
+	assert nodep_lines('') == set()
+	assert nodep_lines("import foo\nimport bar  # nodep\n\nimport baz #nodep\n") == {2, 4}
+	assert nodep_lines("# nodep\nimport foo  # nodep  # nodep") == {1, 2}
+	assert nodep_lines(b"import foo\nimport bar  # nodep\n\nimport baz #nodep\n") == {2, 4}
+
+
+@pytest.mark.parametrize(
+		"name, expected",
+		[
+				("foo", "foo"),
+				("foo.bar", "foo"),
+				("ruamel.yaml", "ruamel.yaml"),
+				("ruamel.yaml.comments", "ruamel.yaml"),
+				("ruamel", "ruamel"),
+				("ruamel.other", "ruamel"),
+				("google.cloud.storage.blob", "google.cloud.storage"),
+				("google.cloud.bigquery", "google.cloud"),
+				("google.cloud", "google.cloud"),
+				("google.protobuf", "google"),
+				],
+		)
+def test_namespace_trie(name: str, expected: str):
+	trie = NamespaceTrie(["ruamel.yaml", "google.cloud", "google.cloud.storage"])
+	assert trie.resolve(name) == expected
+
+
+def test_visitor_resolve_name():
+	visitor = Visitor("my_project", {"google.cloud": ["storage"], "ruamel": ["yaml"]})
+
+	assert visitor.resolve_name("google.cloud.storage.blob") == "google.cloud.storage"
+	assert visitor.resolve_name("google.protobuf") == "google"
+	assert visitor.resolve_name("ruamel.yaml") == "ruamel.yaml"
+	assert visitor.resolve_name("os.path") is None
+	assert visitor.resolve_name("my_project.utils") is None
+
+	assert Visitor("my_project", stdlib=()).resolve_name("os.path") == "os"
+
+
+def test_path_matcher():
+	matcher = PathMatcher(["build", "my_project/_vendor/", "*.pyi", "tests/test_*"])
+
+	assert matcher("my_project/build", "build")
+	assert matcher("my_project/_vendor", "_vendor")
+	assert not matcher("my_project/sub/_vendor", "_vendor")
+	assert matcher("my_project/stubs.pyi", "stubs.pyi")
+	assert matcher("tests/test_foo.py", "test_foo.py")
+	assert not matcher("my_project/builder.py", "builder.py")
+
+	assert matcher.match_any_parent("my_project/build/lib/foo.py")
+	assert not matcher.match_any_parent("my_project/lib/foo.py")
+
+	assert not PathMatcher([])("my_project", "my_project")
+
+
+def test_iter_python_files(tmp_pathplus: PathPlus):
+	package = tmp_pathplus / "my_project"
+
+	for filename in [
+			"__init__.py",
+			"b.py",
+			"a.py",
+			"notes.txt",
+			"sub/__init__.py",
+			"sub/node_modules/foo.py",
+			"sub/__pycache__/foo.py",
+			"sub/.venv/lib/foo.py",
+			"sub/venv/lib/foo.py",
+			"build/foo.py",
+			"_vendor/foo.py",
+			"_vendored.py",
+			]:
+		(package / filename).parent.maybe_make(parents=True)
+		(package / filename).write_clean("import foo")
+
+	assert list(iter_python_files(tmp_pathplus, "my_project")) == [
+			"my_project/__init__.py",
+			"my_project/_vendored.py",
+			"my_project/a.py",
+			"my_project/b.py",
+			"my_project/_vendor/foo.py",
+			"my_project/build/foo.py",
+			"my_project/sub/__init__.py",
+			]
+
+	assert list(iter_python_files(tmp_pathplus, "my_project", exclude=["build", "my_project/_vendor"])) == [
+			"my_project/__init__.py",
+			"my_project/_vendored.py",
+			"my_project/a.py",
+			"my_project/b.py",
+			"my_project/sub/__init__.py",
+			]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Symlinks require elevated privileges on Windows")
+def test_iter_python_files_symlinks(tmp_pathplus: PathPlus):
+	package = tmp_pathplus / "my_project"
+	(package / "sub").mkdir(parents=True)
+	(package / "a.py").write_clean("import foo")
+	(package / "sub" / "b.py").write_clean("import bar")
+
+	os.symlink(package / "a.py", package / "z.py")
+	os.symlink(package / "sub", package / "linked")
+	os.symlink(package, package / "sub" / "loop")
+	os.symlink(package / "missing.py", package / "broken.py")
+
+	assert list(iter_python_files(tmp_pathplus, "my_project")) == [
+			"my_project/a.py",
+			"my_project/linked/b.py",
+			]
+
+
+class FakeDirEntry:
+
+	def __init__(self, is_dir: bool, st_dev: int, st_ino: int):
+		self._is_dir = is_dir
+		self._stat = os.stat_result((0, st_ino, st_dev, 0, 0, 0, 0, 0, 0, 0))
+
+	def is_symlink(self) -> bool:
+		return False
+
+	def is_dir(self, follow_symlinks: bool = True) -> bool:
+		return self._is_dir
+
+	def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+		return self._stat
+
+	def inode(self) -> int:
+		return self._stat.st_ino
+
+
+def test_entry_key():
+	# A directory may be a mount point, on a different device to its parent,
+	# so files with the same inode on either side of it aren't mistaken for each other.
+	assert _entry_key(FakeDirEntry(True, st_dev=2, st_ino=5), 1) == (2, 5)  # type: ignore[arg-type]
+	assert _entry_key(FakeDirEntry(False, st_dev=2, st_ino=5), 1) == (1, 5)  # type: ignore[arg-type]
+
+
+def test_iter_python_files_gitignore(tmp_pathplus: PathPlus):
+	subprocess.run(["git", "init", "--quiet", str(tmp_pathplus)], check=True)
+	(tmp_pathplus / ".gitignore").write_lines(["generated/", "*_pb2.py"])
+
+	package = tmp_pathplus / "src" / "my_project"
+
+	for filename in [
+			"__init__.py",
+			"a_pb2.py",
+			"generated/foo.py",
+			"sub/__init__.py",
+			"sub/local.py",
+			"sub/keep_pb2.py",
+			"sub/other/local.py",
+			]:
+		(package / filename).parent.maybe_make(parents=True)
+		(package / filename).write_clean("import foo")
+
+	(package / "sub" / ".gitignore").write_lines(["/local.py", "!keep_pb2.py"])
+
+	assert list(iter_python_files(tmp_pathplus / "src", "my_project")) == [
+			"my_project/__init__.py",
+			"my_project/a_pb2.py",
+			"my_project/generated/foo.py",
+			"my_project/sub/__init__.py",
+			"my_project/sub/keep_pb2.py",
+			"my_project/sub/local.py",
+			"my_project/sub/other/local.py",
+			]
+
+	assert list(iter_python_files(tmp_pathplus / "src", "my_project", respect_gitignore=True)) == [
+			"my_project/__init__.py",
+			"my_project/sub/__init__.py",
+			"my_project/sub/keep_pb2.py",
+			"my_project/sub/other/local.py",
+			]
+
+	# Outside of a git repository there is nothing to respect
+	shutil.rmtree(tmp_pathplus / ".git")
+	assert len(list(iter_python_files(tmp_pathplus / "src", "my_project", respect_gitignore=True))) == 7
@@ -0,0 +1,163 @@
+# stdlib
+import os
+from typing import Dict, List
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from dep_checker import DepChecker, PassingRequirement, UnusedRequirement, distributions
+from dep_checker.cache import ScanResult
+from dep_checker.watch import ImportIndex, Watcher
+
+
+def touch(filename: PathPlus) -> None:
+	# Ensure the mtime changes even on filesystems with coarse timestamps.
+	stat = filename.stat()
+	os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_watcher(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "my_project").mkdir()
+	(tmp_pathplus / "my_project" / "__init__.py").write_lines(["import click", "import numpy"])
+	(tmp_pathplus / "my_project" / "utils.py").write_lines(["import os", "import pandas"])
+
+	checker = DepChecker("my_project", ["click", "attrs"])
+	watcher = Watcher(checker, tmp_pathplus, interval=0)
+
+	results = watcher.scan()
+	assert results == list(checker.check(tmp_pathplus))
+	assert len(watcher.last_scanned) == 2
+
+	# Nothing changed
+	assert not watcher.poll()
+	assert watcher.last_scanned == []
+
+	utils = tmp_pathplus / "my_project" / "utils.py"
+	utils.write_lines(["import attrs", "import pandas  # nodep", "import requests"])
+	touch(utils)
+
+	assert watcher.poll()
+	assert watcher.last_scanned == [PathPlus("my_project/utils.py")]
+	assert watcher.index.results() == list(checker.check(tmp_pathplus))
+
+	# New file
+	(tmp_pathplus / "my_project" / "extra.py").write_lines(["import toml"])
+	assert watcher.poll()
+	assert watcher.last_scanned == [PathPlus("my_project/extra.py")]
+	assert watcher.index.results() == list(checker.check(tmp_pathplus))
+
+	# Deleted files
+	(tmp_pathplus / "my_project" / "extra.py").unlink()
+	utils.unlink()
+	assert watcher.poll()
+	assert watcher.last_scanned == []
+	assert watcher.index.results() == list(checker.check(tmp_pathplus))
+
+
+def test_watcher_syntax_error(tmp_pathplus: PathPlus):
+	source_file = tmp_pathplus / "my_project.py"
+	source_file.write_lines(["import click"])
+
+	watcher = Watcher(DepChecker("my_project", ["click"]), tmp_pathplus)
+	expected = watcher.scan()
+
+	# A half-written file keeps its previous results.
+	source_file.write_lines(["import click", "def foo("])
+	touch(source_file)
+	assert not watcher.poll()
+	assert watcher.index.results() == expected
+
+
+def test_watcher_watch(tmp_pathplus: PathPlus):
+	source_file = tmp_pathplus / "my_project.py"
+	source_file.write_lines(["import click"])
+
+	watcher = Watcher(DepChecker("my_project", ["click"]), tmp_pathplus, interval=0)
+	seen: List[List[str]] = []
+
+	for results in watcher.watch():
+		seen.append([type(result).__name__ for result in results])
+
+		if len(seen) == 2:
+			break
+
+		source_file.write_lines(["import numpy"])
+		touch(source_file)
+
+	assert seen == [["PassingRequirement"], ["UnlistedRequirement", "UnusedRequirement"]]
+
+
+def test_watcher_infer_mappings(tmp_pathplus: PathPlus, monkeypatch):
+	site_packages = tmp_pathplus / "site-packages"
+	(site_packages / "setuptools-58.0.0.dist-info").maybe_make(parents=True)
+	(site_packages / "setuptools-58.0.0.dist-info" / "RECORD").write_lines([
+			"setuptools/__init__.py,,",
+			"pkg_resources/__init__.py,,",
+			])
+	monkeypatch.setattr(distributions, "get_site_packages", lambda: [str(site_packages)])
+
+	project = tmp_pathplus / "project"
+	project.mkdir()
+	source_file = project / "my_project.py"
+	source_file.write_lines(["import click"])
+
+	checker = DepChecker("my_project", ["click", "setuptools"], infer_mappings=True)
+	watcher = Watcher(checker, project, interval=0)
+	assert watcher.scan() == list(checker.check(project))
+
+	source_file.write_lines(["import click", "import pkg_resources"])
+	touch(source_file)
+
+	assert watcher.poll()
+	assert watcher.index.results() == list(checker.check(project)) == [
+			PassingRequirement(name="click", lineno=1, filename="my_project.py"),
+			PassingRequirement(name="setuptools", lineno=2, filename="my_project.py"),
+			]
+
+
+def test_import_index(monkeypatch):
+	checker = DepChecker("my_project", ["click", "attrs", "setuptools"], name_mapping={"setuptools": "pkg_resources"})
+	index = ImportIndex(checker)
+
+	# Updates only match the changed file's imports, rather than rechecking every file.
+	monkeypatch.setattr(checker, "_check_scanned_files", None)
+
+	files: Dict[PathPlus, ScanResult] = {
+			PathPlus("a.py"): ([("click", 3), ("numpy", 4), ("os", 5)], set()),
+			PathPlus("b.py"): ([("attrs", 1), ("click", 1), ("pandas", 2)], {2}),
+			PathPlus("c.py"): ([("pkg_resources", 7), ("toml", 8), ("my_project", 9)], set()),
+			}
+
+	def expected() -> List[object]:
+		return list(DepChecker._check_scanned_files(checker, index.files.items()))
+
+	for filename, result in files.items():
+		index.update(filename, result)
+
+	assert index.results() == expected()
+	assert PassingRequirement(name="pkg_resources", lineno=7, filename="c.py") in index.results()
+
+	# The first file to import a requirement changes.
+	index.update(PathPlus("a.py"), ([("numpy", 1), ("toml", 2)], set()))
+	assert index.results() == expected()
+	assert PassingRequirement(name="click", lineno=1, filename="b.py") in index.results()
+
+	index.update(PathPlus("a.py"), ([("click", 2)], set()))
+	assert index.results() == expected()
+	assert PassingRequirement(name="click", lineno=2, filename="a.py") in index.results()
+
+	# An unlisted import is added to a file earlier than those which already had one.
+	index.update(PathPlus("b.py"), ([("attrs", 1), ("requests", 4)], set()))
+	assert index.results() == expected()
+
+	index.remove(PathPlus("c.py"))
+	assert index.results() == expected()
+	assert UnusedRequirement(name="pkg_resources") in index.results()
+
+	# A new file, discovered between the others.
+	index.update(PathPlus("aa.py"), ([("yaml", 1), ("attrs", 2)], set()))
+	index.reorder([PathPlus("a.py"), PathPlus("aa.py"), PathPlus("b.py")])
+	assert list(index.files) == [PathPlus("a.py"), PathPlus("aa.py"), PathPlus("b.py")]
+	assert index.results() == expected()
+	assert PassingRequirement(name="attrs", lineno=2, filename="aa.py") in index.results()
@@ -1,65 +1,220 @@
 #!/usr/bin/env python3
 """
-Adapted from https://github.com/PyCQA/isort/blob/d15f36360ca381d7e7093b66922aa5a7e3b9de9c/scripts/mkstdlibs.py
+Regenerate the lists of standard library modules from the Python interpreters installed locally.
 
-Licensed under the MIT License (MIT)
-Copyright (c) 2013 Timothy Edmund Crosley
-https://github.com/PyCQA/isort/blob/main/LICENSE
+Usage::
+
+	python3 update_stdlib_list.py [INTERPRETER ...]
+
+With no arguments, interpreters named ``python2.7`` and ``python3.6`` to ``python3.14`` are looked for on ``$PATH``.
+No network access is required.
+
+For Python 3.10 and later the names come from :py:data:`sys.stdlib_module_names`.
+Older versions don't have that, so the modules in the interpreter's standard library directories are listed instead,
+along with the platform-specific modules (e.g. ``winreg`` and ``msvcrt``) which aren't found on every platform.
+For Python 3 these are taken from the oldest interpreter which has :py:data:`sys.stdlib_module_names`,
+as all of them date from Python 3.5 or earlier. Python 2 has different names for some (e.g. ``_winreg``),
+so they are listed in this script.
+
+Each version's modules are written to ``dep_checker/_stdlib_versions.py`` as the changes from the previous version.
+The tables for versions which aren't installed are kept from the existing file, and the combined list in
+``dep_checker/_stdlib_list.py`` only grows, so modules from versions which are no longer installed
+(or were found by a previous version of this script) aren't lost.
+Modules which are only used to test CPython itself are removed from both,
+except for the ``test`` package which some projects import helpers from.
+
+Versions which no interpreter is available for can be derived from the previous version
+by listing the modules added and removed in :py:data:`DERIVED`.
+Those are noted in ``dep_checker/_stdlib_versions.py``, and are replaced by the interpreter's modules once installed.
 """
 
-# 3rd party
-from sphinx.ext.intersphinx import fetch_inventory
-
-URL = "https://docs.python.org/{}/objects.inv"
-VERSIONS = [
-		('2', '7'),
-		('3', '6'),
-		('3', '7'),
-		('3', '8'),
-		('3', '9'),
-		('3', "10"),
-		('3', "11"),
-		('3', "12"),
-		('3', "13"),
-		('3', "14"),
-		]
-
-
-class FakeConfig:
-	intersphinx_timeout = None
-	intersphinx_cache_limit = 9999
-	tls_cacerts = None
-	tls_verify = True
-	user_agent = ''
-
-
-class FakeApp:
-	srcdir = ''
-	config = FakeConfig()
-
-
-# Any modules we want to enforce across Python versions stdlib can be included in set init
-all_modules = {"_ast", "posixpath", "ntpath", "sre_constants", "sre_parse", "sre_compile", "sre"}
-
-for version_info in VERSIONS:
-	version = '.'.join(version_info)
-	url = URL.format(version)
-	invdata = fetch_inventory(FakeApp(), '', url)
-
-	for module in invdata["py:module"]:
-		root, *_ = module.split('.')
-		if root not in ["__main__"]:
-			all_modules.add(root)
-
-with open("dep_checker/_stdlib_list.py", 'w', encoding="UTF-8") as stdlib_file:
-	docstring = """
-The contents of this file are generated by `update_stdlib_list.py`.
-Do not edit by hand!
-Rerun that script if changes are required.
+# stdlib
+import json
+import re
+import shutil
+import subprocess
+import sys
+import textwrap
+from typing import Dict, List, Set, Tuple
+
+sys.path.insert(0, '.')
+
+# this package
+from dep_checker._stdlib_list import stdlib as previous_stdlib  # noqa: E402
+from dep_checker._stdlib_versions import changes as previous_changes  # noqa: E402
+
+VERSIONS = ["2.7", *(f"3.{minor}" for minor in range(6, 15))]
+
+# Run with each interpreter. Must be compatible with Python 2.7.
+PROBE = r"""
+import json, os, pkgutil, sys, sysconfig
+
+names = set(sys.builtin_module_names)
+full = set(getattr(sys, "stdlib_module_names", ()))
+stdlib_dir = sysconfig.get_paths()["stdlib"]
+paths = [os.path.join(stdlib_dir, "lib-dynload")]
+
+for path in sys.path:
+	if path.startswith(stdlib_dir) and "site-packages" not in path:
+		paths.append(path)
+
+for module in pkgutil.iter_modules([path for path in paths if os.path.isdir(path)]):
+	names.add(module[1])
+
+sys.stdout.write(json.dumps({
+		"version": "%d.%d" % sys.version_info[:2],
+		"discovered": sorted(names),
+		"full": sorted(full | set(sys.builtin_module_names)),
+		}))
 """
 
-	stdlib_file.write(f'"""{docstring}"""\n\n')
-	stdlib_file.write("stdlib = {\n")
-	for module in sorted(all_modules):
-		stdlib_file.write(f'    "{module}",\n')
-	stdlib_file.write("}\n")
+# Modules which are only used to test CPython itself, or are artefacts of the build.
+NOT_STDLIB = re.compile(r"_test.*|_ctypes_test|_xx.*|xxlimited.*|xxsubtype|_sysconfigdata_.*|__p?hello__")
+
+# CPython's regression tests, which aren't listed by ``sys.stdlib_module_names``
+# but whose helpers (e.g. ``test.support``) are imported by some projects.
+TEST_PACKAGE = "test"
+
+# Python 2's names for the platform-specific modules.
+PYTHON2_PLATFORM_SPECIFIC = {"_msi", "_scproxy", "_winreg", "dbm", "gdbm", "msilib", "msvcrt", "nt", "winsound"}
+
+# Versions for which no interpreter was available, as the modules added and removed since the previous version,
+# and where those changes came from.
+DERIVED = {
+		"3.14": (
+				"_ast_unparse _hmac _py_warnings _remote_debugging _types _zstd annotationlib compression",
+				"_compression",
+				"the Python 3.14 changelog, checked against the 3.14 list from the stdlib-list package",
+				),
+		}
+
+
+def probe(interpreter: str) -> Dict:
+	process = subprocess.run([interpreter, "-c", PROBE], stdout=subprocess.PIPE, check=True)
+	return json.loads(process.stdout)
+
+
+def version_key(version: str) -> Tuple[int, ...]:
+	return tuple(map(int, version.split('.')))
+
+
+def has_stdlib_module_names(result: Dict) -> bool:
+	# Otherwise "full" is just the builtin modules.
+	return version_key(result["version"]) >= (3, 10)
+
+
+def wrap(names: Set[str]) -> List[str]:
+	return textwrap.wrap(' '.join(sorted(names)), width=100, break_on_hyphens=False)
+
+
+def read_tables() -> Dict[str, Set[str]]:
+	# The existing tables, with the changes from the previous version applied cumulatively.
+	tables: Dict[str, Set[str]] = {}
+	modules: Set[str] = set()
+
+	for version, (added, removed) in previous_changes.items():
+		modules = (modules | set(added.split())) - set(removed.split())
+		tables[version] = modules
+
+	return tables
+
+
+def write_versions(tables: Dict[str, Set[str]], derived: Dict[str, str]) -> None:
+	with open("dep_checker/_stdlib_versions.py", 'w', encoding="UTF-8") as fp:
+		fp.write('"""\n')
+		fp.write("The contents of this file are generated by `update_stdlib_list.py`.\n")
+		fp.write("Do not edit by hand!\n")
+		fp.write("Rerun that script if changes are required.\n")
+		fp.write('"""\n\n')
+		fp.write("# Mapping of Python versions to the standard library modules added and removed since the previous version,\n")
+		fp.write("# as strings of space-separated names.\n")
+		fp.write("changes = {\n")
+
+		previous: Set[str] = set()
+		for version in sorted(tables, key=version_key):
+			table = tables[version]
+			if version in derived:
+				note = (
+						f"Not generated from a Python {version} interpreter, as none was available. "
+						f"The changes come from {derived[version]}."
+						)
+				for line in textwrap.wrap(note, width=100):
+					fp.write(f"\t\t# {line}\n")
+			fp.write(f'\t\t"{version}": (\n')
+			for added_or_removed in (table - previous, previous - table):
+				lines = wrap(added_or_removed)
+				if not lines:
+					fp.write("\t\t\t\t'',\n")
+					continue
+
+				for line in lines[:-1]:
+					fp.write(f'\t\t\t\t"{line} "\n')
+				fp.write(f'\t\t\t\t"{lines[-1]}",\n')
+			fp.write("\t\t\t\t),\n")
+			previous = table
+
+		fp.write("\t\t}\n")
+
+
+def write_stdlib_list(modules: Set[str]) -> None:
+	with open("dep_checker/_stdlib_list.py", 'w', encoding="UTF-8") as fp:
+		fp.write('"""\n')
+		fp.write("The contents of this file are generated by `update_stdlib_list.py`.\n")
+		fp.write("Do not edit by hand!\n")
+		fp.write("Rerun that script if changes are required.\n")
+		fp.write('"""\n\n')
+		fp.write("stdlib = {\n")
+		for module in sorted(modules):
+			quote = "'" if len(module) == 1 else '"'
+			fp.write(f"\t\t{quote}{module}{quote},\n")
+		fp.write("\t\t}\n")
+
+
+def main(interpreters: List[str]) -> None:
+	if not interpreters:
+		interpreters = list(filter(None, (shutil.which(f"python{version}") for version in VERSIONS)))
+
+	results = {}
+	for interpreter in interpreters:
+		result = probe(interpreter)
+		results[result["version"]] = result
+		print(f"Found Python {result['version']} at {interpreter}")
+
+	# Names listed by ``sys.stdlib_module_names`` but not found on this platform,
+	# taken from the oldest version which has it as that is the closest to the versions which don't.
+	platform_specific: Set[str] = set()
+	for version in sorted(results, key=version_key):
+		result = results[version]
+		if has_stdlib_module_names(result):
+			platform_specific = set(result["full"]) - set(result["discovered"])
+			break
+
+	tables = read_tables()
+	for version in sorted(results, key=version_key):
+		result = results[version]
+
+		if has_stdlib_module_names(result):
+			tables[version] = set(result["full"])
+		elif version_key(version) < (3, ):
+			tables[version] = set(result["discovered"]) | PYTHON2_PLATFORM_SPECIFIC
+		else:
+			tables[version] = set(result["discovered"]) | platform_specific
+
+	derived = {}
+	for version, (added, removed, source) in DERIVED.items():
+		if version not in results:
+			previous_version = max((v for v in tables if version_key(v) < version_key(version)), key=version_key)
+			tables[version] = (tables[previous_version] | set(added.split())) - set(removed.split())
+			derived[version] = source
+
+	for version, table in tables.items():
+		tables[version] = {name for name in table if not NOT_STDLIB.fullmatch(name)} | {TEST_PACKAGE}
+
+	write_versions(tables, derived)
+
+	all_modules = set(previous_stdlib).union(*tables.values())
+	write_stdlib_list({name for name in all_modules if not NOT_STDLIB.fullmatch(name)} | {TEST_PACKAGE})
+
+
+if __name__ == "__main__":
+	main(sys.argv[1:])